@@ -7,6 +7,7 @@ from aiohttp_middlewares import cors_middleware
 
 from fdk_organization_bff.config import Config
 from fdk_organization_bff.resources import (
+    Metrics,
     MunicipalityCategories,
     OrgCatalog,
     OrgCatalogs,
@@ -14,6 +15,17 @@ from fdk_organization_bff.resources import (
     Ready,
     StateCategories,
 )
+from fdk_organization_bff.resources.middlewares import deadline_middleware
+from fdk_organization_bff.service.brreg_store import brreg_store_ctx
+from fdk_organization_bff.service.client_session import client_session_ctx
+from fdk_organization_bff.service.org_catalog_service import (
+    municipality_store_ctx,
+    org_registry_ctx,
+    publisher_snapshot_ctx,
+)
+from fdk_organization_bff.service.shared_cache import shared_cache_ctx
+from fdk_organization_bff.service.state_file import state_file_ctx
+from fdk_organization_bff.service.warmup import warmup_ctx
 
 
 def setup_routes(app: web.Application) -> None:
@@ -26,13 +38,24 @@ def setup_routes(app: web.Application) -> None:
             web.get(Config.routes()["ORG_CATALOGS"], OrgCatalogs),
             web.get(Config.routes()["STATE_CATEGORIES"], StateCategories),
             web.get(Config.routes()["MUNICIPALITY_CATEGORIES"], MunicipalityCategories),
+            web.get(Config.routes()["METRICS"], Metrics),
         ]
     )
 
 
 async def create_app() -> web.Application:
     """Create aiohttp application."""
-    app = web.Application(middlewares=[cors_middleware(allow_all=True)])
+    app = web.Application(
+        middlewares=[cors_middleware(allow_all=True), deadline_middleware]
+    )
     logging.basicConfig(level=logging.INFO)
     setup_routes(app)
+    app.cleanup_ctx.append(client_session_ctx)
+    app.cleanup_ctx.append(shared_cache_ctx)
+    app.cleanup_ctx.append(state_file_ctx)
+    app.cleanup_ctx.append(org_registry_ctx)
+    app.cleanup_ctx.append(publisher_snapshot_ctx)
+    app.cleanup_ctx.append(municipality_store_ctx)
+    app.cleanup_ctx.append(brreg_store_ctx)
+    app.cleanup_ctx.append(warmup_ctx)
     return app
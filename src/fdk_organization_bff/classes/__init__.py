@@ -3,6 +3,7 @@
 Modules:
     catalog_quality_score
     filter_enum
+    municipality_index
     organization_catalog
     organization_catalog_list
     organization_catalog_summary
@@ -12,10 +13,13 @@ Modules:
     organization_details
     organization_concepts
     organization_informationmodels
+    upstream_enum
+    upstream_response
 """
 
 from fdk_organization_bff.classes.catalog_quality_score import CatalogQualityScore
 from fdk_organization_bff.classes.filter_enum import FilterEnum
+from fdk_organization_bff.classes.municipality_index import MunicipalityIndex
 from fdk_organization_bff.classes.organization_catalog import OrganizationCatalog
 from fdk_organization_bff.classes.organization_catalog_list import (
     OrganizationCatalogList,
@@ -36,3 +40,5 @@ from fdk_organization_bff.classes.organization_details import OrganizationDetail
 from fdk_organization_bff.classes.organization_informationmodels import (
     OrganizationInformationmodels,
 )
+from fdk_organization_bff.classes.upstream_enum import UpstreamEnum
+from fdk_organization_bff.classes.upstream_response import UpstreamResponse
@@ -0,0 +1,21 @@
+"""Municipality index data class."""
+
+from dataclasses import dataclass
+from typing import Dict
+
+from fdk_organization_bff.classes.organization_catalog_summary import (
+    OrganizationCatalogSummary,
+)
+
+
+@dataclass
+class MunicipalityIndex:
+    """Data class with municipality reference data indexed for categorisation.
+
+    fylke_by_org maps the organization number of every fylke and kommune to
+    its fylkesnummer, and fylke_categories has an empty category summary for
+    each fylkesnummer.
+    """
+
+    fylke_by_org: Dict[str, str]
+    fylke_categories: Dict[str, OrganizationCatalogSummary]
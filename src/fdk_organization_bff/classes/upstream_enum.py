@@ -0,0 +1,13 @@
+"""Upstream enum class."""
+
+from enum import Enum
+
+
+class UpstreamEnum(Enum):
+    """Enum class with upstream services, valued by their env variable prefix."""
+
+    ORGANIZATION_CATALOG = "ORGANIZATION_CATALOG"
+    DATA_BRREG = "DATA_BRREG"
+    FDK_SPARQL = "FDK_SPARQL"
+    FDK_METADATA_QUALITY = "FDK_METADATA_QUALITY"
+    REFERENCE_DATA = "REFERENCE_DATA"
@@ -0,0 +1,18 @@
+"""Upstream response data class."""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class UpstreamResponse:
+    """Data class with status, decoded payload and body size of an upstream response.
+
+    Age is the number of seconds since the response was received from upstream,
+    when it has been served from a shared cache.
+    """
+
+    status: int
+    payload: Any
+    size: int = 0
+    age: float = 0
@@ -1,8 +1,9 @@
 """Configure fdk-organization-bff."""
 
 import os
-from typing import Dict, Type, TypeVar
+from typing import Dict, List, Optional, Type, TypeVar
 
+from fdk_organization_bff.classes import UpstreamEnum
 
 T = TypeVar("T", bound="Config")
 
@@ -20,6 +21,7 @@ class Config:
         "ORG_CATALOGS": _ORG_CATALOG_PATH,
         "STATE_CATEGORIES": _ORG_CATEGORIES_PATH + "/state",
         "MUNICIPALITY_CATEGORIES": _ORG_CATEGORIES_PATH + "/municipality",
+        "METRICS": "/metrics",
     }
     _ORGANIZATION_CATALOG_URI = os.getenv(
         "ORGANIZATION_CATALOG_URI",
@@ -41,6 +43,194 @@ class Config:
         "REFERENCE_DATA_URI",
         "https://staging.fellesdatakatalog.digdir.no",
     )
+    _CLIENT_CONNECTION_LIMIT = int(os.getenv("CLIENT_CONNECTION_LIMIT", "100"))
+    _CLIENT_CONNECTION_LIMIT_PER_HOST = int(
+        os.getenv("CLIENT_CONNECTION_LIMIT_PER_HOST", "20")
+    )
+    _CLIENT_KEEPALIVE_TIMEOUT = float(os.getenv("CLIENT_KEEPALIVE_TIMEOUT", "30"))
+    _CLIENT_DNS_CACHE_TTL = int(os.getenv("CLIENT_DNS_CACHE_TTL", "300"))
+
+    _JSON_BACKEND = os.getenv("JSON_BACKEND", "json")
+
+    _REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+    _MAX_REQUEST_DEADLINE = float(os.getenv("MAX_REQUEST_DEADLINE", "30"))
+    _ROUTE_DEADLINES = {
+        route: float(os.getenv(f"{route}_DEADLINE", default))
+        for route, default in {
+            "ORG_CATALOG": "10",
+            "ORG_CATALOGS": "20",
+            "STATE_CATEGORIES": "20",
+            "MUNICIPALITY_CATEGORIES": "20",
+        }.items()
+    }
+    _UPSTREAM_TIMEOUTS = {
+        upstream: float(os.getenv(f"{upstream.value}_TIMEOUT", default))
+        for upstream, default in {
+            UpstreamEnum.ORGANIZATION_CATALOG: "5",
+            UpstreamEnum.DATA_BRREG: "5",
+            UpstreamEnum.FDK_SPARQL: "15",
+            UpstreamEnum.FDK_METADATA_QUALITY: "5",
+            UpstreamEnum.REFERENCE_DATA: "5",
+        }.items()
+    }
+    _UPSTREAM_RETRY_ATTEMPTS = {
+        upstream: int(os.getenv(f"{upstream.value}_RETRY_ATTEMPTS", default))
+        for upstream, default in {
+            UpstreamEnum.ORGANIZATION_CATALOG: "2",
+            UpstreamEnum.DATA_BRREG: "2",
+            UpstreamEnum.FDK_SPARQL: "3",
+            UpstreamEnum.FDK_METADATA_QUALITY: "1",
+            UpstreamEnum.REFERENCE_DATA: "3",
+        }.items()
+    }
+    _BREAKER_FAILURE_RATE = {
+        upstream: float(os.getenv(f"{upstream.value}_BREAKER_FAILURE_RATE", "0.5"))
+        for upstream in UpstreamEnum
+    }
+    _BREAKER_WINDOW = {
+        upstream: int(os.getenv(f"{upstream.value}_BREAKER_WINDOW", "20"))
+        for upstream in UpstreamEnum
+    }
+    _BREAKER_MIN_CALLS = {
+        upstream: int(os.getenv(f"{upstream.value}_BREAKER_MIN_CALLS", "10"))
+        for upstream in UpstreamEnum
+    }
+    _BREAKER_OPEN_SECONDS = {
+        upstream: float(os.getenv(f"{upstream.value}_BREAKER_OPEN_SECONDS", "30"))
+        for upstream in UpstreamEnum
+    }
+    _BREAKER_HALF_OPEN_PROBES = {
+        upstream: int(os.getenv(f"{upstream.value}_BREAKER_HALF_OPEN_PROBES", "2"))
+        for upstream in UpstreamEnum
+    }
+    _UPSTREAM_MAX_BODY_BYTES = {
+        upstream: int(os.getenv(f"{upstream.value}_MAX_BODY_BYTES", default))
+        for upstream, default in {
+            UpstreamEnum.ORGANIZATION_CATALOG: str(16 * 1024 * 1024),
+            UpstreamEnum.DATA_BRREG: str(1024 * 1024),
+            UpstreamEnum.FDK_SPARQL: str(64 * 1024 * 1024),
+            UpstreamEnum.FDK_METADATA_QUALITY: str(16 * 1024 * 1024),
+            UpstreamEnum.REFERENCE_DATA: str(4 * 1024 * 1024),
+        }.items()
+    }
+    _SPARQL_STREAMING = os.getenv("FDK_SPARQL_STREAMING", "false") == "true"
+    _SPARQL_METHOD = os.getenv("FDK_SPARQL_METHOD", "GET").upper()
+    _SPARQL_COUNT_FORMAT = os.getenv("FDK_SPARQL_COUNT_FORMAT", "json").lower()
+    _SPARQL_COMBINED_ORG_QUERY = (
+        os.getenv("FDK_SPARQL_COMBINED_ORG_QUERY", "false") == "true"
+    )
+    _SPARQL_GROUPED_COUNT_QUERY = (
+        os.getenv("FDK_SPARQL_GROUPED_COUNT_QUERY", "true") == "true"
+    )
+    _SPARQL_HEDGE_ENABLED = os.getenv("FDK_SPARQL_HEDGE_ENABLED", "false") == "true"
+    _SPARQL_HEDGE_PERCENTILE = float(os.getenv("FDK_SPARQL_HEDGE_PERCENTILE", "95"))
+    _SPARQL_HEDGE_BUDGET = float(os.getenv("FDK_SPARQL_HEDGE_BUDGET", "0.05"))
+    _UPSTREAM_RETRY_BACKOFF = {
+        upstream: float(os.getenv(f"{upstream.value}_RETRY_BACKOFF", "0.1"))
+        for upstream in UpstreamEnum
+    }
+    _UPSTREAM_RETRY_MAX_BACKOFF = {
+        upstream: float(os.getenv(f"{upstream.value}_RETRY_MAX_BACKOFF", "1"))
+        for upstream in UpstreamEnum
+    }
+    _CACHE_TTL = {
+        upstream: float(os.getenv(f"{upstream.value}_CACHE_TTL", default))
+        for upstream, default in {
+            UpstreamEnum.ORGANIZATION_CATALOG: "600",
+            UpstreamEnum.DATA_BRREG: "21600",
+            UpstreamEnum.FDK_SPARQL: "300",
+            UpstreamEnum.FDK_METADATA_QUALITY: "900",
+            UpstreamEnum.REFERENCE_DATA: "86400",
+        }.items()
+    }
+    _CACHE_STALE_TTL = {
+        upstream: os.getenv(f"{upstream.value}_CACHE_STALE_TTL")
+        for upstream in UpstreamEnum
+    }
+    _CACHE_MAX_BYTES = {
+        upstream: int(os.getenv(f"{upstream.value}_CACHE_MAX_BYTES", default))
+        for upstream, default in {
+            UpstreamEnum.ORGANIZATION_CATALOG: str(16 * 1024 * 1024),
+            UpstreamEnum.DATA_BRREG: str(8 * 1024 * 1024),
+            UpstreamEnum.FDK_SPARQL: str(64 * 1024 * 1024),
+            UpstreamEnum.FDK_METADATA_QUALITY: str(16 * 1024 * 1024),
+            UpstreamEnum.REFERENCE_DATA: str(4 * 1024 * 1024),
+        }.items()
+    }
+    _SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "none").lower()
+    _SHARED_CACHE_PATH = os.getenv(
+        "SHARED_CACHE_PATH", "/tmp/fdk-organization-bff-cache.sqlite3"  # noqa: S108
+    )
+    _SHARED_CACHE_REDIS_URL = os.getenv(
+        "SHARED_CACHE_REDIS_URL", "redis://localhost:6379/0"
+    )
+    _SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true") == "true"
+    _SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "300"))
+    _ORG_REGISTRY_ENABLED = os.getenv("ORG_REGISTRY_ENABLED", "false") == "true"
+    _ORG_REGISTRY_REFRESH_INTERVAL = float(
+        os.getenv("ORG_REGISTRY_REFRESH_INTERVAL", "600")
+    )
+    _MUNICIPALITY_INDEX_ENABLED = (
+        os.getenv("MUNICIPALITY_INDEX_ENABLED", "true") == "true"
+    )
+    _MUNICIPALITY_INDEX_REFRESH_INTERVAL = float(
+        os.getenv("MUNICIPALITY_INDEX_REFRESH_INTERVAL", "86400")
+    )
+    _RENDERED_CACHE_TTL = float(os.getenv("RENDERED_CACHE_TTL", "300"))
+    _RENDERED_CACHE_MAX_BYTES = int(
+        os.getenv("RENDERED_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+    )
+    _ROUTE_CACHE_POLICIES = {
+        route: {
+            directive: int(
+                os.getenv(f"{route}_{directive.upper().replace('-', '_')}", seconds)
+            )
+            for directive, seconds in {
+                "max-age": "300",
+                "s-maxage": "900",
+                "stale-while-revalidate": swr,
+                "stale-if-error": "86400",
+            }.items()
+        }
+        for route, swr in {
+            "ORG_CATALOG": "300",
+            "ORG_CATALOGS": "900",
+            "STATE_CATEGORIES": "900",
+            "MUNICIPALITY_CATEGORIES": "900",
+        }.items()
+    }
+    _SURROGATE_KEY_HEADER = os.getenv("SURROGATE_KEY_HEADER", "Surrogate-Key")
+    _NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", "60"))
+    _NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "10000"))
+    _MQA_SCORE_CACHE_TTL = float(os.getenv("MQA_SCORE_CACHE_TTL", "3600"))
+    _MQA_SCORE_CACHE_MAX_ENTRIES = int(
+        os.getenv("MQA_SCORE_CACHE_MAX_ENTRIES", "50000")
+    )
+    _STATE_FILE_ENABLED = os.getenv("STATE_FILE_ENABLED", "false") == "true"
+    _STATE_FILE_PATH = os.getenv(
+        "STATE_FILE_PATH", "/tmp/fdk-organization-bff-state.json"  # noqa: S108
+    )
+    _STATE_FILE_INTERVAL = float(os.getenv("STATE_FILE_INTERVAL", "300"))
+    _STATE_FILE_MAX_AGE = float(os.getenv("STATE_FILE_MAX_AGE", "3600"))
+    _WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false") == "true"
+    _WARMUP_INTERVAL = float(os.getenv("WARMUP_INTERVAL", "300"))
+    _WARMUP_ORGANIZATIONS = os.getenv("WARMUP_ORGANIZATIONS", "")
+    _WARMUP_TOP_ORGANIZATIONS = int(os.getenv("WARMUP_TOP_ORGANIZATIONS", "20"))
+    _WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "2"))
+    _BRREG_STORE_ENABLED = os.getenv("BRREG_STORE_ENABLED", "false") == "true"
+    _BRREG_STORE_SOURCE = os.getenv(
+        "BRREG_STORE_SOURCE",
+        _DATA_BRREG_URI + "/enhetsregisteret/api/enheter/lastned",
+    )
+    _BRREG_STORE_PATH = os.getenv(
+        "BRREG_STORE_PATH", "/tmp/fdk-organization-bff-brreg.sqlite3"  # noqa: S108
+    )
+    _BRREG_STORE_REFRESH_INTERVAL = float(
+        os.getenv("BRREG_STORE_REFRESH_INTERVAL", "86400")
+    )
+    _BRREG_STORE_DOWNLOAD_TIMEOUT = float(
+        os.getenv("BRREG_STORE_DOWNLOAD_TIMEOUT", "900")
+    )
 
     @classmethod
     def routes(cls: Type[T]) -> Dict[str, str]:
@@ -71,3 +261,307 @@ class Config:
     def reference_data_uri(cls: Type[T]) -> str:
         """Return reference-data URI."""
         return cls._REFERENCE_DATA_URI
+
+    @classmethod
+    def client_connection_limit(cls: Type[T]) -> int:
+        """Max number of simultaneous upstream connections."""
+        return cls._CLIENT_CONNECTION_LIMIT
+
+    @classmethod
+    def client_connection_limit_per_host(cls: Type[T]) -> int:
+        """Max number of simultaneous connections to a single upstream host."""
+        return cls._CLIENT_CONNECTION_LIMIT_PER_HOST
+
+    @classmethod
+    def client_keepalive_timeout(cls: Type[T]) -> float:
+        """Seconds an idle upstream connection is kept alive."""
+        return cls._CLIENT_KEEPALIVE_TIMEOUT
+
+    @classmethod
+    def client_dns_cache_ttl(cls: Type[T]) -> int:
+        """Seconds resolved upstream hostnames are cached."""
+        return cls._CLIENT_DNS_CACHE_TTL
+
+    @classmethod
+    def request_timeout_header(cls: Type[T]) -> str:
+        """Name of request header that overrides the route deadline."""
+        return cls._REQUEST_TIMEOUT_HEADER
+
+    @classmethod
+    def max_request_deadline(cls: Type[T]) -> float:
+        """Upper bound in seconds for a deadline requested by header."""
+        return cls._MAX_REQUEST_DEADLINE
+
+    @classmethod
+    def route_deadline(cls: Type[T], route: str) -> Optional[float]:
+        """Seconds a request to route may spend, None if route has no deadline."""
+        return cls._ROUTE_DEADLINES.get(route)
+
+    @classmethod
+    def upstream_timeout(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Max seconds for a single call to upstream."""
+        return cls._UPSTREAM_TIMEOUTS[upstream]
+
+    @classmethod
+    def upstream_retry_attempts(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Max number of attempts for an idempotent call to upstream."""
+        return cls._UPSTREAM_RETRY_ATTEMPTS[upstream]
+
+    @classmethod
+    def upstream_retry_backoff(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Backoff in seconds before the first retry to upstream."""
+        return cls._UPSTREAM_RETRY_BACKOFF[upstream]
+
+    @classmethod
+    def upstream_retry_max_backoff(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Max backoff in seconds between attempts to upstream."""
+        return cls._UPSTREAM_RETRY_MAX_BACKOFF[upstream]
+
+    @classmethod
+    def sparql_combined_org_query(cls: Type[T]) -> bool:
+        """Query all resource types of an organization in one SPARQL request."""
+        return cls._SPARQL_COMBINED_ORG_QUERY
+
+    @classmethod
+    def sparql_grouped_count_query(cls: Type[T]) -> bool:
+        """Count all resource types by publisher in one SPARQL request."""
+        return cls._SPARQL_GROUPED_COUNT_QUERY
+
+    @classmethod
+    def sparql_hedge_enabled(cls: Type[T]) -> bool:
+        """Hedge slow per-organization SPARQL queries."""
+        return cls._SPARQL_HEDGE_ENABLED
+
+    @classmethod
+    def sparql_hedge_percentile(cls: Type[T]) -> float:
+        """Latency percentile after which a SPARQL query is hedged."""
+        return cls._SPARQL_HEDGE_PERCENTILE
+
+    @classmethod
+    def sparql_hedge_budget(cls: Type[T]) -> float:
+        """Max ratio of extra SPARQL requests sent as hedges."""
+        return cls._SPARQL_HEDGE_BUDGET
+
+    @classmethod
+    def breaker_failure_rate(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Return failure rate that opens the circuit breaker for upstream."""
+        return cls._BREAKER_FAILURE_RATE[upstream]
+
+    @classmethod
+    def breaker_window(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Return number of recent calls the failure rate is computed over."""
+        return cls._BREAKER_WINDOW[upstream]
+
+    @classmethod
+    def breaker_min_calls(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Return number of recorded calls needed before the breaker may open."""
+        return cls._BREAKER_MIN_CALLS[upstream]
+
+    @classmethod
+    def breaker_open_seconds(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Seconds an open breaker fails fast before probing upstream."""
+        return cls._BREAKER_OPEN_SECONDS[upstream]
+
+    @classmethod
+    def breaker_half_open_probes(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Return number of successful probes needed to close a half-open breaker."""
+        return cls._BREAKER_HALF_OPEN_PROBES[upstream]
+
+    @classmethod
+    def sparql_method(cls: Type[T]) -> str:
+        """HTTP method for SPARQL queries, GET or POST."""
+        return cls._SPARQL_METHOD
+
+    @classmethod
+    def sparql_count_format(cls: Type[T]) -> str:
+        """Return result format for SPARQL count queries, json, csv or tsv."""
+        return cls._SPARQL_COUNT_FORMAT
+
+    @classmethod
+    def upstream_max_body_bytes(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Return max size in bytes of a response body read from upstream."""
+        return cls._UPSTREAM_MAX_BODY_BYTES[upstream]
+
+    @classmethod
+    def sparql_streaming(cls: Type[T]) -> bool:
+        """Parse SPARQL json bindings incrementally while they are received."""
+        return cls._SPARQL_STREAMING
+
+    @classmethod
+    def json_backend(cls: Type[T]) -> str:
+        """Return name of json module, json (default), orjson or ujson."""
+        return cls._JSON_BACKEND
+
+    @classmethod
+    def cache_ttl(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Seconds a cached response from upstream is fresh, 0 disables caching."""
+        return cls._CACHE_TTL[upstream]
+
+    @classmethod
+    def cache_stale_ttl(cls: Type[T], upstream: UpstreamEnum) -> float:
+        """Seconds an expired response is served while it is refreshed.
+
+        Defaults to the ttl of upstream.
+        """
+        stale_ttl = cls._CACHE_STALE_TTL[upstream]
+        return float(stale_ttl) if stale_ttl else cls.cache_ttl(upstream)
+
+    @classmethod
+    def cache_max_bytes(cls: Type[T], upstream: UpstreamEnum) -> int:
+        """Return max total size in bytes of cached responses from upstream."""
+        return cls._CACHE_MAX_BYTES[upstream]
+
+    @classmethod
+    def shared_cache_backend(cls: Type[T]) -> str:
+        """Return backend of cache shared between workers, none, sqlite or redis."""
+        return cls._SHARED_CACHE_BACKEND
+
+    @classmethod
+    def shared_cache_path(cls: Type[T]) -> str:
+        """Return path of the SQLite file backing the shared cache."""
+        return cls._SHARED_CACHE_PATH
+
+    @classmethod
+    def shared_cache_redis_url(cls: Type[T]) -> str:
+        """Return url of the Redis server backing the shared cache."""
+        return cls._SHARED_CACHE_REDIS_URL
+
+    @classmethod
+    def snapshot_enabled(cls: Type[T]) -> bool:
+        """Serve list endpoints from a publisher snapshot built in the background."""
+        return cls._SNAPSHOT_ENABLED
+
+    @classmethod
+    def snapshot_interval(cls: Type[T]) -> float:
+        """Seconds between builds of the publisher snapshot."""
+        return cls._SNAPSHOT_INTERVAL
+
+    @classmethod
+    def org_registry_enabled(cls: Type[T]) -> bool:
+        """Look organizations up in a registry of all organizations loaded in the background."""
+        return cls._ORG_REGISTRY_ENABLED
+
+    @classmethod
+    def org_registry_refresh_interval(cls: Type[T]) -> float:
+        """Seconds between loads of the organization registry."""
+        return cls._ORG_REGISTRY_REFRESH_INTERVAL
+
+    @classmethod
+    def municipality_index_enabled(cls: Type[T]) -> bool:
+        """Categorise municipalities with reference data loaded in the background."""
+        return cls._MUNICIPALITY_INDEX_ENABLED
+
+    @classmethod
+    def municipality_index_refresh_interval(cls: Type[T]) -> float:
+        """Seconds between loads of the municipality reference data."""
+        return cls._MUNICIPALITY_INDEX_REFRESH_INTERVAL
+
+    @classmethod
+    def rendered_cache_ttl(cls: Type[T]) -> float:
+        """Max seconds a rendered response is cached, 0 disables the cache."""
+        return cls._RENDERED_CACHE_TTL
+
+    @classmethod
+    def rendered_cache_max_bytes(cls: Type[T]) -> int:
+        """Return max total size in bytes of cached rendered responses."""
+        return cls._RENDERED_CACHE_MAX_BYTES
+
+    @classmethod
+    def route_cache_policy(cls: Type[T], route: str) -> Dict[str, int]:
+        """Return Cache-Control directives with seconds for responses of route."""
+        return cls._ROUTE_CACHE_POLICIES[route]
+
+    @classmethod
+    def surrogate_key_header(cls: Type[T]) -> str:
+        """Name of response header with keys an edge cache can purge by."""
+        return cls._SURROGATE_KEY_HEADER
+
+    @classmethod
+    def negative_cache_ttl(cls: Type[T]) -> float:
+        """Seconds a response without data is remembered, 0 disables it."""
+        return cls._NEGATIVE_CACHE_TTL
+
+    @classmethod
+    def negative_cache_max_entries(cls: Type[T]) -> int:
+        """Return max number of remembered responses without data."""
+        return cls._NEGATIVE_CACHE_MAX_ENTRIES
+
+    @classmethod
+    def mqa_score_cache_ttl(cls: Type[T]) -> float:
+        """Seconds the quality score of a dataset is cached, 0 disables the cache."""
+        return cls._MQA_SCORE_CACHE_TTL
+
+    @classmethod
+    def mqa_score_cache_max_entries(cls: Type[T]) -> int:
+        """Return max number of datasets with cached quality scores."""
+        return cls._MQA_SCORE_CACHE_MAX_ENTRIES
+
+    @classmethod
+    def state_file_enabled(cls: Type[T]) -> bool:
+        """Restore cacheable state from a local file at startup, and save it."""
+        return cls._STATE_FILE_ENABLED
+
+    @classmethod
+    def state_file_path(cls: Type[T]) -> str:
+        """Return path of the state file."""
+        return cls._STATE_FILE_PATH
+
+    @classmethod
+    def state_file_interval(cls: Type[T]) -> float:
+        """Seconds between saves of the state file."""
+        return cls._STATE_FILE_INTERVAL
+
+    @classmethod
+    def state_file_max_age(cls: Type[T]) -> float:
+        """Max age in seconds of a state file that is restored."""
+        return cls._STATE_FILE_MAX_AGE
+
+    @classmethod
+    def warmup_enabled(cls: Type[T]) -> bool:
+        """Warm caches with the most requested responses in the background."""
+        return cls._WARMUP_ENABLED
+
+    @classmethod
+    def warmup_interval(cls: Type[T]) -> float:
+        """Seconds between cache warm-ups."""
+        return cls._WARMUP_INTERVAL
+
+    @classmethod
+    def warmup_organizations(cls: Type[T]) -> List[str]:
+        """Return ids of organizations that are always warmed."""
+        return [id.strip() for id in cls._WARMUP_ORGANIZATIONS.split(",") if id.strip()]
+
+    @classmethod
+    def warmup_top_organizations(cls: Type[T]) -> int:
+        """Return number of most requested organizations that are warmed."""
+        return cls._WARMUP_TOP_ORGANIZATIONS
+
+    @classmethod
+    def warmup_concurrency(cls: Type[T]) -> int:
+        """Return max number of responses warmed at a time."""
+        return cls._WARMUP_CONCURRENCY
+
+    @classmethod
+    def brreg_store_enabled(cls: Type[T]) -> bool:
+        """Look up organizations in a local copy of Enhetsregisteret first."""
+        return cls._BRREG_STORE_ENABLED
+
+    @classmethod
+    def brreg_store_source(cls: Type[T]) -> str:
+        """Return url or file path of the Enhetsregisteret bulk dump."""
+        return cls._BRREG_STORE_SOURCE
+
+    @classmethod
+    def brreg_store_path(cls: Type[T]) -> str:
+        """Return path of the SQLite file with the local Enhetsregisteret index."""
+        return cls._BRREG_STORE_PATH
+
+    @classmethod
+    def brreg_store_refresh_interval(cls: Type[T]) -> float:
+        """Seconds between loads of the Enhetsregisteret bulk dump."""
+        return cls._BRREG_STORE_REFRESH_INTERVAL
+
+    @classmethod
+    def brreg_store_download_timeout(cls: Type[T]) -> float:
+        """Max seconds for downloading the Enhetsregisteret bulk dump."""
+        return cls._BRREG_STORE_DOWNLOAD_TIMEOUT
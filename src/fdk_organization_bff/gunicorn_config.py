@@ -56,6 +56,7 @@ class CustomGunicornLogger(glogging.Logger):
         access_logger = logging.getLogger("gunicorn.access")
         access_logger.addFilter(PingFilter())
         access_logger.addFilter(ReadyFilter())
+        access_logger.addFilter(MetricsFilter())
         access_logger.addFilter(BlackboxExporterFilter())
 
         root_logger = logging.getLogger()
@@ -96,6 +97,14 @@ class ReadyFilter(logging.Filter):
         return "GET /ready" not in record.getMessage()
 
 
+class MetricsFilter(logging.Filter):
+    """Custom Metrics Filter class."""
+
+    def filter(self: Any, record: logging.LogRecord) -> bool:
+        """Filter function."""
+        return "GET /metrics" not in record.getMessage()
+
+
 class BlackboxExporterFilter(logging.Filter):
     """Custom Blackbox Exporter Filter class."""
 
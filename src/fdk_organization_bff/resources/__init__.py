@@ -7,8 +7,10 @@ Modules:
     org_catalogs
     state_categories
     municipality_categories
+    metrics
 """
 
+from .metrics import Metrics
 from .municipality_categories import MunicipalityCategories
 from .org_catalog import OrgCatalog
 from .org_catalogs import OrgCatalogs
@@ -0,0 +1,14 @@
+"""Resource module for metrics."""
+
+from aiohttp.web import Response, View
+
+from fdk_organization_bff.service.metrics import render_metrics
+
+
+class Metrics(View):
+    """Class representing metrics resource."""
+
+    @staticmethod
+    async def get() -> Response:
+        """Metrics route function."""
+        return Response(text=render_metrics(), content_type="text/plain")
@@ -0,0 +1,38 @@
+"""Middleware module for http resources."""
+
+import logging
+from typing import Awaitable, Callable, Optional
+
+from aiohttp.web import middleware, Request, StreamResponse
+
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.deadline import set_deadline
+
+Handler = Callable[[Request], Awaitable[StreamResponse]]
+
+
+def request_deadline(request: Request) -> Optional[float]:
+    """Deadline in seconds for request, from header or route config."""
+    header_value = request.headers.get(Config.request_timeout_header())
+    if header_value is not None:
+        try:
+            requested = float(header_value)
+            if requested > 0:
+                return min(requested, Config.max_request_deadline())
+        except ValueError:
+            pass
+        logging.warning(f"ignoring invalid request timeout {header_value}")
+
+    resource = request.match_info.route.resource
+    canonical = resource.canonical if resource else None
+    for route, path in Config.routes().items():
+        if path == canonical:
+            return Config.route_deadline(route)
+    return None
+
+
+@middleware
+async def deadline_middleware(request: Request, handler: Handler) -> StreamResponse:
+    """Set deadline that bounds all upstream calls made while handling request."""
+    set_deadline(request_deadline(request))
+    return await handler(request)
@@ -1,13 +1,17 @@
 """Resource module for specific organization catalog."""
 
-from dataclasses import asdict
-
-from aiohttp.web import json_response, Response, View
+from aiohttp.web import Response, View
 
 from fdk_organization_bff.classes import FilterEnum
-from fdk_organization_bff.service.org_catalog_service import get_organization_catalog
+from fdk_organization_bff.service.client_session import CLIENT_SESSION
+from fdk_organization_bff.service.org_catalog_service import (
+    get_organization_catalog,
+    organization_may_exist,
+)
+from fdk_organization_bff.service.rendered_cache import rendered_json
+from fdk_organization_bff.service.warmup import org_hits
 from fdk_organization_bff.utils.utils import filter_param_to_enum
-from .utils import fifteen_min_cache_header
+from .utils import cache_headers, rendered_response
 
 
 class OrgCatalog(View):
@@ -16,13 +20,22 @@ class OrgCatalog(View):
     async def get(self: View) -> Response:
         """Get specific organization catalog."""
         filter = filter_param_to_enum(self.request.rel_url.query.get("filter"))
+        id = self.request.match_info["id"]
         if filter is FilterEnum.INVALID:
             return Response(status=400)
+        elif not organization_may_exist(id):
+            return Response(status=404)
         else:
-            catalog = await get_organization_catalog(
-                self.request.match_info["id"], filter
+            org_hits.add(id)
+            rendered = await rendered_json(
+                ("ORG_CATALOG", filter, id),
+                lambda: get_organization_catalog(
+                    id, filter, self.request.app[CLIENT_SESSION]
+                ),
+                versioned=False,
+            )
+            return rendered_response(
+                self.request,
+                rendered,
+                headers=cache_headers("ORG_CATALOG", f"organization-{id}"),
             )
-            if catalog:
-                return json_response(asdict(catalog), headers=fifteen_min_cache_header)
-            else:
-                return Response(status=404)
@@ -1,14 +1,15 @@
 """Resource module for state categories."""
 
-from dataclasses import asdict
 from typing import Optional
 
-from aiohttp.web import json_response, Response, View
+from aiohttp.web import Response, View
 
 from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.service.client_session import CLIENT_SESSION
 from fdk_organization_bff.service.org_catalog_service import get_state_categories
+from fdk_organization_bff.service.rendered_cache import rendered_json
 from fdk_organization_bff.utils.utils import filter_param_to_enum
-from .utils import fifteen_min_cache_header
+from .utils import cache_headers, rendered_response
 
 
 class StateCategories(View):
@@ -21,5 +22,12 @@ class StateCategories(View):
         if filter is FilterEnum.INVALID:
             return Response(status=400)
         else:
-            categories = await get_state_categories(filter, include_empty)
-            return json_response(asdict(categories), headers=fifteen_min_cache_header)
+            rendered = await rendered_json(
+                ("STATE_CATEGORIES", filter, include_empty),
+                lambda: get_state_categories(
+                    filter, include_empty, self.request.app[CLIENT_SESSION]
+                ),
+            )
+            return rendered_response(
+                self.request, rendered, headers=cache_headers("STATE_CATEGORIES")
+            )
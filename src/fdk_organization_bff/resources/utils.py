@@ -1,5 +1,49 @@
 """Utils module for http resources."""
 
-fifteen_min_cache_header = {
-    "Cache-Control": "no-cache, no-store, max-age=900, must-revalidate"
-}
+from typing import Dict, Optional
+
+from aiohttp import ETag
+from aiohttp.web import Request, Response
+
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.rendered_cache import RenderedBody
+
+SURROGATE_KEY_ALL = "organization-bff"
+
+
+def cache_headers(route: str, *surrogate_keys: str) -> Dict[str, str]:
+    """Return cache policy headers for responses of route, with surrogate keys."""
+    directives = ", ".join(
+        f"{directive}={seconds}"
+        for directive, seconds in Config.route_cache_policy(route).items()
+    )
+    return {
+        "Cache-Control": f"public, {directives}",
+        Config.surrogate_key_header(): " ".join(
+            (SURROGATE_KEY_ALL, route.lower().replace("_", "-")) + surrogate_keys
+        ),
+    }
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return whether etag matches the If-None-Match header of request."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    return any(tag.value in (etag, "*") for tag in if_none_match)
+
+
+def rendered_response(
+    request: Request, rendered: Optional[RenderedBody], headers: Dict[str, str]
+) -> Response:
+    """Respond with rendered json body, 304 if the client has it, 404 if none."""
+    if rendered is None:
+        return Response(status=404)
+    if etag_matches(request, rendered.etag):
+        response = Response(status=304, headers=headers)
+    else:
+        response = Response(
+            body=rendered.body, content_type="application/json", headers=headers
+        )
+    response.etag = ETag(value=rendered.etag)
+    return response
@@ -1,11 +1,22 @@
 """Adapter layer module for fdk-organization-bff."""
 
-from typing import Dict, List, Optional, Union
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponse, ClientSession
 
-from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.classes import FilterEnum, UpstreamEnum, UpstreamResponse
 from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.brreg_store import brreg_store
+from fdk_organization_bff.service.cache import response_caches
+from fdk_organization_bff.service.circuit_breaker import circuit_breakers
+from fdk_organization_bff.service.deadline import upstream_timeout
+from fdk_organization_bff.service.hedging import Hedger
+from fdk_organization_bff.service.retry import with_retry
+from fdk_organization_bff.service.shared_cache import shared_cache
+from fdk_organization_bff.service.single_flight import SingleFlight
 from fdk_organization_bff.sparql.concept_queries import (
     build_concepts_by_publisher_query,
     build_org_concepts_query,
@@ -24,30 +35,254 @@ from fdk_organization_bff.sparql.informationmodel_queries import (
     build_informationmodels_by_publisher_query,
     build_org_informationmodels_query,
 )
-from fdk_organization_bff.utils.mappers import count_list_from_sparql_response
+from fdk_organization_bff.sparql.resource_queries import (
+    build_org_resources_query,
+    build_resources_by_publisher_query,
+)
+from fdk_organization_bff.utils import json_codec
+from fdk_organization_bff.utils.mappers import (
+    count_list_from_sparql_response,
+    org_and_count_value_from_separated_values,
+    sparql_separated_values_columns,
+)
+from fdk_organization_bff.utils.sparql_stream import SparqlBindingsParser
 from fdk_organization_bff.utils.utils import url_with_params
 
+single_flight = SingleFlight()
+SPARQL_RESULTS_JSON = "application/sparql-results+json"
+SPARQL_COUNT_FORMATS = {
+    "csv": ("text/csv", ","),
+    "tsv": ("text/tab-separated-values", "\t"),
+}
+
+READ_CHUNK_SIZE = 64 * 1024
+
+ResponseReader = Callable[[ClientResponse, int], Awaitable[Any]]
+
+sparql_row_hedger = Hedger(
+    percentile=Config.sparql_hedge_percentile(),
+    budget_ratio=Config.sparql_hedge_budget(),
+)
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when an upstream response body exceeds its size limit."""
+
+
+class UpstreamStatusError(Exception):
+    """Raised when upstream answers with an error status, other than 404."""
+
+
+def check_status(response: UpstreamResponse, upstream: UpstreamEnum) -> None:
+    """Raise UpstreamStatusError if response is neither successful nor 404.
+
+    Callers fall back on an error, marking the response degraded, instead of
+    mistaking the missing payload for empty data.
+    """
+    if response.status >= 300 and response.status != 404:
+        raise UpstreamStatusError(f"{upstream.value} answered {response.status}")
+
+
+def check_body_size(size: int, max_bytes: int) -> None:
+    """Raise ResponseTooLargeError if size exceeds max_bytes."""
+    if size > max_bytes:
+        raise ResponseTooLargeError(f"response body exceeds {max_bytes} bytes")
+
+
+async def read_body(response: ClientResponse, max_bytes: int) -> bytes:
+    """Read response body, at most max_bytes."""
+    check_body_size(response.content_length or 0, max_bytes)
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        size += len(chunk)
+        check_body_size(size, max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def read_json(response: ClientResponse, max_bytes: int) -> Any:
+    """Read json payload from response, None if body is empty."""
+    body = await read_body(response, max_bytes)
+    return json_codec.loads(body) if body.strip() else None
+
+
+async def read_sparql_bindings(response: ClientResponse, max_bytes: int) -> Dict:
+    """Read SPARQL json results from response, decoding bindings as they arrive."""
+    check_body_size(response.content_length or 0, max_bytes)
+    parser = SparqlBindingsParser()
+    bindings = []
+    size = 0
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        size += len(chunk)
+        check_body_size(size, max_bytes)
+        bindings.extend(parser.feed(chunk))
+    parser.close()
+    return {"results": {"bindings": bindings}}
+
+
+async def request_upstream(
+    method: str,
+    url: str,
+    session: ClientSession,
+    upstream: UpstreamEnum,
+    reader: ResponseReader = read_json,
+    **kwargs: Any,
+) -> UpstreamResponse:
+    """Send a single request to upstream, return response with payload read by reader.
+
+    Raises CircuitOpenError without calling upstream while its breaker is open.
+    """
+    timeout = upstream_timeout(upstream)
+    max_bytes = Config.upstream_max_body_bytes(upstream)
+    breaker = circuit_breakers[upstream]
+    breaker.before_call()
+    try:
+        async with session.request(method, url, timeout=timeout, **kwargs) as response:
+            payload = (
+                await reader(response, max_bytes) if response.status == 200 else None
+            )
+    except asyncio.CancelledError:
+        breaker.on_cancelled()
+        raise
+    except ResponseTooLargeError:
+        logging.warning(f"Response from {upstream.value} too large: {url[:200]}")
+        breaker.on_success()
+        raise
+    except Exception:
+        if session.closed:
+            breaker.on_cancelled()  # shutting down, not a failure of upstream
+        else:
+            breaker.on_failure()
+        raise
+
+    if response.status >= 500:
+        breaker.on_failure()
+    else:
+        breaker.on_success()
+    return UpstreamResponse(response.status, payload, response.content.total_bytes)
+
+
+async def fetch_upstream(
+    method: str,
+    url: str,
+    session: ClientSession,
+    upstream: UpstreamEnum,
+    key: str,
+    idempotent: bool,
+    hedger: Optional[Hedger] = None,
+    reader: ResponseReader = read_json,
+    cached: bool = True,
+    **kwargs: Any,
+) -> Any:
+    """Fetch payload, from the upstream cache or shared with identical calls in flight.
+
+    Payloads missing in the in-process cache are looked up in the cache shared
+    between workers, when one is configured. Neither cache is used unless
+    cached is set. Idempotent requests are retried
+    on transient failures and may be hedged. Raises UpstreamStatusError if
+    upstream answers with an error status, other than 404, in the end.
+    """
+    cache = response_caches[upstream]
+
+    def request() -> Awaitable[UpstreamResponse]:
+        return request_upstream(method, url, session, upstream, reader, **kwargs)
+
+    def retried_request() -> Awaitable[UpstreamResponse]:
+        return with_retry(request, upstream)
+
+    async def fetch() -> UpstreamResponse:
+        if not idempotent:
+            response = await request()
+        elif hedger:
+            response = await hedger.run(retried_request)
+        else:
+            response = await retried_request()
+        check_status(response, upstream)
+        return response
+
+    def cached_fetch() -> Awaitable[UpstreamResponse]:
+        if shared_cache is None or not cache.enabled:
+            return fetch()
+        return shared_cache.get_or_fetch(key, fetch, cache.ttl)
+
+    def shared_fetch() -> Awaitable[UpstreamResponse]:
+        return single_flight.do(key, cached_fetch)
+
+    if not cached:
+        return (await single_flight.do(key, fetch)).payload
+    return await cache.get_or_fetch(key, shared_fetch)
+
 
 async def fetch_json_data(
-    url: str, params: Optional[Dict[str, str]], session: ClientSession
+    url: str,
+    params: Optional[Dict[str, str]],
+    session: ClientSession,
+    upstream: UpstreamEnum,
 ) -> Optional[Union[Dict, List]]:
     """Fetch json data from url."""
-    async with session.get(url_with_params(url, params)) as response:
-        return await response.json() if response.status == 200 else None
+    full_url = url_with_params(url, params)
+    return await fetch_upstream(
+        "GET", full_url, session, upstream, f"GET {full_url}", True
+    )
 
 
 async def fetch_json_data_with_post(
-    url: str, data: Dict, session: ClientSession
+    url: str, data: Dict, session: ClientSession, upstream: UpstreamEnum
 ) -> Optional[Union[Dict, List]]:
-    """Fetch json data from url."""
-    async with session.post(url, json=data) as response:
-        return await response.json() if response.status == 200 else None
+    """Fetch json data from url, without caching the response."""
+    key = f"POST {url} {json.dumps(data, sort_keys=True)}"
+    return await fetch_upstream(
+        "POST", url, session, upstream, key, False, cached=False, json=data
+    )
+
+
+async def fetch_sparql_data(
+    query: str,
+    session: ClientSession,
+    accept: str,
+    reader: ResponseReader,
+    hedger: Optional[Hedger] = None,
+) -> Any:
+    """Send query to fdk-sparql-service, asking for results in format accept."""
+    url = f"{Config.sparql_uri()}"
+    params = {"query": query}
+    headers = {"Accept": accept}
+    if Config.sparql_method() == "POST":
+        key = f"POST {url_with_params(url, params)} {accept}"
+        return await fetch_upstream(
+            "POST",
+            url,
+            session,
+            UpstreamEnum.FDK_SPARQL,
+            key,
+            True,
+            hedger,
+            reader,
+            data=params,
+            headers=headers,
+        )
+
+    full_url = url_with_params(url, params)
+    return await fetch_upstream(
+        "GET",
+        full_url,
+        session,
+        UpstreamEnum.FDK_SPARQL,
+        f"GET {full_url} {accept}",
+        True,
+        hedger,
+        reader,
+        headers=headers,
+    )
 
 
 async def fetch_org_cat_data(id: str, session: ClientSession) -> Dict:
     """Fetch organization data from organization-catalog."""
     url = f"{Config.org_cat_uri()}/organizations/{id}"
-    org_cat_data = await fetch_json_data(url, None, session)
+    org_cat_data = await fetch_json_data(
+        url, None, session, UpstreamEnum.ORGANIZATION_CATALOG
+    )
     if org_cat_data and isinstance(org_cat_data, Dict):
         return org_cat_data
     else:
@@ -60,14 +295,20 @@ async def fetch_organizations_from_organization_catalog(
     """Fetch organizations from organization-catalog."""
     params = {"orgPath": org_path} if org_path else None
     url = f"{Config.org_cat_uri()}/organizations"
-    org_list = await fetch_json_data(url, params, session)
+    org_list = await fetch_json_data(
+        url, params, session, UpstreamEnum.ORGANIZATION_CATALOG
+    )
     return {org["organizationId"]: org for org in org_list} if org_list else dict()
 
 
 async def fetch_brreg_data(id: str, session: ClientSession) -> Dict:
-    """Fetch organization data from Enhetsregisteret."""
+    """Fetch organization data from Enhetsregisteret, from the local store if it has it."""
+    stored = await brreg_store.lookup(id)
+    if stored is not None:
+        return stored
+
     url = f"{Config.data_brreg_uri()}/enhetsregisteret/api/enheter/{id}"
-    brreg_data = await fetch_json_data(url, None, session)
+    brreg_data = await fetch_json_data(url, None, session, UpstreamEnum.DATA_BRREG)
     if brreg_data and isinstance(brreg_data, Dict):
         return brreg_data
     else:
@@ -77,24 +318,71 @@ async def fetch_brreg_data(id: str, session: ClientSession) -> Dict:
 async def fetch_reference_data(path: str, session: ClientSession) -> Dict:
     """Fetch reference data from reference-data."""
     url = f"{Config.reference_data_uri()}/reference-data{path}"
-    reference_data = await fetch_json_data(url, None, session)
+    reference_data = await fetch_json_data(
+        url, None, session, UpstreamEnum.REFERENCE_DATA
+    )
     if reference_data and isinstance(reference_data, Dict):
         return reference_data
     else:
         return dict()
 
 
-async def query_sparql_service(query: str, session: ClientSession) -> Dict:
-    """Query fdk-sparql-service."""
-    url = f"{Config.sparql_uri()}"
-    params = {"query": query}
-    datasets = await fetch_json_data(url, params, session)
+async def query_sparql_service(
+    query: str, session: ClientSession, hedge: bool = False
+) -> Dict:
+    """Query fdk-sparql-service, hedging slow requests if hedge is set and enabled."""
+    hedger = sparql_row_hedger if hedge and Config.sparql_hedge_enabled() else None
+    reader = read_sparql_bindings if Config.sparql_streaming() else read_json
+    datasets = await fetch_sparql_data(
+        query, session, SPARQL_RESULTS_JSON, reader, hedger
+    )
     if datasets and isinstance(datasets, Dict):
         return datasets
     else:
         return dict()
 
 
+async def read_count_rows(
+    response: ClientResponse, max_bytes: int, separator: str
+) -> List:
+    """Read org and count rows from a separated values response, line by line."""
+    check_body_size(response.content_length or 0, max_bytes)
+    columns = None
+    count_list: List[Dict] = []
+    size = 0
+    async for raw_line in response.content:
+        size += len(raw_line)
+        check_body_size(size, max_bytes)
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+        if not line:
+            continue
+        if columns is None:
+            columns = sparql_separated_values_columns(line, separator)
+            continue
+        row = org_and_count_value_from_separated_values(line, separator, columns)
+        if row:
+            count_list.append(row)
+    return count_list
+
+
+async def query_sparql_counts(query: str, session: ClientSession) -> List:
+    """Query fdk-sparql-service for org and count rows, in configured format."""
+    count_format = SPARQL_COUNT_FORMATS.get(Config.sparql_count_format())
+    if count_format is None:
+        return count_list_from_sparql_response(
+            await query_sparql_service(query, session)
+        )
+
+    accept, separator = count_format
+    count_list = await fetch_sparql_data(
+        query,
+        session,
+        accept,
+        lambda response, max_bytes: read_count_rows(response, max_bytes, separator),
+    )
+    return count_list if count_list else []
+
+
 async def query_publisher_datasets(
     id: str, filter: FilterEnum, session: ClientSession
 ) -> List:
@@ -104,7 +392,7 @@ async def query_publisher_datasets(
     else:
         query = build_org_datasets_query(id)
 
-    response = await query_sparql_service(query, session)
+    response = await query_sparql_service(query, session, hedge=True)
     results = response.get("results")
     org_datasets = results.get("bindings") if results else []
     return org_datasets if org_datasets else []
@@ -118,7 +406,9 @@ async def query_publisher_informationmodels(
         return list()
 
     results = (
-        await query_sparql_service(build_org_informationmodels_query(id), session)
+        await query_sparql_service(
+            build_org_informationmodels_query(id), session, hedge=True
+        )
     ).get("results")
     org_concepts = results.get("bindings") if results else []
 
@@ -132,9 +422,9 @@ async def query_publisher_concepts(
     if filter is FilterEnum.NAP:
         return list()
 
-    results = (await query_sparql_service(build_org_concepts_query(id), session)).get(
-        "results"
-    )
+    results = (
+        await query_sparql_service(build_org_concepts_query(id), session, hedge=True)
+    ).get("results")
     org_concepts = results.get("bindings") if results else []
 
     return org_concepts if org_concepts else []
@@ -147,12 +437,24 @@ async def query_publisher_dataservices(
     if filter is FilterEnum.NAP:
         return list()
     else:
-        response = await query_sparql_service(build_org_dataservice_query(id), session)
+        response = await query_sparql_service(
+            build_org_dataservice_query(id), session, hedge=True
+        )
         results = response.get("results")
         org_dataservices = results.get("bindings") if results else []
         return org_dataservices if org_dataservices else []
 
 
+async def query_publisher_resources(id: str, session: ClientSession) -> List:
+    """Query publisher resources of all types in one request to fdk-sparql-service."""
+    response = await query_sparql_service(
+        build_org_resources_query(id), session, hedge=True
+    )
+    results = response.get("results")
+    org_resources = results.get("bindings") if results else []
+    return org_resources if org_resources else []
+
+
 async def query_all_dataservices_ordered_by_publisher(
     filter: FilterEnum, session: ClientSession
 ) -> List:
@@ -160,10 +462,9 @@ async def query_all_dataservices_ordered_by_publisher(
     if filter is FilterEnum.NAP:
         return list()
     else:
-        response = await query_sparql_service(
+        return await query_sparql_counts(
             build_dataservices_by_publisher_query(), session
         )
-        return count_list_from_sparql_response(response)
 
 
 async def query_all_concepts_ordered_by_publisher(
@@ -173,10 +474,7 @@ async def query_all_concepts_ordered_by_publisher(
     if filter is FilterEnum.NAP:
         return list()
     else:
-        response = await query_sparql_service(
-            build_concepts_by_publisher_query(), session
-        )
-        return count_list_from_sparql_response(response)
+        return await query_sparql_counts(build_concepts_by_publisher_query(), session)
 
 
 async def query_all_informationmodels_ordered_by_publisher(
@@ -186,10 +484,9 @@ async def query_all_informationmodels_ordered_by_publisher(
     if filter is FilterEnum.NAP:
         return list()
     else:
-        response = await query_sparql_service(
+        return await query_sparql_counts(
             build_informationmodels_by_publisher_query(), session
         )
-        return count_list_from_sparql_response(response)
 
 
 async def query_all_datasets_ordered_by_publisher(
@@ -201,8 +498,12 @@ async def query_all_datasets_ordered_by_publisher(
     else:
         query = build_datasets_by_publisher_query()
 
-    response = await query_sparql_service(query, session)
-    return count_list_from_sparql_response(response)
+    return await query_sparql_counts(query, session)
+
+
+async def query_all_resources_grouped_by_publisher(session: ClientSession) -> List:
+    """Query counts of all resource types from fdk-sparql-service, grouped by publisher."""
+    return await query_sparql_counts(build_resources_by_publisher_query(), session)
 
 
 async def fetch_org_dataset_catalog_scores(
@@ -211,7 +512,9 @@ async def fetch_org_dataset_catalog_scores(
     """Fetch rating for organization's dataset catalog from fdk-metadata-quality-service."""
     url = f"{Config.metadata_uri()}/api/scores"
 
-    scores = await fetch_json_data_with_post(url, {"datasets": uris}, session)
+    scores = await fetch_json_data_with_post(
+        url, {"datasets": uris}, session, UpstreamEnum.FDK_METADATA_QUALITY
+    )
 
     if scores and isinstance(scores, Dict):
         return scores
@@ -0,0 +1,253 @@
+"""Module for a local store of Enhetsregisteret data, loaded from its bulk dump."""
+
+import asyncio
+from contextlib import contextmanager, suppress
+import fcntl
+import gzip
+from io import BufferedIOBase
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.client_session import CLIENT_SESSION
+from fdk_organization_bff.utils import json_codec
+from fdk_organization_bff.utils.json_stream import JsonArrayParser
+
+BRREG_FIELDS = (
+    "organisasjonsform",
+    "naeringskode1",
+    "institusjonellSektorkode",
+    "hjemmeside",
+    "antallAnsatte",
+)
+BULK_DUMP_ACCEPT = "application/vnd.brreg.enhetsregisteret.enhet.v2+gzip;charset=UTF-8"
+GZIP_MAGIC = b"\x1f\x8b"
+READ_CHUNK_SIZE = 1024 * 1024
+LOAD_RETRY_SECONDS = 600
+LOCK_POLL_SECONDS = 10
+
+
+def open_dump(dump: BufferedIOBase) -> BufferedIOBase:
+    """Return readable json of the bulk dump, decompressed if it is gzipped."""
+    magic = dump.read(2)
+    dump.seek(0)
+    if magic == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=dump)
+    return dump
+
+
+def build_index(dump_path: str, db_path: str) -> int:
+    """Build SQLite index at db_path from the bulk dump file at dump_path.
+
+    Only the fields used for organization details are kept. The index is
+    written to a temporary file and moved into place when complete. Return
+    number of organizations in the index.
+    """
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    with suppress(FileNotFoundError):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("CREATE TABLE enheter (orgnr TEXT PRIMARY KEY, data BLOB)")
+    parser = JsonArrayParser()
+    count = 0
+    with open(dump_path, "rb") as dump:
+        body = open_dump(dump)
+        chunk = body.read(READ_CHUNK_SIZE)
+        while chunk:
+            rows = [
+                (
+                    enhet["organisasjonsnummer"],
+                    json_codec.dumps({f: enhet[f] for f in BRREG_FIELDS if f in enhet}),
+                )
+                for enhet in parser.feed(chunk)
+                if enhet.get("organisasjonsnummer")
+            ]
+            connection.executemany("INSERT OR REPLACE INTO enheter VALUES (?, ?)", rows)
+            count += len(rows)
+            chunk = body.read(READ_CHUNK_SIZE)
+    parser.close()
+    connection.commit()
+    connection.close()
+    os.replace(tmp_path, db_path)
+    return count
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[bool]:
+    """Lock the file at path unless another process holds it, yield whether locked."""
+    with open(path, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+async def download_dump(session: ClientSession, url: str, path: str) -> None:
+    """Download the bulk dump at url to the file at path."""
+    timeout = ClientTimeout(total=Config.brreg_store_download_timeout())
+    headers = {"Accept": BULK_DUMP_ACCEPT}
+    async with session.get(url, headers=headers, timeout=timeout) as response:
+        response.raise_for_status()
+        with open(path, "wb") as dump:
+            async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                dump.write(chunk)
+
+
+class BrregStore:
+    """Local index of Enhetsregisteret organizations, kept in an SQLite file.
+
+    The index file is shared by all workers using the same db_path. Only the
+    worker holding the lock file next to it loads the index, the others open
+    the index it built.
+    """
+
+    def __init__(self: "BrregStore", source: str, db_path: str) -> None:
+        """Init store of the bulk dump at source, a url or a file path."""
+        self.source = source
+        self.db_path = db_path
+        self.lock_path = f"{db_path}.lock"
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_lock = threading.Lock()
+
+    def open(self: "BrregStore") -> bool:
+        """Open the index file if it exists, return whether it is open.
+
+        An index file that is already open is reopened only if it was replaced.
+        """
+        try:
+            modified_at = os.path.getmtime(self.db_path)
+        except FileNotFoundError:
+            return False
+        if self._connection is not None and modified_at == self.loaded_at:
+            return True
+        connection = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self.close()
+        self._connection = connection
+        self.loaded_at = modified_at
+        return True
+
+    def close(self: "BrregStore") -> None:
+        """Close the index file."""
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def age(self: "BrregStore") -> Optional[float]:
+        """Seconds since the index was built, None if it is not loaded."""
+        return time.time() - self.loaded_at if self.loaded_at else None
+
+    def get(self: "BrregStore", id: str) -> Optional[Dict]:
+        """Return stored fields of organization id, None if it is not stored."""
+        with self._connection_lock:
+            if self._connection is None:
+                return None
+            row = self._connection.execute(
+                "SELECT data FROM enheter WHERE orgnr = ?", (id,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json_codec.loads(row[0])
+
+    async def lookup(self: "BrregStore", id: str) -> Optional[Dict]:
+        """Return stored fields of organization id, reading the index in a thread."""
+        if self._connection is None:
+            return None
+        return await asyncio.to_thread(self.get, id)
+
+    async def load(self: "BrregStore", session: ClientSession) -> None:
+        """Build the index from a fresh copy of the bulk dump, and open it."""
+        started = time.monotonic()
+        dump_path = self.source
+        if self.source.startswith(("http://", "https://")):
+            dump_path = f"{self.db_path}.{os.getpid()}.download"
+            await download_dump(session, self.source, dump_path)
+        try:
+            count = await asyncio.to_thread(build_index, dump_path, self.db_path)
+        finally:
+            if dump_path != self.source:
+                os.remove(dump_path)
+        self.open()
+        logging.info(
+            f"Loaded {count} organizations from Enhetsregisteret bulk dump"
+            f" in {time.monotonic() - started:.1f}s"
+        )
+
+    async def refresh_periodically(
+        self: "BrregStore", session: ClientSession, interval: float
+    ) -> None:
+        """Load the index when it is older than interval seconds, and keep it fresh.
+
+        While another worker loads the index, its lock file is polled, and the
+        index it built is opened. A failed load is logged, and organizations
+        are looked up live meanwhile.
+        """
+        while True:
+            await asyncio.sleep(await self.refresh(session, interval))
+
+    async def refresh(
+        self: "BrregStore", session: ClientSession, interval: float
+    ) -> float:
+        """Load the index if it is older than interval seconds.
+
+        Return seconds until the index should be checked again.
+        """
+        self.open()
+        age = self.age()
+        if age is not None and age < interval:
+            return interval - age
+        try:
+            with file_lock(self.lock_path) as locked:
+                if not locked:
+                    return LOCK_POLL_SECONDS
+                self.open()  # another worker may have loaded it since the check above
+                age = self.age()
+                if age is not None and age < interval:
+                    return interval - age
+                await self.load(session)
+                return interval
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            logging.warning(f"Loading Enhetsregisteret bulk dump failed: {err}")
+            return min(LOAD_RETRY_SECONDS, interval)
+
+
+brreg_store = BrregStore(Config.brreg_store_source(), Config.brreg_store_path())
+
+
+async def brreg_store_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Keep the local Enhetsregisteret store fresh while the app runs, if enabled."""
+    if not Config.brreg_store_enabled():
+        yield
+        return
+
+    task = asyncio.ensure_future(
+        brreg_store.refresh_periodically(
+            app[CLIENT_SESSION], Config.brreg_store_refresh_interval()
+        )
+    )
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+    brreg_store.close()
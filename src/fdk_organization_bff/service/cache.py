@@ -0,0 +1,156 @@
+"""Module for in-process caching of upstream responses."""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from fdk_organization_bff.classes import UpstreamEnum, UpstreamResponse
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.deadline import set_deadline
+
+
+@dataclass
+class CacheEntry:
+    """Data class with a cached payload and its expiry times."""
+
+    payload: Any
+    size: int
+    fresh_until: float
+    stale_until: float
+
+
+class ResponseCache:
+    """LRU cache of upstream payloads, bounded by total size in bytes.
+
+    The size of an entry is the size of the response body it was decoded from.
+    An entry past its ttl is still served for stale_ttl seconds while a single
+    background refresh replaces it.
+    """
+
+    def __init__(
+        self: "ResponseCache", name: str, max_bytes: int, ttl: float, stale_ttl: float
+    ) -> None:
+        """Init empty cache."""
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.size_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Future] = dict()
+
+    def __len__(self: "ResponseCache") -> int:
+        """Return number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def enabled(self: "ResponseCache") -> bool:
+        """Return whether anything may be cached."""
+        return self.ttl > 0 and self.max_bytes > 0
+
+    async def get_or_fetch(
+        self: "ResponseCache",
+        key: str,
+        fetch: Callable[[], Awaitable[UpstreamResponse]],
+    ) -> Any:
+        """Return cached payload for key, calling fetch when it is missing.
+
+        A stale payload is returned at once, refreshed in the background.
+        """
+        if not self.enabled:
+            return (await fetch()).payload
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.stale_until <= now:
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            response = await fetch()
+            self.put(key, response)
+            return response.payload
+
+        self._entries.move_to_end(key)
+        if entry.fresh_until > now:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+            self._refresh(key, fetch)
+        return entry.payload
+
+    def put(self: "ResponseCache", key: str, response: UpstreamResponse) -> None:
+        """Cache payload of a successful response, evicting least recently used."""
+        if response.status != 200 or response.payload is None:
+            return
+        size = response.size + len(key)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        now = time.monotonic()
+        fresh_until = now + self.ttl - response.age
+        self._entries[key] = CacheEntry(
+            response.payload, size, fresh_until, fresh_until + self.stale_ttl
+        )
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self: "ResponseCache") -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _remove(self: "ResponseCache", key: str) -> None:
+        """Remove entry for key."""
+        entry = self._entries.pop(key)
+        self.size_bytes -= entry.size
+
+    def _refresh(
+        self: "ResponseCache",
+        key: str,
+        fetch: Callable[[], Awaitable[UpstreamResponse]],
+    ) -> None:
+        """Start background refresh of key, unless one is already running."""
+        task = self._refreshing.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return
+
+        async def refresh() -> None:
+            set_deadline(None)  # not bounded by the request that found it stale
+            try:
+                self.put(key, await fetch())
+            except Exception as err:
+                logging.warning(f"Refresh of cached {self.name} response failed: {err}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+
+    def _forget(self: "ResponseCache", key: str, task: asyncio.Future) -> None:
+        """Remove finished refresh."""
+        if self._refreshing.get(key) is task:
+            del self._refreshing[key]
+
+
+response_caches: Dict[UpstreamEnum, ResponseCache] = {
+    upstream: ResponseCache(
+        name=upstream.value,
+        max_bytes=Config.cache_max_bytes(upstream),
+        ttl=Config.cache_ttl(upstream),
+        stale_ttl=Config.cache_stale_ttl(upstream),
+    )
+    for upstream in UpstreamEnum
+}
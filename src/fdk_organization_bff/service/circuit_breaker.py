@@ -0,0 +1,120 @@
+"""Module for circuit breakers on upstream calls."""
+
+from collections import deque
+from enum import Enum
+import logging
+import time
+from typing import Deque, Dict
+
+from fdk_organization_bff.classes import UpstreamEnum
+from fdk_organization_bff.config import Config
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit breaker."""
+
+
+class BreakerState(Enum):
+    """Enum class with circuit breaker states, valued by their metric value."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """Circuit breaker failing fast after a high failure rate."""
+
+    def __init__(
+        self: "CircuitBreaker",
+        name: str,
+        failure_rate: float,
+        window: int,
+        min_calls: int,
+        open_seconds: float,
+        half_open_probes: int,
+    ) -> None:
+        """Init closed circuit breaker."""
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = BreakerState.CLOSED
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    def before_call(self: "CircuitBreaker") -> None:
+        """Check that a call may be made, raise CircuitOpenError if not."""
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected_count += 1
+                raise CircuitOpenError(f"circuit breaker for {self.name} is open")
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state is BreakerState.HALF_OPEN:
+            if self._probes_started >= self.half_open_probes:
+                self.rejected_count += 1
+                raise CircuitOpenError(f"circuit breaker for {self.name} is half-open")
+            self._probes_started += 1
+
+    def on_success(self: "CircuitBreaker") -> None:
+        """Record a successful call."""
+        if self.state is BreakerState.HALF_OPEN:
+            self._probes_succeeded += 1
+            if self._probes_succeeded >= self.half_open_probes:
+                self._transition(BreakerState.CLOSED)
+        else:
+            self._outcomes.append(True)
+
+    def on_failure(self: "CircuitBreaker") -> None:
+        """Record a failed call."""
+        if self.state is BreakerState.HALF_OPEN:
+            self._transition(BreakerState.OPEN)
+            return
+
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            self.state is BreakerState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._transition(BreakerState.OPEN)
+
+    def on_cancelled(self: "CircuitBreaker") -> None:
+        """Record a call cancelled before it completed."""
+        if self.state is BreakerState.HALF_OPEN and self._probes_started > 0:
+            self._probes_started -= 1
+
+    def _transition(self: "CircuitBreaker", state: BreakerState) -> None:
+        """Move breaker to state."""
+        self.state = state
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        if state is BreakerState.OPEN:
+            self.opened_count += 1
+            self._opened_at = time.monotonic()
+            logging.warning(f"Circuit breaker for {self.name} opened")
+        elif state is BreakerState.HALF_OPEN:
+            logging.info(f"Circuit breaker for {self.name} half-open, probing")
+        else:
+            self._outcomes.clear()
+            logging.info(f"Circuit breaker for {self.name} closed")
+
+
+circuit_breakers: Dict[UpstreamEnum, CircuitBreaker] = {
+    upstream: CircuitBreaker(
+        name=upstream.value,
+        failure_rate=Config.breaker_failure_rate(upstream),
+        window=Config.breaker_window(upstream),
+        min_calls=Config.breaker_min_calls(upstream),
+        open_seconds=Config.breaker_open_seconds(upstream),
+        half_open_probes=Config.breaker_half_open_probes(upstream),
+    )
+    for upstream in UpstreamEnum
+}
@@ -0,0 +1,38 @@
+"""Module for the shared upstream client session."""
+
+import importlib.util
+from typing import AsyncIterator
+
+from aiohttp import ClientSession, TCPConnector, web
+
+from fdk_organization_bff.config import Config
+
+CLIENT_SESSION = web.AppKey("client_session", ClientSession)
+
+
+def accept_encoding() -> str:
+    """Content codings upstreams may compress responses with."""
+    codings = ["gzip", "deflate"]
+    if any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi")):
+        codings.append("br")
+    return ", ".join(codings)
+
+
+def create_client_session() -> ClientSession:
+    """Create a client session with a pooled connector for upstream requests."""
+    connector = TCPConnector(
+        limit=Config.client_connection_limit(),
+        limit_per_host=Config.client_connection_limit_per_host(),
+        keepalive_timeout=Config.client_keepalive_timeout(),
+        ttl_dns_cache=Config.client_dns_cache_ttl(),
+    )
+    return ClientSession(
+        connector=connector, headers={"Accept-Encoding": accept_encoding()}
+    )
+
+
+async def client_session_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Keep one client session open for the lifetime of the application."""
+    app[CLIENT_SESSION] = create_client_session()
+    yield
+    await app[CLIENT_SESSION].close()
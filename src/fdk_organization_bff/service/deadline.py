@@ -0,0 +1,38 @@
+"""Module for per-request deadlines on upstream calls."""
+
+import asyncio
+from contextvars import ContextVar
+import time
+from typing import Optional
+
+from aiohttp import ClientTimeout
+
+from fdk_organization_bff.classes import UpstreamEnum
+from fdk_organization_bff.config import Config
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    """Set deadline for the current request, seconds from now."""
+    _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, None if unbounded."""
+    deadline = _deadline.get()
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+def upstream_timeout(upstream: UpstreamEnum) -> ClientTimeout:
+    """Timeout for a call to upstream, bounded by the current request's deadline.
+
+    Raises asyncio.TimeoutError if the deadline has already passed.
+    """
+    timeout = Config.upstream_timeout(upstream)
+    remaining = remaining_time()
+    if remaining is not None:
+        if remaining <= 0:
+            raise asyncio.TimeoutError(f"request deadline exceeded before {upstream}")
+        timeout = min(timeout, remaining)
+    return ClientTimeout(total=timeout)
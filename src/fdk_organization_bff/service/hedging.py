@@ -0,0 +1,94 @@
+"""Module for hedging slow upstream requests."""
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any, Awaitable, Callable, Deque, Optional, Set
+
+
+class LatencyTracker:
+    """Rolling window of observed request latencies."""
+
+    def __init__(self: "LatencyTracker", window: int, min_samples: int) -> None:
+        """Init tracker keeping the latest window latencies."""
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def record(self: "LatencyTracker", latency: float) -> None:
+        """Record latency in seconds."""
+        self._latencies.append(latency)
+
+    def percentile(self: "LatencyTracker", percentile: float) -> Optional[float]:
+        """Return latency at percentile, None until enough samples are recorded."""
+        if len(self._latencies) < self._min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to a ratio of all requests."""
+
+    def __init__(self: "HedgeBudget", ratio: float, max_tokens: float) -> None:
+        """Init budget earning ratio tokens per request."""
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = 0.0
+
+    def on_request(self: "HedgeBudget") -> None:
+        """Earn tokens for a request."""
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self: "HedgeBudget") -> bool:
+        """Spend a token for a hedge, return False if budget is used up."""
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+class Hedger:
+    """Send a second identical request when the first is slower than usual."""
+
+    def __init__(
+        self: "Hedger", percentile: float, budget_ratio: float, window: int = 1000
+    ) -> None:
+        """Init hedger firing at percentile of observed latency within budget."""
+        self.percentile = percentile
+        self.latencies = LatencyTracker(window=window, min_samples=20)
+        self.budget = HedgeBudget(ratio=budget_ratio, max_tokens=10)
+        self.hedges = 0
+
+    async def run(self: "Hedger", request: Callable[[], Awaitable[Any]]) -> Any:
+        """Return result of request, hedged by a second attempt if it is slow.
+
+        Whichever attempt answers first wins and the other one is cancelled.
+        """
+        self.budget.on_request()
+        start = time.monotonic()
+        pending: Set[asyncio.Future] = {asyncio.ensure_future(request())}
+        try:
+            delay = self.latencies.percentile(self.percentile)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self.budget.try_spend():
+                    self.hedges += 1
+                    logging.debug(f"Hedging request slower than {delay:.3f}s")
+                    pending.add(asyncio.ensure_future(request()))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.record(time.monotonic() - start)
+                        return task.result()
+                    error = error or task.exception()
+            raise error if error else asyncio.CancelledError()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,314 @@
+"""Module for rendering service metrics in Prometheus text format."""
+
+from typing import Dict, List, Tuple, Union
+
+from fdk_organization_bff.service.adapter import single_flight
+from fdk_organization_bff.service.brreg_store import brreg_store
+from fdk_organization_bff.service.cache import response_caches
+from fdk_organization_bff.service.circuit_breaker import circuit_breakers
+from fdk_organization_bff.service.org_registry import org_registry
+from fdk_organization_bff.service.reference_store import (
+    municipality_store,
+    ReferenceStore,
+)
+from fdk_organization_bff.service.rendered_cache import negative_cache, rendered_cache
+from fdk_organization_bff.service.score_cache import score_cache
+from fdk_organization_bff.service.shared_cache import shared_cache
+from fdk_organization_bff.service.snapshot import publisher_snapshot
+
+Sample = Tuple[Dict[str, str], Union[int, float]]
+
+_PREFIX = "fdk_organization_bff"
+
+
+def format_metric(name: str, kind: str, help: str, samples: List[Sample]) -> str:
+    """Format samples of one metric."""
+    lines = [f"# HELP {_PREFIX}_{name} {help}", f"# TYPE {_PREFIX}_{name} {kind}"]
+    for labels, value in samples:
+        label_str = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        label_part = f"{{{label_str}}}" if label_str else ""
+        lines.append(f"{_PREFIX}_{name}{label_part} {value}")
+    return "\n".join(lines)
+
+
+def circuit_breaker_metrics() -> List[str]:
+    """Metrics for upstream circuit breakers."""
+    breakers = circuit_breakers.values()
+    return [
+        format_metric(
+            "circuit_breaker_state",
+            "gauge",
+            "Circuit breaker state, 0 closed, 1 half-open, 2 open.",
+            [({"upstream": b.name}, b.state.value) for b in breakers],
+        ),
+        format_metric(
+            "circuit_breaker_opened_total",
+            "counter",
+            "Number of times the circuit breaker has opened.",
+            [({"upstream": b.name}, b.opened_count) for b in breakers],
+        ),
+        format_metric(
+            "circuit_breaker_rejected_total",
+            "counter",
+            "Number of upstream calls rejected by the circuit breaker.",
+            [({"upstream": b.name}, b.rejected_count) for b in breakers],
+        ),
+    ]
+
+
+def single_flight_metrics() -> List[str]:
+    """Metrics for coalescing of identical upstream calls."""
+    return [
+        format_metric(
+            "single_flight_coalesced_total",
+            "counter",
+            "Number of upstream calls served by an identical call in flight.",
+            [({}, single_flight.coalesced_count)],
+        ),
+    ]
+
+
+def cache_metrics() -> List[str]:
+    """Metrics for the upstream response caches."""
+    caches = response_caches.values()
+    return [
+        format_metric(
+            "cache_hits_total",
+            "counter",
+            "Number of upstream calls served fresh from cache.",
+            [({"upstream": c.name}, c.hits) for c in caches],
+        ),
+        format_metric(
+            "cache_stale_hits_total",
+            "counter",
+            "Number of upstream calls served stale from cache while refreshed.",
+            [({"upstream": c.name}, c.stale_hits) for c in caches],
+        ),
+        format_metric(
+            "cache_misses_total",
+            "counter",
+            "Number of upstream calls not found in cache.",
+            [({"upstream": c.name}, c.misses) for c in caches],
+        ),
+        format_metric(
+            "cache_evictions_total",
+            "counter",
+            "Number of cached responses evicted to stay within the size limit.",
+            [({"upstream": c.name}, c.evictions) for c in caches],
+        ),
+        format_metric(
+            "cache_entries",
+            "gauge",
+            "Number of cached responses.",
+            [({"upstream": c.name}, len(c)) for c in caches],
+        ),
+        format_metric(
+            "cache_size_bytes",
+            "gauge",
+            "Total size in bytes of cached responses.",
+            [({"upstream": c.name}, c.size_bytes) for c in caches],
+        ),
+    ]
+
+
+def shared_cache_metrics() -> List[str]:
+    """Metrics for the cache shared between workers, none if it is disabled."""
+    if shared_cache is None:
+        return []
+    labels = {"backend": shared_cache.name}
+    return [
+        format_metric(
+            "shared_cache_hits_total",
+            "counter",
+            "Number of upstream calls served from the shared cache.",
+            [(labels, shared_cache.hits)],
+        ),
+        format_metric(
+            "shared_cache_misses_total",
+            "counter",
+            "Number of upstream calls not found in the shared cache.",
+            [(labels, shared_cache.misses)],
+        ),
+        format_metric(
+            "shared_cache_errors_total",
+            "counter",
+            "Number of failed reads and writes of the shared cache.",
+            [(labels, shared_cache.errors)],
+        ),
+    ]
+
+
+def snapshot_metrics() -> List[str]:
+    """Metrics for the publisher snapshot."""
+    snapshot = publisher_snapshot.current
+    metrics = [
+        format_metric(
+            "snapshot_builds_total",
+            "counter",
+            "Number of publisher snapshots built.",
+            [({}, publisher_snapshot.builds)],
+        ),
+        format_metric(
+            "snapshot_build_failures_total",
+            "counter",
+            "Number of failed publisher snapshot builds.",
+            [({}, publisher_snapshot.failures)],
+        ),
+    ]
+    if snapshot is not None:
+        metrics += [
+            format_metric(
+                "snapshot_age_seconds",
+                "gauge",
+                "Seconds since the current publisher snapshot was built.",
+                [({}, round(publisher_snapshot.age() or 0, 3))],
+            ),
+            format_metric(
+                "snapshot_build_duration_seconds",
+                "gauge",
+                "Seconds the current publisher snapshot took to build.",
+                [({}, round(snapshot.build_duration, 3))],
+            ),
+            format_metric(
+                "snapshot_version",
+                "gauge",
+                "Version of the current publisher snapshot.",
+                [({}, snapshot.version)],
+            ),
+        ]
+    return metrics
+
+
+def rendered_cache_metrics() -> List[str]:
+    """Metrics for the rendered response cache."""
+    return [
+        format_metric(
+            "rendered_cache_hits_total",
+            "counter",
+            "Number of responses served from the rendered response cache.",
+            [({}, rendered_cache.hits)],
+        ),
+        format_metric(
+            "rendered_cache_misses_total",
+            "counter",
+            "Number of responses rendered because they were not cached.",
+            [({}, rendered_cache.misses)],
+        ),
+        format_metric(
+            "rendered_cache_size_bytes",
+            "gauge",
+            "Total size in bytes of cached rendered responses.",
+            [({}, rendered_cache.size_bytes)],
+        ),
+        format_metric(
+            "negative_cache_hits_total",
+            "counter",
+            "Number of responses without data served from the negative cache.",
+            [({}, negative_cache.hits)],
+        ),
+        format_metric(
+            "negative_cache_entries",
+            "gauge",
+            "Number of remembered responses without data.",
+            [({}, len(negative_cache))],
+        ),
+    ]
+
+
+def score_cache_metrics() -> List[str]:
+    """Metrics for the dataset quality score cache."""
+    return [
+        format_metric(
+            "score_cache_hits_total",
+            "counter",
+            "Number of dataset quality scores found in the cache.",
+            [({}, score_cache.hits)],
+        ),
+        format_metric(
+            "score_cache_misses_total",
+            "counter",
+            "Number of dataset quality scores not cached.",
+            [({}, score_cache.misses)],
+        ),
+        format_metric(
+            "score_cache_entries",
+            "gauge",
+            "Number of datasets with cached quality scores.",
+            [({}, len(score_cache))],
+        ),
+    ]
+
+
+def brreg_store_metrics() -> List[str]:
+    """Metrics for the local Enhetsregisteret store."""
+    metrics = [
+        format_metric(
+            "brreg_store_hits_total",
+            "counter",
+            "Number of organizations found in the local Enhetsregisteret store.",
+            [({}, brreg_store.hits)],
+        ),
+        format_metric(
+            "brreg_store_misses_total",
+            "counter",
+            "Number of organizations looked up live, missing in the local store.",
+            [({}, brreg_store.misses)],
+        ),
+    ]
+    age = brreg_store.age()
+    if age is not None:
+        metrics.append(
+            format_metric(
+                "brreg_store_age_seconds",
+                "gauge",
+                "Seconds since the local Enhetsregisteret store was built.",
+                [({}, round(age, 3))],
+            )
+        )
+    return metrics
+
+
+def reference_store_metrics(name: str, store: ReferenceStore) -> List[str]:
+    """Metrics for reference data loaded in the background, prefixed with name."""
+    metrics = [
+        format_metric(
+            f"{name}_loads_total",
+            "counter",
+            f"Number of {store.name} loads.",
+            [({}, store.loads)],
+        ),
+        format_metric(
+            f"{name}_load_failures_total",
+            "counter",
+            f"Number of failed {store.name} loads.",
+            [({}, store.failures)],
+        ),
+    ]
+    age = store.age()
+    if age is not None:
+        metrics.append(
+            format_metric(
+                f"{name}_age_seconds",
+                "gauge",
+                f"Seconds since the {store.name} was loaded.",
+                [({}, round(age, 3))],
+            )
+        )
+    return metrics
+
+
+def render_metrics() -> str:
+    """Render all metrics."""
+    metrics = (
+        circuit_breaker_metrics()
+        + single_flight_metrics()
+        + cache_metrics()
+        + shared_cache_metrics()
+        + snapshot_metrics()
+        + rendered_cache_metrics()
+        + score_cache_metrics()
+        + brreg_store_metrics()
+        + reference_store_metrics("municipality_index", municipality_store)
+        + reference_store_metrics("org_registry", org_registry)
+    )
+    return "\n".join(metrics) + "\n"
@@ -1,18 +1,22 @@
 """Service layer module for fdk-organization-bff."""
 
 import asyncio
+from contextlib import suppress
 import logging
-from typing import cast, Dict, List, Optional, Union
+import time
+from typing import AsyncIterator, cast, Dict, FrozenSet, List, Optional, Union
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, web
 
 from fdk_organization_bff.classes import (
     FilterEnum,
+    MunicipalityIndex,
     OrganizationCatalog,
     OrganizationCatalogList,
     OrganizationCatalogSummary,
     OrganizationCategories,
 )
+from fdk_organization_bff.config import Config
 from fdk_organization_bff.service.adapter import (
     fetch_brreg_data,
     fetch_org_cat_data,
@@ -23,82 +27,139 @@ from fdk_organization_bff.service.adapter import (
     query_all_dataservices_ordered_by_publisher,
     query_all_datasets_ordered_by_publisher,
     query_all_informationmodels_ordered_by_publisher,
+    query_all_resources_grouped_by_publisher,
     query_publisher_concepts,
     query_publisher_dataservices,
     query_publisher_datasets,
     query_publisher_informationmodels,
+    query_publisher_resources,
 )
+from fdk_organization_bff.service.client_session import CLIENT_SESSION
+from fdk_organization_bff.service.org_registry import (
+    org_registry,
+    OrganizationRegistry,
+)
+from fdk_organization_bff.service.reference_store import municipality_store
+from fdk_organization_bff.service.rendered_cache import mark_degraded
+from fdk_organization_bff.service.score_cache import score_cache
+from fdk_organization_bff.service.snapshot import (
+    org_paths_key,
+    publisher_snapshot,
+    PublisherSnapshot,
+)
+from fdk_organization_bff.service.state_file import first_refresh_delay
 from fdk_organization_bff.utils.mappers import (
+    aggregate_dataset_scores,
     categorise_summaries_by_municipality,
     categorise_summaries_by_parent_org,
     empty_concepts,
     empty_dataservices,
     empty_datasets,
     empty_informationmodels,
+    index_municipalities,
+    map_dataset_score_dimensions,
     map_org_concepts,
     map_org_dataservices,
     map_org_datasets,
     map_org_details,
     map_org_informationmodels,
     map_org_summaries,
+    map_org_summaries_from_counts,
+    merge_grouped_org_counts,
+    merge_org_counts,
+    split_org_resources,
 )
+from fdk_organization_bff.utils.utils import is_org_number
+
+STATE_ORG_PATHS = ["/STAT/"]
+MUNICIPALITY_ORG_PATHS = ["/FYLKE/", "/KOMMUNE/"]
+SNAPSHOT_FILTERS = [FilterEnum.NONE, FilterEnum.NAP]
+SNAPSHOT_ORG_PATHS = [None, STATE_ORG_PATHS, MUNICIPALITY_ORG_PATHS]
+
+
+def organization_may_exist(id: str) -> bool:
+    """Check that id is an organization number known to the publisher snapshot.
+
+    Any organization number may exist until the first snapshot is built.
+    """
+    if not is_org_number(id):
+        return False
+    snapshot = publisher_snapshot.current
+    return snapshot is None or id in snapshot.org_ids
 
 
 async def get_organization_catalog(
-    id: str, filter: FilterEnum
+    id: str, filter: FilterEnum, session: ClientSession
 ) -> Optional[OrganizationCatalog]:
     """Return specific organization catalog."""
     logging.debug(f"Fetching catalog for organization with id {id}")
 
-    async with ClientSession() as session:
-        (
-            org_cat_data,
-            brreg_data,
-            org_datasets,
-            org_dataservices,
-            org_concepts,
-            org_informationmodels,
-        ) = await asyncio.gather(
-            asyncio.ensure_future(fetch_org_cat_data(id, session)),
-            asyncio.ensure_future(fetch_brreg_data(id, session)),
-            asyncio.ensure_future(query_publisher_datasets(id, filter, session)),
-            asyncio.ensure_future(query_publisher_dataservices(id, filter, session)),
-            asyncio.ensure_future(query_publisher_concepts(id, filter, session)),
-            asyncio.ensure_future(
-                query_publisher_informationmodels(id, filter, session)
-            ),
-            return_exceptions=True,
-        )
+    if filter is FilterEnum.NONE and Config.sparql_combined_org_query():
+        resource_queries = [query_publisher_resources(id, session)]
+    else:
+        resource_queries = [
+            query_publisher_datasets(id, filter, session),
+            query_publisher_dataservices(id, filter, session),
+            query_publisher_concepts(id, filter, session),
+            query_publisher_informationmodels(id, filter, session),
+        ]
+
+    (org_cat_data, brreg_data, *org_resources) = await asyncio.gather(
+        asyncio.ensure_future(fetch_org_cat_data(id, session)),
+        asyncio.ensure_future(fetch_brreg_data(id, session)),
+        *(asyncio.ensure_future(query) for query in resource_queries),
+        return_exceptions=True,
+    )
+    if len(org_resources) == 1:
+        if isinstance(org_resources[0], BaseException):
+            logging.warning("Unable to fetch org resources")
+            mark_degraded()
+            org_resources = [[], [], [], []]
+        else:
+            org_resources = list(split_org_resources(org_resources[0]))
+    (
+        org_datasets,
+        org_dataservices,
+        org_concepts,
+        org_informationmodels,
+    ) = org_resources
 
     if isinstance(org_cat_data, BaseException):
         logging.warning("Unable to fetch org catalog data")
+        mark_degraded()
         org_cat_data = None
     if isinstance(brreg_data, BaseException):
         logging.warning("Unable to fetch Brreg data")
+        mark_degraded()
         brreg_data = None
     if isinstance(org_datasets, BaseException):
         logging.warning("Unable to fetch org datasets")
+        mark_degraded()
         org_datasets = []
     if isinstance(org_dataservices, BaseException):
         logging.warning("Unable to fetch org dataservices")
+        mark_degraded()
         org_dataservices = []
     if isinstance(org_concepts, BaseException):
         logging.warning("Unable to fetch org concepts")
+        mark_degraded()
         org_concepts = []
     if isinstance(org_informationmodels, BaseException):
         logging.warning("Unable to fetch org info models")
+        mark_degraded()
         org_informationmodels = []
 
-    org_datasets_scores = {}
+    org_datasets_scores: Union[Dict, BaseException] = {}
     if len(org_datasets) > 0:
         dataset_uris = [ds["dataset"]["value"] for ds in org_datasets]
-        async with ClientSession() as session:
-            org_datasets_scores = await asyncio.ensure_future(
-                fetch_org_dataset_catalog_scores(dataset_uris, session)
-            )
+        (org_datasets_scores,) = await asyncio.gather(
+            asyncio.ensure_future(fetch_dataset_scores(dataset_uris, session)),
+            return_exceptions=True,
+        )
 
     if isinstance(org_datasets_scores, BaseException):
         logging.warning("Unable to fetch org datasets scores")
+        mark_degraded()
         org_datasets_scores = {}
 
     logging.debug("Counts ")
@@ -143,50 +204,88 @@ async def get_organization_catalog(
         return None
 
 
+async def fetch_dataset_scores(uris: List[str], session: ClientSession) -> Dict:
+    """Return quality scores of datasets aggregated by dimension, fetching uncached scores.
+
+    Datasets without a score are cached as having no dimension scores. Raises
+    ValueError if the fetched scores can not be read, so that no score is
+    aggregated from the cached datasets alone.
+    """
+    dimension_scores = {uri: score_cache.get(uri) for uri in uris}
+    missing = [uri for uri, dims in dimension_scores.items() if dims is None]
+    if missing:
+        score_data = await fetch_org_dataset_catalog_scores(missing, session)
+        try:
+            scores = score_data["scores"]
+            fetched = {
+                uri: map_dataset_score_dimensions(scores[uri]) if uri in scores else []
+                for uri in missing
+            }
+        except (KeyError, TypeError) as err:
+            raise ValueError("bad dataset scores from fdk-mqa-score-api") from err
+        for uri, dims in fetched.items():
+            dimension_scores[uri] = dims
+            score_cache.put(uri, dims)
+
+    return aggregate_dataset_scores(dims or [] for dims in dimension_scores.values())
+
+
 async def summarize_catalog_data_for_organizations(
-    filter: FilterEnum, include_empty: Optional[str], org_paths: Optional[List[str]]
+    filter: FilterEnum,
+    include_empty: Optional[str],
+    org_paths: Optional[List[str]],
+    session: ClientSession,
 ) -> List[OrganizationCatalogSummary]:
-    """Fetch and summarize organizations data."""
-    async with ClientSession() as session:
-        (
-            organizations,
-            datasets,
-            dataservices,
-            concepts,
-            informationmodels,
-        ) = await asyncio.gather(
-            asyncio.ensure_future(
-                fetch_organizations_for_org_paths(org_paths, session)
-            ),
-            asyncio.ensure_future(
-                query_all_datasets_ordered_by_publisher(filter, session)
-            ),
-            asyncio.ensure_future(
-                query_all_dataservices_ordered_by_publisher(filter, session)
-            ),
-            asyncio.ensure_future(
-                query_all_concepts_ordered_by_publisher(filter, session)
-            ),
-            asyncio.ensure_future(
-                query_all_informationmodels_ordered_by_publisher(filter, session)
-            ),
-            return_exceptions=True,
+    """Fetch and summarize organizations data.
+
+    Served from the publisher snapshot when one has been built.
+    """
+    snapshot = publisher_snapshot.current
+    if snapshot is not None and filter in snapshot.org_counts:
+        return await summarize_from_snapshot(
+            snapshot, filter, include_empty, org_paths, session
         )
+    if filter is FilterEnum.NONE and Config.sparql_grouped_count_query():
+        return await summarize_from_grouped_counts(include_empty, org_paths, session)
+
+    (
+        organizations,
+        datasets,
+        dataservices,
+        concepts,
+        informationmodels,
+    ) = await asyncio.gather(
+        asyncio.ensure_future(fetch_organizations_for_org_paths(org_paths, session)),
+        asyncio.ensure_future(query_all_datasets_ordered_by_publisher(filter, session)),
+        asyncio.ensure_future(
+            query_all_dataservices_ordered_by_publisher(filter, session)
+        ),
+        asyncio.ensure_future(query_all_concepts_ordered_by_publisher(filter, session)),
+        asyncio.ensure_future(
+            query_all_informationmodels_ordered_by_publisher(filter, session)
+        ),
+        return_exceptions=True,
+    )
 
     if isinstance(organizations, BaseException):
         logging.warning("Unable to fetch all organizations")
+        mark_degraded()
         organizations = {}
     if isinstance(datasets, BaseException):
         logging.warning("Unable to fetch datasets")
+        mark_degraded()
         datasets = []
     if isinstance(dataservices, BaseException):
         logging.warning("Unable to fetch dataservices")
+        mark_degraded()
         dataservices = []
     if isinstance(concepts, BaseException):
         logging.warning("Unable to fetch concepts")
+        mark_degraded()
         concepts = []
     if isinstance(informationmodels, BaseException):
         logging.warning("Unable to fetch informationmodels")
+        mark_degraded()
         informationmodels = []
 
     return map_org_summaries(
@@ -196,16 +295,150 @@ async def summarize_catalog_data_for_organizations(
         concepts=cast(List, concepts),
         informationmodels=cast(List, informationmodels),
         include_empty=include_empty.lower() == "true" if include_empty else False,
+        public_sector_ids=public_sector_ids(),
     )
 
 
+async def summarize_from_snapshot(
+    snapshot: PublisherSnapshot,
+    filter: FilterEnum,
+    include_empty: Optional[str],
+    org_paths: Optional[List[str]],
+    session: ClientSession,
+) -> List[OrganizationCatalogSummary]:
+    """Summarize organizations data in snapshot."""
+    organizations = snapshot.organizations.get(org_paths_key(org_paths))
+    if organizations is None:
+        try:
+            organizations = await fetch_organizations_for_org_paths(org_paths, session)
+        except Exception:
+            logging.warning("Unable to fetch all organizations")
+            mark_degraded()
+            organizations = {}
+
+    return map_org_summaries_from_counts(
+        organizations=organizations,
+        org_counts=snapshot.org_counts[filter],
+        include_empty=include_empty.lower() == "true" if include_empty else False,
+        public_sector_ids=public_sector_ids(),
+    )
+
+
+async def summarize_from_grouped_counts(
+    include_empty: Optional[str],
+    org_paths: Optional[List[str]],
+    session: ClientSession,
+) -> List[OrganizationCatalogSummary]:
+    """Summarize organizations data with counts of all resource types from one query."""
+    organizations, count_list = await asyncio.gather(
+        asyncio.ensure_future(fetch_organizations_for_org_paths(org_paths, session)),
+        asyncio.ensure_future(query_all_resources_grouped_by_publisher(session)),
+        return_exceptions=True,
+    )
+
+    if isinstance(organizations, BaseException):
+        logging.warning("Unable to fetch all organizations")
+        mark_degraded()
+        organizations = {}
+    if isinstance(count_list, BaseException):
+        logging.warning("Unable to fetch resource counts")
+        mark_degraded()
+        count_list = []
+
+    return map_org_summaries_from_counts(
+        organizations=cast(Dict, organizations),
+        org_counts=merge_grouped_org_counts(cast(List, count_list)),
+        include_empty=include_empty.lower() == "true" if include_empty else False,
+        public_sector_ids=public_sector_ids(),
+    )
+
+
+def public_sector_ids() -> Optional[FrozenSet[str]]:
+    """Return ids of STAT, FYLKE and KOMMUNE organizations, None without registry."""
+    registry = org_registry.current
+    return registry.public_sector_ids if registry else None
+
+
+async def fetch_org_counts(filter: FilterEnum, session: ClientSession) -> Dict:
+    """Fetch merged counts by organization of each entity type."""
+    if filter is FilterEnum.NONE and Config.sparql_grouped_count_query():
+        return merge_grouped_org_counts(
+            await query_all_resources_grouped_by_publisher(session)
+        )
+
+    (
+        datasets,
+        dataservices,
+        concepts,
+        informationmodels,
+    ) = await asyncio.gather(
+        query_all_datasets_ordered_by_publisher(filter, session),
+        query_all_dataservices_ordered_by_publisher(filter, session),
+        query_all_concepts_ordered_by_publisher(filter, session),
+        query_all_informationmodels_ordered_by_publisher(filter, session),
+    )
+    return merge_org_counts(datasets, dataservices, concepts, informationmodels)
+
+
+async def build_publisher_snapshot(session: ClientSession) -> PublisherSnapshot:
+    """Build snapshot of counts for each filter and organizations for each org path.
+
+    Raises UpstreamStatusError if any upstream call answered with an error
+    status, and ValueError if upstreams answered without organizations or counts,
+    so that the previous snapshot is kept.
+    """
+    started = time.monotonic()
+    org_counts_list, organizations_list = await asyncio.gather(
+        asyncio.gather(*(fetch_org_counts(f, session) for f in SNAPSHOT_FILTERS)),
+        asyncio.gather(
+            *(fetch_organizations_for_org_paths(p, session) for p in SNAPSHOT_ORG_PATHS)
+        ),
+    )
+    org_counts = dict(zip(SNAPSHOT_FILTERS, org_counts_list))
+    if not org_counts[FilterEnum.NONE] or not all(organizations_list):
+        raise ValueError("upstreams returned no counts or no organizations")
+
+    org_ids = set().union(*org_counts.values(), *organizations_list)
+    return PublisherSnapshot(
+        org_counts=org_counts,
+        organizations={
+            org_paths_key(org_paths): organizations
+            for org_paths, organizations in zip(SNAPSHOT_ORG_PATHS, organizations_list)
+        },
+        org_ids=frozenset(org_ids),
+        built_at=time.time(),
+        build_duration=time.monotonic() - started,
+    )
+
+
+async def publisher_snapshot_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Refresh the publisher snapshot in the background while the app runs."""
+    if not Config.snapshot_enabled():
+        yield
+        return
+
+    task = asyncio.ensure_future(
+        publisher_snapshot.refresh_periodically(
+            lambda: build_publisher_snapshot(app[CLIENT_SESSION]),
+            Config.snapshot_interval(),
+            first_refresh_delay(
+                app, publisher_snapshot.age(), Config.snapshot_interval()
+            ),
+        )
+    )
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
 async def get_organization_catalogs(
-    filter: FilterEnum, include_empty: Optional[str]
+    filter: FilterEnum, include_empty: Optional[str], session: ClientSession
 ) -> OrganizationCatalogList:
     """Return all organization catalogs."""
     logging.debug("Fetching all catalogs")
     org_summaries = await summarize_catalog_data_for_organizations(
-        filter, include_empty, None
+        filter, include_empty, None, session
     )
 
     return OrganizationCatalogList(
@@ -214,17 +447,20 @@ async def get_organization_catalogs(
 
 
 async def get_state_categories(
-    filter: FilterEnum, include_empty: Optional[str]
+    filter: FilterEnum, include_empty: Optional[str], session: ClientSession
 ) -> OrganizationCategories:
     """Return state categories."""
     logging.debug("Fetching state categories")
     org_summaries = await summarize_catalog_data_for_organizations(
-        filter, "true", ["/STAT/"]
+        filter, "true", STATE_ORG_PATHS, session
     )
 
+    registry = org_registry.current
     return OrganizationCategories(
         categories=categorise_summaries_by_parent_org(
-            org_summaries, include_empty == "true"
+            org_summaries,
+            include_empty == "true",
+            registry.organizations if registry else None,
         )
     )
 
@@ -232,7 +468,11 @@ async def get_state_categories(
 async def fetch_organizations_for_org_paths(
     org_paths: Optional[List[str]], session: ClientSession
 ) -> Dict:
-    """Fetch orgs for list of orgPahs."""
+    """Fetch orgs for list of orgPahs, from the organization registry when loaded."""
+    registry = org_registry.current
+    if registry is not None:
+        return registry.for_org_paths(org_paths)
+
     if org_paths:
         tasks = [
             asyncio.ensure_future(
@@ -256,53 +496,127 @@ async def fetch_organizations_for_org_paths(
     return orgs
 
 
+async def load_organization_registry(session: ClientSession) -> OrganizationRegistry:
+    """Fetch and index all organizations.
+
+    Raises ValueError if organization-catalog answered without organizations.
+    """
+    organizations = await fetch_organizations_from_organization_catalog(session, None)
+    if not organizations:
+        raise ValueError("organization-catalog returned no organizations")
+    return OrganizationRegistry(organizations)
+
+
+async def org_registry_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Keep the organization registry fresh in the background while the app runs."""
+    if not Config.org_registry_enabled():
+        yield
+        return
+
+    task = asyncio.ensure_future(
+        org_registry.refresh_periodically(
+            lambda: load_organization_registry(app[CLIENT_SESSION]),
+            Config.org_registry_refresh_interval(),
+            first_refresh_delay(
+                app, org_registry.age(), Config.org_registry_refresh_interval()
+            ),
+        )
+    )
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
 async def get_municipality_categories(
-    filter: FilterEnum, include_empty: Optional[str]
+    filter: FilterEnum, include_empty: Optional[str], session: ClientSession
 ) -> OrganizationCategories:
     """Return municipality categories."""
     logging.debug("Fetching municipality categories")
     (
         org_summaries,
-        municipalities,
+        municipality_index,
     ) = await asyncio.gather(
         asyncio.ensure_future(
             summarize_catalog_data_for_organizations(
-                filter, "true", ["/FYLKE/", "/KOMMUNE/"]
+                filter, "true", MUNICIPALITY_ORG_PATHS, session
             )
         ),
-        asyncio.ensure_future(fetch_municipality_data()),
+        asyncio.ensure_future(get_municipality_index(session)),
     )
 
     return OrganizationCategories(
         categories=categorise_summaries_by_municipality(
-            org_summaries, municipalities, include_empty == "true"
+            org_summaries, municipality_index, include_empty == "true"
         )
     )
 
 
-async def fetch_municipality_data() -> Dict:
-    """Return map of municipality numbers to connected organization number."""
-    async with ClientSession() as session:
-        fylke: Union[Dict, BaseException]
-        kommune: Union[Dict, BaseException]
-        (
-            fylke,
-            kommune,
-        ) = await asyncio.gather(
-            asyncio.ensure_future(
-                fetch_reference_data("/ssb/fylke-organisasjoner", session)
-            ),
-            asyncio.ensure_future(
-                fetch_reference_data("/ssb/kommune-organisasjoner", session)
+async def get_municipality_index(session: ClientSession) -> MunicipalityIndex:
+    """Return the loaded municipality index, or index freshly fetched data."""
+    if municipality_store.current is not None:
+        return municipality_store.current
+    return index_municipalities(await fetch_municipality_data(session))
+
+
+async def load_municipality_index(session: ClientSession) -> MunicipalityIndex:
+    """Fetch and index municipality data.
+
+    Raises ValueError if reference data answered without fylke or kommune data.
+    """
+    municipalities = await fetch_municipality_data(session)
+    if not municipalities["fylke"] or not municipalities["kommune"]:
+        raise ValueError("reference data returned no fylke or no kommune data")
+    return index_municipalities(municipalities)
+
+
+async def municipality_store_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Keep the municipality index fresh in the background while the app runs."""
+    if not Config.municipality_index_enabled():
+        yield
+        return
+
+    task = asyncio.ensure_future(
+        municipality_store.refresh_periodically(
+            lambda: load_municipality_index(app[CLIENT_SESSION]),
+            Config.municipality_index_refresh_interval(),
+            first_refresh_delay(
+                app,
+                municipality_store.age(),
+                Config.municipality_index_refresh_interval(),
             ),
-            return_exceptions=True,
         )
+    )
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+async def fetch_municipality_data(session: ClientSession) -> Dict:
+    """Return map of municipality numbers to connected organization number."""
+    fylke: Union[Dict, BaseException]
+    kommune: Union[Dict, BaseException]
+    (
+        fylke,
+        kommune,
+    ) = await asyncio.gather(
+        asyncio.ensure_future(
+            fetch_reference_data("/ssb/fylke-organisasjoner", session)
+        ),
+        asyncio.ensure_future(
+            fetch_reference_data("/ssb/kommune-organisasjoner", session)
+        ),
+        return_exceptions=True,
+    )
 
     if isinstance(fylke, BaseException):
         logging.warning("Unable to fetch fylke data from reference data")
+        mark_degraded()
         fylke = dict()
     if isinstance(kommune, BaseException):
         logging.warning("Unable to fetch kommune data from reference data")
+        mark_degraded()
         kommune = dict()
 
     return {
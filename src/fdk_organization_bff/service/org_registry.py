@@ -0,0 +1,71 @@
+"""Module for an in-memory registry of all organizations in organization-catalog."""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+from fdk_organization_bff.service.reference_store import ReferenceStore
+
+PUBLIC_SECTOR_ORG_PATHS = ["/STAT/", "/FYLKE/", "/KOMMUNE/"]
+
+
+@dataclass
+class OrgPathNode:
+    """Node of the orgPath trie, with ids of all organizations at or below it."""
+
+    children: Dict[str, "OrgPathNode"] = field(default_factory=dict)
+    ids: List[str] = field(default_factory=list)
+
+
+def org_path_segments(org_path: str) -> List[str]:
+    """Return segments of org_path."""
+    return [segment for segment in org_path.split("/") if segment]
+
+
+class OrganizationRegistry:
+    """Organizations indexed by id and by the segments of their orgPath."""
+
+    def __init__(self: "OrganizationRegistry", organizations: Dict[str, Dict]) -> None:
+        """Index organizations, keyed by organization id."""
+        self.organizations = organizations
+        self._root = OrgPathNode()
+        for id, org in organizations.items():
+            node = self._root
+            node.ids.append(id)
+            for segment in org_path_segments(org.get("orgPath") or ""):
+                node = node.children.setdefault(segment, OrgPathNode())
+                node.ids.append(id)
+        self.public_sector_ids: FrozenSet[str] = frozenset(
+            id for org_path in PUBLIC_SECTOR_ORG_PATHS for id in self._ids(org_path)
+        )
+
+    def __len__(self: "OrganizationRegistry") -> int:
+        """Return number of organizations."""
+        return len(self.organizations)
+
+    def get(self: "OrganizationRegistry", id: str) -> Optional[Dict]:
+        """Return organization id, None if it is not registered."""
+        return self.organizations.get(id)
+
+    def for_org_paths(
+        self: "OrganizationRegistry", org_paths: Optional[List[str]]
+    ) -> Dict[str, Dict]:
+        """Return organizations with orgPath starting with any of org_paths, or all."""
+        if not org_paths:
+            return dict(self.organizations)
+        return {
+            id: self.organizations[id]
+            for org_path in org_paths
+            for id in self._ids(org_path)
+        }
+
+    def _ids(self: "OrganizationRegistry", org_path: str) -> List[str]:
+        """Return ids of organizations with orgPath starting with org_path."""
+        node: Optional[OrgPathNode] = self._root
+        for segment in org_path_segments(org_path):
+            node = node.children.get(segment) if node else None
+        return node.ids if node else []
+
+
+org_registry: ReferenceStore[OrganizationRegistry] = ReferenceStore(
+    "organization registry"
+)
@@ -0,0 +1,67 @@
+"""Module for reference data, loaded and refreshed in the background."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from fdk_organization_bff.classes import MunicipalityIndex
+
+LOAD_RETRY_SECONDS = 600
+
+T = TypeVar("T")
+
+
+class ReferenceStore(Generic[T]):
+    """Holder of the current reference data, replaced as a whole when loaded."""
+
+    def __init__(self: "ReferenceStore", name: str) -> None:
+        """Init store of the reference data called name, without data."""
+        self.name = name
+        self.current: Optional[T] = None
+        self.loaded_at: Optional[float] = None
+        self.loads = 0
+        self.failures = 0
+
+    def swap(
+        self: "ReferenceStore", data: T, loaded_at: Optional[float] = None
+    ) -> None:
+        """Replace current data, loaded at loaded_at or now."""
+        self.current = data
+        self.loaded_at = loaded_at or time.time()
+        self.loads += 1
+
+    def age(self: "ReferenceStore") -> Optional[float]:
+        """Seconds since the current data was loaded, None without data."""
+        return time.time() - self.loaded_at if self.loaded_at else None
+
+    async def refresh_periodically(
+        self: "ReferenceStore",
+        load: Callable[[], Awaitable[T]],
+        interval: float,
+        delay: float = 0,
+    ) -> None:
+        """Load and swap in new data every interval seconds, after delay.
+
+        A failed load is logged and retried sooner, and the previous data is kept.
+        """
+        if delay > 0:
+            await asyncio.sleep(delay)
+        while True:
+            try:
+                data = await load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.failures += 1
+                logging.warning(f"Loading {self.name} failed: {err}")
+                delay = min(LOAD_RETRY_SECONDS, interval)
+            else:
+                self.swap(data)
+                delay = interval
+            await asyncio.sleep(delay)
+
+
+municipality_store: ReferenceStore[MunicipalityIndex] = ReferenceStore(
+    "municipality reference data"
+)
@@ -0,0 +1,248 @@
+"""Module for caching rendered response bodies."""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterator, List, Optional, Tuple
+
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.snapshot import publisher_snapshot
+from fdk_organization_bff.utils import json_codec
+
+_degraded: ContextVar[Optional[List[bool]]] = ContextVar("degraded", default=None)
+
+
+def mark_degraded() -> None:
+    """Mark the response being built as based on fallback data."""
+    degraded = _degraded.get()
+    if degraded is not None:
+        degraded.append(True)
+
+
+@contextmanager
+def track_degraded() -> Iterator[Callable[[], bool]]:
+    """Track whether fallback data is used, also by tasks started inside."""
+    degraded: List[bool] = []
+    token = _degraded.set(degraded)
+    try:
+        yield lambda: bool(degraded)
+    finally:
+        _degraded.reset(token)
+
+
+@dataclass
+class RenderedBody:
+    """Data class with a rendered body and its strong entity tag."""
+
+    body: bytes
+    etag: str
+
+
+@dataclass
+class RenderedEntry:
+    """Data class with a rendered body and the data version it was rendered from.
+
+    version is None for a body that is not rendered from versioned data.
+    """
+
+    rendered: RenderedBody
+    version: Optional[int]
+    expires_at: float
+
+
+def render_body(body: bytes) -> RenderedBody:
+    """Return body with an entity tag computed from its content."""
+    return RenderedBody(body, hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+class RenderedCache:
+    """LRU cache of rendered response bodies, bounded by total size in bytes.
+
+    An entry is only served while the data version it was rendered from is
+    current, if it was rendered from versioned data, and for at most ttl seconds.
+    """
+
+    def __init__(
+        self: "RenderedCache",
+        max_bytes: int,
+        ttl: float,
+        version: Callable[[], Optional[int]],
+    ) -> None:
+        """Init empty cache, with version returning the current data version."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = version
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, RenderedEntry]" = OrderedDict()
+
+    def __len__(self: "RenderedCache") -> int:
+        """Return number of cached entries."""
+        return len(self._entries)
+
+    def get(self: "RenderedCache", key: Hashable) -> Optional[RenderedBody]:
+        """Return body cached for key, None if missing or outdated."""
+        entry = self._entries.get(key)
+        if entry is not None and not self._is_current(entry, self.version()):
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.rendered
+
+    def items(self: "RenderedCache") -> List[Tuple[Hashable, RenderedEntry]]:
+        """Return keys and entries that are current."""
+        version = self.version()
+        return [
+            (key, entry)
+            for key, entry in self._entries.items()
+            if self._is_current(entry, version)
+        ]
+
+    def put(
+        self: "RenderedCache",
+        key: Hashable,
+        rendered: RenderedBody,
+        version: Optional[int],
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Cache body rendered from data of version, evicting least recently used.
+
+        A version of None caches a body not rendered from versioned data. The
+        body is cached for ttl seconds if given, at most the ttl of the cache.
+        """
+        size = len(rendered.body)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + ttl
+        self._entries[key] = RenderedEntry(rendered, version, expires_at)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self: "RenderedCache") -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _is_current(
+        self: "RenderedCache", entry: RenderedEntry, version: Optional[int]
+    ) -> bool:
+        """Check that entry is of the current data version and not expired."""
+        return (entry.version is None or entry.version == version) and (
+            entry.expires_at > time.monotonic()
+        )
+
+    def _remove(self: "RenderedCache", key: Hashable) -> None:
+        """Remove entry for key."""
+        self.size_bytes -= len(self._entries.pop(key).rendered.body)
+
+
+class NegativeCache:
+    """Cache of keys known to have no data, bounded by number of keys.
+
+    A key is only known while the data version it was found missing in is
+    current, and for at most ttl seconds.
+    """
+
+    def __init__(
+        self: "NegativeCache",
+        max_entries: int,
+        ttl: float,
+        version: Callable[[], Optional[int]],
+    ) -> None:
+        """Init empty cache, with version returning the current data version."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = version
+        self.hits = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[int], float]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self: "NegativeCache") -> int:
+        """Return number of cached keys."""
+        return len(self._entries)
+
+    def __contains__(self: "NegativeCache", key: Hashable) -> bool:
+        """Return whether key is known to have no data."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        version, expires_at = entry
+        if version != self.version() or expires_at <= time.monotonic():
+            del self._entries[key]
+            return False
+        self.hits += 1
+        return True
+
+    def add(self: "NegativeCache", key: Hashable, version: Optional[int]) -> None:
+        """Remember that key had no data in version, evicting the oldest key."""
+        if self.ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (version, time.monotonic() + self.ttl)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self: "NegativeCache") -> None:
+        """Remove all keys."""
+        self._entries.clear()
+
+
+def snapshot_version() -> int:
+    """Return version of the current publisher snapshot, 0 without one."""
+    return publisher_snapshot.version()
+
+
+rendered_cache = RenderedCache(
+    max_bytes=Config.rendered_cache_max_bytes(),
+    ttl=Config.rendered_cache_ttl(),
+    version=snapshot_version,
+)
+negative_cache = NegativeCache(
+    max_entries=Config.negative_cache_max_entries(),
+    ttl=Config.negative_cache_ttl(),
+    version=snapshot_version,
+)
+
+
+async def rendered_json(
+    key: Hashable, get_data: Callable[[], Awaitable[Any]], versioned: bool = True
+) -> Optional[RenderedBody]:
+    """Return data from get_data encoded as json, None if there is no data.
+
+    The encoded body, or the absence of data, is cached under key unless
+    fallback data was used. Upstreams answering other than 200 or 404 raise,
+    and their callers fall back, so only data every upstream answered for is
+    cached. The body is tied to the current data version if versioned is set,
+    as it is when get_data uses the publisher snapshot.
+    """
+    rendered = rendered_cache.get(key)
+    if rendered is not None:
+        return rendered
+    if key in negative_cache:
+        return None
+
+    version = rendered_cache.version()
+    with track_degraded() as degraded:
+        data = await get_data()
+    if data is None:
+        if not degraded():
+            negative_cache.add(key, version)
+        return None
+    rendered = render_body(json_codec.dumps_dataclass(data))
+    if not degraded():
+        rendered_cache.put(key, rendered, version if versioned else None)
+    return rendered
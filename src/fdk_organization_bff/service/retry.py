@@ -0,0 +1,65 @@
+"""Module for retrying idempotent upstream calls."""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional
+
+from aiohttp import ClientConnectionError, ClientPayloadError
+
+from fdk_organization_bff.classes import UpstreamEnum, UpstreamResponse
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.deadline import remaining_time
+
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+RETRYABLE_ERRORS = (ClientConnectionError, ClientPayloadError)
+
+
+def backoff_delay(upstream: UpstreamEnum, attempt: int) -> float:
+    """Exponential backoff with full jitter before retrying after attempt."""
+    ceiling = min(
+        Config.upstream_retry_max_backoff(upstream),
+        Config.upstream_retry_backoff(upstream) * 2**attempt,
+    )
+    return random.uniform(0, ceiling)  # noqa: S311
+
+
+def deadline_allows(delay: float) -> bool:
+    """Check if there is time left for another attempt after delay."""
+    remaining = remaining_time()
+    return remaining is None or remaining > delay
+
+
+async def with_retry(
+    request: Callable[[], Awaitable[UpstreamResponse]], upstream: UpstreamEnum
+) -> UpstreamResponse:
+    """Call request until it succeeds, retrying transient failures.
+
+    Retryable statuses and connection errors are retried with jittered
+    backoff, up to the upstream's max attempts and within the request deadline.
+    """
+    max_attempts = max(1, Config.upstream_retry_attempts(upstream))
+    attempt = 1
+    while True:
+        error: Optional[BaseException] = None
+        try:
+            response = await request()
+            if response.status not in RETRYABLE_STATUSES or attempt >= max_attempts:
+                return response
+            reason = f"status {response.status}"
+        except RETRYABLE_ERRORS as err:
+            if attempt >= max_attempts:
+                raise
+            error = err
+            reason = repr(err)
+
+        delay = backoff_delay(upstream, attempt)
+        if not deadline_allows(delay):
+            logging.warning(f"No time left to retry {upstream.value} after {reason}")
+            if error is not None:
+                raise error
+            return response
+
+        logging.info(f"Retrying {upstream.value} after {reason}, attempt {attempt}")
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -0,0 +1,56 @@
+"""Module for caching metadata quality scores by dataset uri."""
+
+from collections import OrderedDict
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fdk_organization_bff.config import Config
+
+
+class ScoreCache:
+    """Cache of dimension scores by dataset uri, bounded by number of datasets."""
+
+    def __init__(self: "ScoreCache", max_entries: int, ttl: float) -> None:
+        """Init empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[List[Dict], float]]" = OrderedDict()
+
+    def __len__(self: "ScoreCache") -> int:
+        """Return number of cached datasets."""
+        return len(self._entries)
+
+    def get(self: "ScoreCache", uri: str) -> Optional[List[Dict]]:
+        """Return dimension scores cached for dataset uri, None if missing or expired."""
+        entry = self._entries.get(uri)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[uri]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(uri)
+        return entry[0]
+
+    def clear(self: "ScoreCache") -> None:
+        """Remove all datasets."""
+        self._entries.clear()
+
+    def put(self: "ScoreCache", uri: str, dimensions: List[Dict]) -> None:
+        """Cache dimension scores of dataset uri, evicting least recently used."""
+        if self.ttl <= 0:
+            return
+        self._entries.pop(uri, None)
+        self._entries[uri] = (dimensions, time.monotonic() + self.ttl)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+score_cache = ScoreCache(
+    max_entries=Config.mqa_score_cache_max_entries(),
+    ttl=Config.mqa_score_cache_ttl(),
+)
@@ -0,0 +1,216 @@
+"""Module for the upstream response cache shared between workers."""
+
+from abc import ABC, abstractmethod
+import asyncio
+import importlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+from aiohttp import web
+
+from fdk_organization_bff.classes import UpstreamResponse
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.utils import json_codec
+
+SharedEntry = Tuple[bytes, float]
+
+
+class SharedCache(ABC):
+    """Cache of encoded payloads shared by the workers on a host."""
+
+    name = "shared"
+
+    def __init__(self: "SharedCache") -> None:
+        """Init counters."""
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @abstractmethod
+    async def get(self: "SharedCache", key: str) -> Optional[SharedEntry]:
+        """Return value and age in seconds for key, None if missing or expired."""
+
+    @abstractmethod
+    async def set(self: "SharedCache", key: str, value: bytes, ttl: float) -> None:
+        """Store value for key, expiring after ttl seconds."""
+
+    @abstractmethod
+    async def close(self: "SharedCache") -> None:
+        """Release connections to the store."""
+
+    async def get_or_fetch(
+        self: "SharedCache",
+        key: str,
+        fetch: Callable[[], Awaitable[UpstreamResponse]],
+        ttl: float,
+    ) -> UpstreamResponse:
+        """Return response stored for key, calling fetch and storing it if missing.
+
+        Errors from the store are logged, and the call falls through to fetch.
+        """
+        try:
+            entry = await self.get(key)
+        except Exception as err:
+            logging.warning(f"Reading {self.name} cache failed: {err}")
+            self.errors += 1
+            entry = None
+        if entry is not None:
+            self.hits += 1
+            value, age = entry
+            return UpstreamResponse(200, json_codec.loads(value), len(value), age)
+
+        self.misses += 1
+        response = await fetch()
+        if response.status == 200 and response.payload is not None:
+            try:
+                await self.set(key, json_codec.dumps(response.payload), ttl)
+            except Exception as err:
+                logging.warning(f"Writing {self.name} cache failed: {err}")
+                self.errors += 1
+        return response
+
+
+class SqliteSharedCache(SharedCache):
+    """Shared cache in an SQLite file, for the workers on one host."""
+
+    name = "sqlite"
+    _PRUNE_INTERVAL = 100
+
+    def __init__(self: "SqliteSharedCache", path: str) -> None:
+        """Init cache stored in the file at path, opened on first use."""
+        super().__init__()
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self: "SqliteSharedCache") -> sqlite3.Connection:
+        """Return connection, creating the cache table if needed."""
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=1, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY,"
+                " value BLOB, stored_at REAL, expires_at REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _get(self: "SqliteSharedCache", key: str) -> Optional[SharedEntry]:
+        """Read entry for key."""
+        now = time.time()
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value, stored_at FROM cache"
+                    " WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                )
+                .fetchone()
+            )
+        return (row[0], max(now - row[1], 0)) if row else None
+
+    def _set(self: "SqliteSharedCache", key: str, value: bytes, ttl: float) -> None:
+        """Write entry for key, pruning expired entries now and then."""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, value, now, now + ttl),
+            )
+            self._writes += 1
+            if self._writes % self._PRUNE_INTERVAL == 0:
+                connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    async def get(self: "SqliteSharedCache", key: str) -> Optional[SharedEntry]:
+        """Return value and age in seconds for key, None if missing or expired."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(
+        self: "SqliteSharedCache", key: str, value: bytes, ttl: float
+    ) -> None:
+        """Store value for key, expiring after ttl seconds."""
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def close(self: "SqliteSharedCache") -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class RedisSharedCache(SharedCache):
+    """Shared cache in Redis, or a Redis compatible server."""
+
+    name = "redis"
+    _KEY_PREFIX = "fdk-organization-bff:"
+
+    def __init__(self: "RedisSharedCache", url: str, redis_module: Any) -> None:
+        """Init cache on the server at url, connected on first use."""
+        super().__init__()
+        self.url = url
+        self._redis_module = redis_module
+        self._client: Any = None
+
+    def _get_client(self: "RedisSharedCache") -> Any:
+        """Return client, creating it if needed."""
+        if self._client is None:
+            self._client = self._redis_module.from_url(self.url)
+        return self._client
+
+    async def get(self: "RedisSharedCache", key: str) -> Optional[SharedEntry]:
+        """Return value and age in seconds for key, None if missing or expired."""
+        stored = await self._get_client().get(self._KEY_PREFIX + key)
+        if stored is None:
+            return None
+        stored_at, _, value = stored.partition(b"\n")
+        return value, max(time.time() - float(stored_at), 0)
+
+    async def set(self: "RedisSharedCache", key: str, value: bytes, ttl: float) -> None:
+        """Store value for key, expiring after ttl seconds."""
+        stored = f"{time.time()}\n".encode("utf-8") + value
+        await self._get_client().set(
+            self._KEY_PREFIX + key, stored, ex=max(math.ceil(ttl), 1)
+        )
+
+    async def close(self: "RedisSharedCache") -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_shared_cache() -> Optional[SharedCache]:
+    """Create shared cache of the configured backend, None if disabled."""
+    backend = Config.shared_cache_backend()
+    if backend == "sqlite":
+        return SqliteSharedCache(Config.shared_cache_path())
+    if backend == "redis":
+        try:
+            redis_module = importlib.import_module("redis.asyncio")
+        except ImportError:
+            logging.warning("Shared cache backend redis is not installed, disabled")
+            return None
+        return RedisSharedCache(Config.shared_cache_redis_url(), redis_module)
+    if backend != "none":
+        logging.warning(f"Unknown shared cache backend {backend}, disabled")
+    return None
+
+
+shared_cache = create_shared_cache()
+
+
+async def shared_cache_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Close the shared cache connections when the application stops."""
+    yield
+    if shared_cache is not None:
+        await shared_cache.close()
@@ -0,0 +1,50 @@
+"""Module for coalescing identical in-flight upstream requests."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from fdk_organization_bff.service.deadline import remaining_time, set_deadline
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key."""
+
+    def __init__(self: "SingleFlight") -> None:
+        """Init without calls in flight."""
+        self._calls: Dict[str, asyncio.Future] = dict()
+        self.coalesced_count = 0
+
+    async def do(
+        self: "SingleFlight", key: str, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return result of call, or of the identical call already in flight.
+
+        A caller giving up, by cancellation or by its own deadline, does not
+        cancel the shared call for the other callers. The shared call is not
+        bounded by any caller's deadline, so that a caller with a short one
+        does not fail the others.
+        """
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+
+            async def unbounded() -> Any:
+                set_deadline(None)
+                return await call()
+
+            task = asyncio.ensure_future(unbounded())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced_count += 1
+
+        remaining = remaining_time()
+        return await asyncio.wait_for(
+            asyncio.shield(task), max(remaining, 0) if remaining is not None else None
+        )
+
+    def _forget(self: "SingleFlight", key: str, task: asyncio.Future) -> None:
+        """Remove finished call."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark exception as retrieved when no caller is left
@@ -0,0 +1,121 @@
+"""Module for snapshots of publisher counts, refreshed in the background."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from fdk_organization_bff.classes import FilterEnum
+
+OrgPathsKey = Optional[Tuple[str, ...]]
+
+
+@dataclass
+class PublisherSnapshot:
+    """Data class with counts by organization and organizations, built together.
+
+    org_counts has the merged counts of each entity type for every filter, and
+    organizations has organization-catalog data keyed by the org paths fetched.
+    org_ids has the id of every organization found in either.
+    """
+
+    org_counts: Dict[FilterEnum, Dict]
+    organizations: Dict[OrgPathsKey, Dict]
+    org_ids: FrozenSet[str]
+    built_at: float
+    build_duration: float
+    version: int = 0
+
+
+def same_content(snapshot: PublisherSnapshot, other: PublisherSnapshot) -> bool:
+    """Check that snapshots have the same counts and organizations."""
+    return (
+        snapshot.org_ids == other.org_ids
+        and snapshot.org_counts == other.org_counts
+        and snapshot.organizations == other.organizations
+    )
+
+
+class SnapshotStore:
+    """Holder of the current snapshot, replaced as a whole when a build completes."""
+
+    def __init__(self: "SnapshotStore") -> None:
+        """Init store without a snapshot."""
+        self.current: Optional[PublisherSnapshot] = None
+        self.builds = 0
+        self.failures = 0
+        self._changed: Optional[asyncio.Future] = None
+
+    def swap(self: "SnapshotStore", snapshot: PublisherSnapshot) -> None:
+        """Replace current snapshot, giving the new one the next version.
+
+        A snapshot with the same content as the current one keeps its version,
+        so that responses rendered from it stay valid.
+        """
+        current = self.current
+        if current is None:
+            snapshot.version = 1
+        elif same_content(current, snapshot):
+            snapshot.version = current.version
+        else:
+            snapshot.version = current.version + 1
+        self.current = snapshot
+        self.builds += 1
+        if snapshot.version != (current.version if current else 0):
+            if self._changed is not None and not self._changed.done():
+                self._changed.set_result(None)
+            self._changed = None
+
+    def version(self: "SnapshotStore") -> int:
+        """Return version of the current snapshot, 0 without one."""
+        return self.current.version if self.current else 0
+
+    async def wait_for_change(self: "SnapshotStore", version: int) -> None:
+        """Wait until the current snapshot has another version than version."""
+        while self.version() == version:
+            loop = asyncio.get_running_loop()
+            if self._changed is None or self._changed.get_loop() is not loop:
+                self._changed = loop.create_future()
+            # shielded, so that a waiter giving up leaves it for the others
+            await asyncio.shield(self._changed)
+
+    def age(self: "SnapshotStore") -> Optional[float]:
+        """Seconds since the current snapshot was built, None without one."""
+        return time.time() - self.current.built_at if self.current else None
+
+    async def refresh_periodically(
+        self: "SnapshotStore",
+        build: Callable[[], Awaitable[PublisherSnapshot]],
+        interval: float,
+        delay: float = 0,
+    ) -> None:
+        """Build and swap in a new snapshot every interval seconds, after delay.
+
+        A failed build is logged, and the previous snapshot is kept.
+        """
+        if delay > 0:
+            await asyncio.sleep(delay)
+        while True:
+            try:
+                snapshot = await build()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.failures += 1
+                logging.warning(f"Building publisher snapshot failed: {err}")
+            else:
+                self.swap(snapshot)
+                logging.info(
+                    f"Publisher snapshot {snapshot.version} built"
+                    f" in {snapshot.build_duration:.2f}s"
+                )
+            await asyncio.sleep(interval)
+
+
+def org_paths_key(org_paths: Optional[List[str]]) -> OrgPathsKey:
+    """Return snapshot key of organizations fetched for org_paths."""
+    return tuple(org_paths) if org_paths else None
+
+
+publisher_snapshot = SnapshotStore()
@@ -0,0 +1,224 @@
+"""Module for persisting cacheable state to a local file, for warm restarts."""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import asdict
+import logging
+import os
+import time
+from typing import AsyncIterator, cast, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from fdk_organization_bff.classes import (
+    FilterEnum,
+    MunicipalityIndex,
+    OrganizationCatalogSummary,
+)
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.org_registry import (
+    org_registry,
+    OrganizationRegistry,
+)
+from fdk_organization_bff.service.reference_store import municipality_store
+from fdk_organization_bff.service.rendered_cache import (
+    rendered_cache,
+    RenderedBody,
+    RenderedEntry,
+)
+from fdk_organization_bff.service.snapshot import publisher_snapshot, PublisherSnapshot
+from fdk_organization_bff.utils import json_codec
+
+STATE_FORMAT = 3
+STATE_RESTORED = web.AppKey("state_restored", bool)
+
+
+def first_refresh_delay(
+    app: web.Application, age: Optional[float], interval: float
+) -> float:
+    """Return seconds until data of age is due for refresh, if it was restored."""
+    if not app.get(STATE_RESTORED) or age is None:
+        return 0.0
+    return max(0.0, interval - age)
+
+
+def dump_snapshot(snapshot: PublisherSnapshot) -> Dict:
+    """Return publisher snapshot as json-serializable data."""
+    return {
+        "org_counts": {f.name: counts for f, counts in snapshot.org_counts.items()},
+        "organizations": [
+            [list(org_paths) if org_paths else None, organizations]
+            for org_paths, organizations in snapshot.organizations.items()
+        ],
+        "org_ids": sorted(snapshot.org_ids),
+        "built_at": snapshot.built_at,
+        "build_duration": snapshot.build_duration,
+    }
+
+
+def load_snapshot(data: Dict) -> PublisherSnapshot:
+    """Return publisher snapshot from data of dump_snapshot."""
+    return PublisherSnapshot(
+        org_counts={FilterEnum[f]: counts for f, counts in data["org_counts"].items()},
+        organizations={
+            tuple(org_paths) if org_paths else None: organizations
+            for org_paths, organizations in data["organizations"]
+        },
+        org_ids=frozenset(data["org_ids"]),
+        built_at=data["built_at"],
+        build_duration=data["build_duration"],
+    )
+
+
+def load_municipality_index(data: Dict) -> MunicipalityIndex:
+    """Return municipality index from its data as a dict."""
+    return MunicipalityIndex(
+        fylke_by_org=data["fylke_by_org"],
+        fylke_categories={
+            number: OrganizationCatalogSummary(**category)
+            for number, category in data["fylke_categories"].items()
+        },
+    )
+
+
+def dump_state() -> Dict:
+    """Return cacheable state as json-serializable data.
+
+    Data of features that are disabled, and so not refreshed, is left out.
+    """
+    snapshot = publisher_snapshot.current if Config.snapshot_enabled() else None
+    registry = org_registry.current if Config.org_registry_enabled() else None
+    municipality_index = (
+        municipality_store.current if Config.municipality_index_enabled() else None
+    )
+    now = time.monotonic()
+    return {
+        "format": STATE_FORMAT,
+        "saved_at": time.time(),
+        "publisher_snapshot": dump_snapshot(snapshot) if snapshot else None,
+        "org_registry": (
+            {
+                "organizations": registry.organizations,
+                "loaded_at": org_registry.loaded_at,
+            }
+            if registry
+            else None
+        ),
+        "municipality_index": (
+            {
+                **asdict(municipality_index),
+                "loaded_at": municipality_store.loaded_at,
+            }
+            if municipality_index
+            else None
+        ),
+        "rendered": [
+            [
+                route,
+                filter.name,
+                param,
+                entry.rendered.body.decode("utf-8"),
+                entry.rendered.etag,
+                entry.version is not None,
+                entry.expires_at - now,
+            ]
+            for (route, filter, param), entry in cast(
+                List[Tuple[Tuple[str, FilterEnum, Optional[str]], RenderedEntry]],
+                rendered_cache.items(),
+            )
+        ],
+    }
+
+
+def restore_state(state: Dict) -> None:
+    """Swap in the cacheable state in data of dump_state, of features that are enabled.
+
+    Rendered responses are cached for the rest of the ttl they had when saved,
+    less the time since.
+    """
+    if state["publisher_snapshot"] and Config.snapshot_enabled():
+        publisher_snapshot.swap(load_snapshot(state["publisher_snapshot"]))
+    if state["org_registry"] and Config.org_registry_enabled():
+        org_registry.swap(
+            OrganizationRegistry(state["org_registry"]["organizations"]),
+            state["org_registry"]["loaded_at"],
+        )
+    if state["municipality_index"] and Config.municipality_index_enabled():
+        municipality_store.swap(
+            load_municipality_index(state["municipality_index"]),
+            state["municipality_index"]["loaded_at"],
+        )
+    version = rendered_cache.version()
+    elapsed = time.time() - state["saved_at"]
+    for route, filter, param, body, etag, versioned, ttl in state["rendered"]:
+        rendered_cache.put(
+            (route, FilterEnum[filter], param),
+            RenderedBody(body.encode("utf-8"), etag),
+            version if versioned else None,
+            ttl - elapsed,
+        )
+
+
+def write_state(path: str, state: Dict) -> None:
+    """Write state to the file at path, replacing it when complete."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as state_file:
+        state_file.write(json_codec.dumps(state))
+    os.replace(tmp_path, path)
+
+
+def load_state(path: str, max_age: float) -> bool:
+    """Restore cacheable state from the file at path, return whether it was restored.
+
+    State of another format, or older than max_age seconds, is ignored.
+    """
+    try:
+        with open(path, "rb") as state_file:
+            state = json_codec.loads(state_file.read())
+    except FileNotFoundError:
+        return False
+    except Exception as err:
+        logging.warning(f"Reading state file {path} failed: {err}")
+        return False
+
+    age = time.time() - state.get("saved_at", 0)
+    if state.get("format") != STATE_FORMAT or age > max_age:
+        logging.info(f"Ignoring outdated state file {path}")
+        return False
+    try:
+        restore_state(state)
+    except Exception as err:
+        logging.warning(f"Restoring state file {path} failed: {err}")
+        return False
+    logging.info(f"Restored state saved {age:.0f}s ago from {path}")
+    return True
+
+
+async def save_periodically(path: str, interval: float) -> None:
+    """Save state to the file at path every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # the state is collected in the loop, and encoded and written outside it
+            await asyncio.to_thread(write_state, path, dump_state())
+        except Exception as err:
+            logging.warning(f"Saving state file {path} failed: {err}")
+
+
+async def state_file_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Restore state before serving, and save it periodically and on shutdown."""
+    if not Config.state_file_enabled():
+        yield
+        return
+
+    path = Config.state_file_path()
+    app[STATE_RESTORED] = load_state(path, Config.state_file_max_age())
+    task = asyncio.ensure_future(save_periodically(path, Config.state_file_interval()))
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+    try:
+        write_state(path, dump_state())
+    except Exception as err:
+        logging.warning(f"Saving state file {path} failed: {err}")
@@ -0,0 +1,159 @@
+"""Module for warming caches with the most requested responses."""
+
+import asyncio
+from collections import Counter
+from contextlib import suppress
+from functools import partial
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Hashable, List, Tuple
+
+from aiohttp import ClientSession, web
+
+from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.client_session import CLIENT_SESSION
+from fdk_organization_bff.service.org_catalog_service import (
+    get_municipality_categories,
+    get_organization_catalog,
+    get_organization_catalogs,
+    get_state_categories,
+)
+from fdk_organization_bff.service.rendered_cache import rendered_json
+from fdk_organization_bff.service.snapshot import publisher_snapshot
+
+
+class HitTally:
+    """Tally of recent requests by organization id, bounded by number of ids.
+
+    Counts are halved by decay, so recent requests weigh the most.
+    """
+
+    def __init__(self: "HitTally", max_ids: int) -> None:
+        """Init empty tally."""
+        self.max_ids = max_ids
+        self._counts: Counter = Counter()
+
+    def __len__(self: "HitTally") -> int:
+        """Return number of tallied ids."""
+        return len(self._counts)
+
+    def add(self: "HitTally", id: str) -> None:
+        """Count a request for organization id."""
+        self._counts[id] += 1
+        if len(self._counts) > 2 * self.max_ids:
+            self._counts = Counter(dict(self._counts.most_common(self.max_ids)))
+
+    def top(self: "HitTally", n: int) -> List[str]:
+        """Return the n most requested ids."""
+        return [id for id, _ in self._counts.most_common(n)]
+
+    def decay(self: "HitTally") -> None:
+        """Halve all counts, dropping ids with no count left."""
+        self._counts = Counter(
+            {id: count // 2 for id, count in self._counts.items() if count > 1}
+        )
+
+
+org_hits = HitTally(max_ids=10 * Config.warmup_top_organizations())
+
+
+def warmup_ids() -> List[str]:
+    """Return configured organization ids followed by the most requested ones."""
+    ids = list(Config.warmup_organizations())
+    top = org_hits.top(Config.warmup_top_organizations() + len(ids))
+    ids += [id for id in top if id not in ids][: Config.warmup_top_organizations()]
+    return ids
+
+
+WarmupRequest = Tuple[Hashable, Callable[[], Awaitable], bool]
+
+
+def warmup_requests(session: ClientSession) -> List[WarmupRequest]:
+    """Return rendered cache keys, data getters and versioned flags of responses to warm."""
+    filter = FilterEnum.NONE
+    requests: List[WarmupRequest] = [
+        (
+            ("ORG_CATALOGS", filter, None),
+            lambda: get_organization_catalogs(filter, None, session),
+            True,
+        ),
+        (
+            ("STATE_CATEGORIES", filter, None),
+            lambda: get_state_categories(filter, None, session),
+            True,
+        ),
+        (
+            ("MUNICIPALITY_CATEGORIES", filter, None),
+            lambda: get_municipality_categories(filter, None, session),
+            True,
+        ),
+    ]
+    for id in warmup_ids():
+        requests.append(
+            (
+                ("ORG_CATALOG", filter, id),
+                partial(get_organization_catalog, id, filter, session),
+                False,
+            )
+        )
+    return requests
+
+
+async def warm_up(session: ClientSession, concurrency: int) -> int:
+    """Render the responses to warm, at most concurrency at a time.
+
+    Return number of responses warmed, failures are logged.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(
+        key: Hashable, get_data: Callable[[], Awaitable], versioned: bool
+    ) -> bool:
+        async with semaphore:
+            try:
+                await rendered_json(key, get_data, versioned)
+                return True
+            except Exception as err:
+                logging.warning(f"Warming {key} failed: {err}")
+                return False
+
+    warmed = await asyncio.gather(
+        *(warm(*request) for request in warmup_requests(session))
+    )
+    return sum(warmed)
+
+
+async def warm_up_periodically(session: ClientSession, interval: float) -> None:
+    """Warm up after each new publisher snapshot, and at least every interval seconds.
+
+    With the snapshot enabled, the first warm-up waits for the first snapshot,
+    so that the responses warmed are not outdated as soon as it is swapped in.
+    """
+    if Config.snapshot_enabled():
+        await publisher_snapshot.wait_for_change(0)
+    while True:
+        version = publisher_snapshot.version()
+        started = time.monotonic()
+        warmed = await warm_up(session, Config.warmup_concurrency())
+        org_hits.decay()
+        logging.info(f"Warmed {warmed} responses in {time.monotonic() - started:.1f}s")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                publisher_snapshot.wait_for_change(version), interval
+            )
+
+
+async def warmup_ctx(app: web.Application) -> AsyncIterator[None]:
+    """Warm caches in the background while the app runs, if enabled."""
+    if not Config.warmup_enabled():
+        yield
+        return
+
+    task = asyncio.ensure_future(
+        warm_up_periodically(app[CLIENT_SESSION], Config.warmup_interval())
+    )
+    yield
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
@@ -3,4 +3,5 @@
 Modules:
     dataset_queries
     dataservice_queries
+    resource_queries
 """
@@ -0,0 +1,77 @@
+"""Module for SPARQL-queries over all resource types."""
+
+from string import Template
+
+
+def build_org_resources_query(organization_id: str) -> str:
+    """Build query for an organizations datasets, dataservices, concepts and informationmodels.
+
+    Each row has the resource type in ?type and the resource in ?resource.
+    """
+    return Template(
+        """
+PREFIX dct: <http://purl.org/dc/terms/>
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+PREFIX modelldcatno: <https://data.norge.no/vocabulary/modelldcatno#>
+PREFIX fdk: <https://raw.githubusercontent.com/Informasjonsforvaltning/fdk-reasoning-service/main/src/main/resources/ontology/fdk.owl#>
+
+SELECT DISTINCT ?type ?resource ?issued ?isAuthoritative ?isOpenData
+WHERE {{
+    ?publisher dct:identifier "$org_id" .
+    ?resource dct:publisher ?publisher .
+    ?record foaf:primaryTopic ?resource .
+    ?record a dcat:CatalogRecord .
+    ?record dct:issued ?issued .
+    {
+        ?resource a dcat:Dataset .
+        BIND("dataset" AS ?type)
+        OPTIONAL { ?resource fdk:isOpenData ?isOpenData . }
+        OPTIONAL { ?resource fdk:isAuthoritative ?isAuthoritative . }
+    } UNION {
+        ?resource a dcat:DataService .
+        BIND("dataservice" AS ?type)
+    } UNION {
+        ?resource a skos:Concept .
+        BIND("concept" AS ?type)
+    } UNION {
+        ?resource a modelldcatno:InformationModel .
+        BIND("informationmodel" AS ?type)
+    }
+}}"""
+    ).substitute(org_id=organization_id)
+
+
+def build_resources_by_publisher_query() -> str:
+    """Build query to count datasets, dataservices, concepts and informationmodels grouped by publisher.
+
+    Each row has the count of one resource type, given in ?type, for one publisher.
+    """
+    return """
+PREFIX dct: <http://purl.org/dc/terms/>
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+PREFIX modelldcatno: <https://data.norge.no/vocabulary/modelldcatno#>
+SELECT ?organizationNumber ?type (COUNT(DISTINCT ?resource) AS ?count)
+WHERE {{
+    {
+        ?resource a dcat:Dataset .
+        BIND("dataset" AS ?type)
+    } UNION {
+        ?resource a dcat:DataService .
+        BIND("dataservice" AS ?type)
+    } UNION {
+        ?resource a skos:Concept .
+        BIND("concept" AS ?type)
+    } UNION {
+        ?resource a modelldcatno:InformationModel .
+        BIND("informationmodel" AS ?type)
+    }
+    ?record foaf:primaryTopic ?resource .
+    ?record a dcat:CatalogRecord .
+    ?resource dct:publisher ?publisher .
+    ?publisher dct:identifier ?organizationNumber .
+}}
+GROUP BY ?organizationNumber ?type"""
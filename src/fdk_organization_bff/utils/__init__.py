@@ -3,4 +3,7 @@
 Modules:
     utils
     mappers
+    json_codec
+    json_stream
+    sparql_stream
 """
@@ -0,0 +1,51 @@
+"""JSON codec module, with the backend selected by config."""
+
+from dataclasses import asdict
+import importlib
+import json
+import logging
+from types import ModuleType
+from typing import Any, Optional, Union
+
+from fdk_organization_bff.config import Config
+
+
+def _import_backend(name: str) -> Optional[ModuleType]:
+    """Import optional json backend, None if it is not installed."""
+    if name == "json":
+        return None
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        logging.warning(f"JSON backend {name} is not installed, using json")
+        return None
+
+
+_backend = _import_backend(Config.json_backend())
+
+
+def backend_name() -> str:
+    """Return name of the json backend in use."""
+    return _backend.__name__ if _backend else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode json document."""
+    if _backend:
+        return _backend.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as utf-8 json."""
+    if _backend is None:
+        return json.dumps(obj).encode("utf-8")
+    encoded = _backend.dumps(obj)
+    return encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+
+
+def dumps_dataclass(obj: Any) -> bytes:
+    """Encode dataclass instance as utf-8 json."""
+    if _backend is not None and _backend.__name__ == "orjson":
+        return _backend.dumps(obj)  # serializes dataclasses natively
+    return dumps(asdict(obj))
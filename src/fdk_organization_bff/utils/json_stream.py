@@ -0,0 +1,66 @@
+"""Module for incremental parsing of json arrays."""
+
+import codecs
+import json
+import re
+from typing import Dict, List, Pattern
+
+_ARRAY_START = re.compile(r"\[")
+_SEPARATORS = " \t\r\n,"
+
+
+class JsonArrayParser:
+    """Parse the items of a json array chunk by chunk.
+
+    The array starts at the first match of start. Each item is decoded as soon
+    as it has been received, so the whole document is never held in memory.
+    """
+
+    def __init__(self: "JsonArrayParser", start: Pattern = _ARRAY_START) -> None:
+        """Init parser waiting for the start of the array."""
+        self._start = start
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_array = False
+        self._done = False
+
+    def feed(self: "JsonArrayParser", chunk: bytes) -> List[Dict]:
+        """Add chunk of the document, return items completed by it."""
+        if self._done:
+            return []
+        self._buffer += self._text_decoder.decode(chunk)
+
+        if not self._in_array:
+            match = self._start.search(self._buffer)
+            if match is None:
+                # keep a tail in case the start is split between chunks
+                self._buffer = self._buffer[-32:]
+                return []
+            start = match.end()
+            self._buffer = self._buffer[start:]
+            self._in_array = True
+
+        items: List[Dict] = []
+        pos = 0
+        while True:
+            while pos < len(self._buffer) and self._buffer[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, pos = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break  # item not fully received yet
+            items.append(item)
+
+        self._buffer = "" if self._done else self._buffer[pos:]
+        return items
+
+    def close(self: "JsonArrayParser") -> None:
+        """Check that the whole array was received."""
+        if not self._done:
+            raise ValueError("incomplete json array")
@@ -1,11 +1,14 @@
 """Mapper module."""
 
+import csv
+from dataclasses import replace
 import logging
 import traceback
-from typing import Dict, List, Optional
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
 
 from fdk_organization_bff.classes import (
     CatalogQualityScore,
+    MunicipalityIndex,
     OrganizationCatalogSummary,
     OrganizationCategory,
     OrganizationConcepts,
@@ -54,6 +57,66 @@ def map_catalog_quality_score(
     return None
 
 
+def map_dataset_score_dimensions(score: Dict) -> List[Dict]:
+    """Map score of one dataset from fdk-mqa-score-api to its dimension scores.
+
+    Raises KeyError or TypeError on bad data.
+    """
+    return [
+        {"id": dim["id"], "score": dim["score"], "max_score": dim["max_score"]}
+        for dim in score["dataset"]["dimensions"]
+    ]
+
+
+def aggregate_dataset_scores(dimension_scores: Iterable[List[Dict]]) -> Dict:
+    """Sum dimension scores of datasets to aggregations like fdk-mqa-score-api."""
+    aggregations: Dict[str, Dict] = dict()
+    for dimensions in dimension_scores:
+        for dim in dimensions:
+            agg = aggregations.setdefault(
+                dim["id"], {"id": dim["id"], "score": 0, "max_score": 0}
+            )
+            agg["score"] += dim["score"]
+            agg["max_score"] += dim["max_score"]
+    return {"aggregations": list(aggregations.values())}
+
+
+RESOURCE_TYPE_KEYS = {
+    "dataset": "dataset",
+    "dataservice": "service",
+    "concept": "concept",
+    "informationmodel": "informationmodel",
+}
+COUNT_TYPE_LABELS = {
+    "dataset": "datasets",
+    "dataservice": "dataservices",
+    "concept": "concepts",
+    "informationmodel": "informationmodels",
+}
+
+
+def split_org_resources(org_resources: List) -> Tuple[List, List, List, List]:
+    """Split bindings of the combined resources query by type.
+
+    Return datasets, dataservices, concepts and informationmodels, with the
+    resource bound to the name the query for each type uses.
+    """
+    by_type: Dict[str, List] = {
+        resource_type: [] for resource_type in RESOURCE_TYPE_KEYS
+    }
+    for binding in org_resources:
+        resource_type = binding["type"]["value"]
+        split = {k: v for k, v in binding.items() if k not in ("type", "resource")}
+        split[RESOURCE_TYPE_KEYS[resource_type]] = binding["resource"]
+        by_type[resource_type].append(split)
+    return (
+        by_type["dataset"],
+        by_type["dataservice"],
+        by_type["concept"],
+        by_type["informationmodel"],
+    )
+
+
 def map_org_datasets(
     org_datasets: List,
     score_data: Dict,
@@ -172,9 +235,70 @@ def org_and_count_value_from_sparql_response(sparql_response: Dict) -> Optional[
     org_value = org.get("value") if org else None
     count = sparql_response.get("count")
     count_value = count.get("value") if count else None
+    resource_type = sparql_response.get("type")
+    type_value = resource_type.get("value") if resource_type else None
+
+    return (
+        org_and_count_value(org_value, count_value, type_value)
+        if org_value and count_value
+        else None
+    )
+
+
+def org_and_count_value(org: str, count: str, resource_type: Optional[str]) -> Dict:
+    """Map org and count values to dict, with the resource type if it is given."""
+    org_count = {"org": org.strip().replace(" ", ""), "count": count}
+    if resource_type:
+        org_count["type"] = resource_type
+    return org_count
+
+
+def split_separated_values(line: str, separator: str) -> List[str]:
+    """Split a SPARQL CSV or TSV results line into plain values."""
+    if separator == ",":
+        return next(csv.reader([line]))
+    return [sparql_tsv_term_value(term) for term in line.split(separator)]
+
+
+def sparql_tsv_term_value(term: str) -> str:
+    """Map an RDF term from SPARQL TSV results to its lexical value."""
+    term = term.strip()
+    if term.startswith('"'):
+        end = term.rfind('"')
+        return term[1:end].replace('\\"', '"') if end > 0 else term[1:]
+    if term.startswith("<") and term.endswith(">"):
+        return term[1:-1]
+    return term
+
+
+def sparql_separated_values_columns(header: str, separator: str) -> Dict[str, int]:
+    """Map variable names in a SPARQL CSV or TSV results header to column index."""
+    return {
+        name.strip().lstrip("?"): index
+        for index, name in enumerate(header.split(separator))
+    }
+
+
+def org_and_count_value_from_separated_values(
+    line: str, separator: str, columns: Dict[str, int]
+) -> Optional[Dict]:
+    """Map a SPARQL CSV or TSV results line to dict with orgId and count value."""
+    values = split_separated_values(line, separator)
+    org_index = columns.get("organizationNumber")
+    count_index = columns.get("count")
+    if org_index is None or count_index is None:
+        return None
+    org_value = values[org_index] if org_index < len(values) else None
+    count_value = values[count_index] if count_index < len(values) else None
+    type_index = columns.get("type")
+    type_value = (
+        values[type_index]
+        if type_index is not None and type_index < len(values)
+        else None
+    )
 
     return (
-        {"org": org_value.strip().replace(" ", ""), "count": count_value}
+        org_and_count_value(org_value, count_value, type_value)
         if org_value and count_value
         else None
     )
@@ -225,19 +349,58 @@ def map_org_summaries(
     concepts: List,
     informationmodels: List,
     include_empty: bool,
+    public_sector_ids: Optional[AbstractSet[str]] = None,
 ) -> List[OrganizationCatalogSummary]:
     """Map data from fdk-sparql-service and organization-ctalogue to a list of OrganizationCatalogSummary."""
+    org_counts = merge_org_counts(datasets, dataservices, concepts, informationmodels)
+    return map_org_summaries_from_counts(
+        organizations, org_counts, include_empty, public_sector_ids
+    )
+
+
+def merge_org_counts(
+    datasets: List, dataservices: List, concepts: List, informationmodels: List
+) -> Dict:
+    """Merge count lists of each entity type to counts by organization."""
     org_counts = add_org_counts("datasets", datasets, {})
     org_counts = add_org_counts("dataservices", dataservices, org_counts)
     org_counts = add_org_counts("concepts", concepts, org_counts)
-    org_counts = add_org_counts("informationmodels", informationmodels, org_counts)
+    return add_org_counts("informationmodels", informationmodels, org_counts)
+
+
+def merge_grouped_org_counts(count_list: List) -> Dict:
+    """Merge count list grouped by organization and resource type to counts by organization.
+
+    Rows of resource types without a count label are left out.
+    """
+    org_counts: Dict[str, Dict] = {}
+    for count in count_list:
+        label = COUNT_TYPE_LABELS.get(count.get("type", ""))
+        if label:
+            org_counts.setdefault(count["org"], {})[label] = count["count"]
+    return org_counts
 
+
+def map_org_summaries_from_counts(
+    organizations: Dict,
+    org_counts: Dict,
+    include_empty: bool,
+    public_sector_ids: Optional[AbstractSet[str]] = None,
+) -> List[OrganizationCatalogSummary]:
+    """Map merged counts by organization to a list of OrganizationCatalogSummary.
+
+    public_sector_ids, when given, has the ids of all STAT, FYLKE and KOMMUNE
+    organizations, and is used instead of checking the orgPath of each one.
+    """
     if include_empty:
         summaries: List[OrganizationCatalogSummary] = list()
         for org_id in organizations:
-            if org_counts.get(org_id) is not None or org_is_stat_fylk_or_komm(
-                organizations[org_id]
-            ):
+            is_public_sector = (
+                org_id in public_sector_ids
+                if public_sector_ids is not None
+                else org_is_stat_fylk_or_komm(organizations[org_id])
+            )
+            if org_counts.get(org_id) is not None or is_public_sector:
                 summaries.append(
                     map_org_summary(
                         org_id, org_counts.get(org_id), organizations[org_id]
@@ -252,9 +415,15 @@ def map_org_summaries(
 
 
 def categorise_summaries_by_parent_org(
-    summaries: List[OrganizationCatalogSummary], include_empty: bool
+    summaries: List[OrganizationCatalogSummary],
+    include_empty: bool,
+    organizations: Optional[Dict] = None,
 ) -> List[OrganizationCategory]:
-    """Categorise summaries by parent organization."""
+    """Categorise summaries by parent organization.
+
+    Parent organizations are looked up in organizations when given, and
+    otherwise among the summaries.
+    """
     categorised_summaries: Dict[str, List[OrganizationCatalogSummary]] = dict()
     for summary in summaries:
         org_path_split = summary.orgPath.split("/")
@@ -268,11 +437,12 @@ def categorise_summaries_by_parent_org(
 
     categories: List[OrganizationCategory] = list()
     for main_org in categorised_summaries:
+        parent = organizations.get(main_org) if organizations else None
         category = OrganizationCatalogSummary(
             id=main_org,
-            name="",
-            prefLabel={},
-            orgPath="",
+            name=parent["name"] if parent else "",
+            prefLabel=parent["prefLabel"] if parent else {},
+            orgPath=parent["orgPath"] if parent else "",
             datasetCount=0,
             conceptCount=0,
             dataserviceCount=0,
@@ -284,7 +454,7 @@ def categorise_summaries_by_parent_org(
             category.conceptCount += summary.conceptCount
             category.dataserviceCount += summary.dataserviceCount
             category.informationmodelCount += summary.informationmodelCount
-            if summary.id == main_org:
+            if parent is None and summary.id == main_org:
                 category.name = summary.name
                 category.prefLabel = summary.prefLabel
                 category.orgPath = summary.orgPath
@@ -307,39 +477,46 @@ def categorise_summaries_by_parent_org(
     return sorted(categories, key=lambda org: org.sort_compare())
 
 
+def index_municipalities(municipalities: Dict) -> MunicipalityIndex:
+    """Index fylke and kommune organizations by their fylkesnummer."""
+    fylke_by_org: Dict[str, str] = dict()
+    fylke_categories: Dict[str, OrganizationCatalogSummary] = dict()
+    for fylke in municipalities.get("fylke") or []:
+        fylke_categories[fylke["fylkesnummer"]] = OrganizationCatalogSummary(
+            id=fylke["organisasjonsnummer"],
+            name=fylke["fylkesnavn"],
+            prefLabel={"nb": fylke["fylkesnavn"]},
+            orgPath="/FYLKE/" + fylke["organisasjonsnummer"],
+            datasetCount=0,
+            conceptCount=0,
+            dataserviceCount=0,
+            informationmodelCount=0,
+        )
+        fylke_by_org[fylke["organisasjonsnummer"]] = fylke["fylkesnummer"]
+
+    for kommune in municipalities.get("kommune") or []:
+        fylke_by_org[kommune["organisasjonsnummer"]] = kommune["kommunenummer"][:2]
+
+    return MunicipalityIndex(fylke_by_org, fylke_categories)
+
+
 def categorise_summaries_by_municipality(
     summaries: List[OrganizationCatalogSummary],
-    municipalities: Dict,
+    municipality_index: MunicipalityIndex,
     include_empty: bool,
 ) -> List[OrganizationCategory]:
     """Categorise summaries by municipalities."""
-    categories_dict: Dict[str, OrganizationCategory] = dict()
-    categorized_organization_numbers = dict()
+    categories_dict: Dict[str, OrganizationCategory] = {
+        fylkesnummer: OrganizationCategory(
+            category=replace(category),
+            organizations=list(),
+        )
+        for fylkesnummer, category in municipality_index.fylke_categories.items()
+    }
+    categorized_organization_numbers = municipality_index.fylke_by_org
     filtered_summaries = (
         summaries if include_empty else remove_empty_summaries(summaries)
     )
-    for fylke in municipalities["fylke"]:
-        categories_dict[fylke["fylkesnummer"]] = OrganizationCategory(
-            category=OrganizationCatalogSummary(
-                id=fylke["organisasjonsnummer"],
-                name=fylke["fylkesnavn"],
-                prefLabel={"nb": fylke["fylkesnavn"]},
-                orgPath="/FYLKE/" + fylke["organisasjonsnummer"],
-                datasetCount=0,
-                conceptCount=0,
-                dataserviceCount=0,
-                informationmodelCount=0,
-            ),
-            organizations=list(),
-        )
-        categorized_organization_numbers[fylke["organisasjonsnummer"]] = fylke[
-            "fylkesnummer"
-        ]
-
-    for kommune in municipalities["kommune"]:
-        categorized_organization_numbers[kommune["organisasjonsnummer"]] = kommune[
-            "kommunenummer"
-        ][:2]
 
     for org_summary in filtered_summaries:
         org_path_split = org_summary.orgPath.split("/")
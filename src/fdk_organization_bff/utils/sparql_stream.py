@@ -0,0 +1,33 @@
+"""Module for incremental parsing of SPARQL json results."""
+
+import re
+from typing import Dict, List
+
+from fdk_organization_bff.utils.json_stream import JsonArrayParser
+
+_BINDINGS_START = re.compile(r'"bindings"\s*:\s*\[')
+
+
+class SparqlBindingsParser(JsonArrayParser):
+    """Parse results.bindings of a SPARQL json response chunk by chunk.
+
+    Each binding is reduced as it is parsed to the values of its terms, which
+    is all the mappers read, and values repeated between rows, like publisher
+    uris, share one string.
+    """
+
+    def __init__(self: "SparqlBindingsParser") -> None:
+        """Init parser waiting for the start of the bindings array."""
+        super().__init__(_BINDINGS_START)
+        self._values: Dict[str, str] = dict()
+
+    def feed(self: "SparqlBindingsParser", chunk: bytes) -> List[Dict]:
+        """Add chunk of the response, return reduced bindings completed by it."""
+        return [self._reduce(binding) for binding in super().feed(chunk)]
+
+    def _reduce(self: "SparqlBindingsParser", binding: Dict) -> Dict:
+        """Keep only the value of each term in binding."""
+        return {
+            name: {"value": self._values.setdefault(term["value"], term["value"])}
+            for name, term in binding.items()
+        }
@@ -2,12 +2,15 @@
 
 import datetime
 import logging
+import re
 import traceback
 from typing import Any, Dict, Optional
 from urllib.parse import quote_plus
 
 from fdk_organization_bff.classes import FilterEnum
 
+_ORG_NUMBER = re.compile(r"[0-9]{9}")
+
 
 def url_with_params(url: str, params: Optional[Dict[str, str]]) -> str:
     """Add parameters to a URL."""
@@ -22,6 +25,11 @@ def url_with_params(url: str, params: Optional[Dict[str, str]]) -> str:
         return url
 
 
+def is_org_number(id: str) -> bool:
+    """Check that id has the 9 digit form of an organization number."""
+    return _ORG_NUMBER.fullmatch(id) is not None
+
+
 def filter_param_to_enum(param: Optional[str]) -> FilterEnum:
     """Map filter param value to corresponding enum."""
     if param is None:
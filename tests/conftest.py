@@ -14,6 +14,8 @@ import requests
 from requests.exceptions import ConnectionError
 
 from fdk_organization_bff import create_app
+from fdk_organization_bff.service.rendered_cache import negative_cache, rendered_cache
+from fdk_organization_bff.service.score_cache import score_cache
 
 
 load_dotenv()
@@ -54,7 +56,10 @@ def docker_compose_file(pytestconfig: Any) -> Any:
 @pytest.mark.integration
 @pytest.fixture(scope="function")
 def client(loop: AbstractEventLoop, aiohttp_client: Any) -> Any:
-    """Return an aiohttp client for testing."""
+    """Return an aiohttp client for testing, without responses cached by other tests."""
+    rendered_cache.clear()
+    negative_cache.clear()
+    score_cache.clear()
     return loop.run_until_complete(
         aiohttp_client(loop.run_until_complete(create_app()))
     )
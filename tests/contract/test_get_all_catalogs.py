@@ -21,16 +21,17 @@ def test_all_catalogs(docker_service: str) -> None:
 
 @pytest.mark.contract
 @pytest.mark.docker
-def test_all_catalogs_has_fifteen_min_cache_headers(docker_service: str) -> None:
-    """Should include no-cache headers."""
+def test_all_catalogs_has_cache_headers(docker_service: str) -> None:
+    """Should include shared cache policy and surrogate key headers."""
     url = f"{docker_service}/organizationcatalogs"
     response = requests.get(url, timeout=30)
 
     assert response.status_code == 200
-    assert (
-        response.headers.get("Cache-Control")
-        == "no-cache, no-store, max-age=900, must-revalidate"
+    assert response.headers.get("Cache-Control") == (
+        "public, max-age=300, s-maxage=900,"
+        " stale-while-revalidate=900, stale-if-error=86400"
     )
+    assert response.headers.get("Surrogate-Key") == "organization-bff org-catalogs"
 
 
 @pytest.mark.contract
@@ -1,4 +1,4 @@
-"""Integration test cases for ping & ready routes."""
+"""Integration test cases for ping, ready & metrics routes."""
 
 from aiohttp.test_utils import TestClient
 import pytest
@@ -24,3 +24,17 @@ async def test_ready(client: TestClient) -> None:
 
     assert response.status == 200
     assert response_content.decode() == "OK"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_metrics(client: TestClient) -> None:
+    """Should return circuit breaker metrics."""
+    response = await client.get("/metrics")
+    response_content = await response.content.read()
+
+    assert response.status == 200
+    assert (
+        'fdk_organization_bff_circuit_breaker_state{upstream="FDK_SPARQL"} 0'
+        in response_content.decode()
+    )
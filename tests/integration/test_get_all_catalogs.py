@@ -2,9 +2,15 @@
 
 import json
 
+from aiohttp import ClientSession
 from aiohttp.test_utils import TestClient
 import pytest
+from pytest_mock import MockFixture
 
+from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.service.org_catalog_service import (
+    summarize_catalog_data_for_organizations,
+)
 from tests import responses
 
 
@@ -52,3 +58,54 @@ async def test_invalid_filter(client: TestClient, docker_service: str) -> None:
     response = await client.get("/organizationcatalogs?filter=invalid")
 
     assert response.status == 400
+
+
+@pytest.mark.integration
+@pytest.mark.docker
+@pytest.mark.asyncio
+async def test_all_catalogs_not_modified(
+    client: TestClient, docker_service: str
+) -> None:
+    """Should answer a request with matching If-None-Match with 304."""
+    response = await client.get("/organizationcatalogs")
+    etag = response.headers["ETag"]
+    not_modified = await client.get(
+        "/organizationcatalogs", headers={"If-None-Match": etag}
+    )
+    modified = await client.get(
+        "/organizationcatalogs", headers={"If-None-Match": '"outdated"'}
+    )
+
+    assert etag.startswith('"')
+    assert not_modified.status == 304
+    assert not_modified.headers["ETag"] == etag
+    assert await not_modified.read() == b""
+    assert modified.status == 200
+
+
+@pytest.mark.integration
+@pytest.mark.docker
+@pytest.mark.asyncio
+async def test_grouped_count_query_gives_same_summaries(
+    mocker: MockFixture, docker_service: str
+) -> None:
+    """Summaries from the grouped count query equal those from one query per type."""
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.publisher_snapshot.current",
+        None,
+    )
+    grouped = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.Config.sparql_grouped_count_query"
+    )
+    summaries = []
+    async with ClientSession() as session:
+        for grouped_query in [True, False]:
+            grouped.return_value = grouped_query
+            summaries.append(
+                await summarize_catalog_data_for_organizations(
+                    FilterEnum.NONE, "true", None, session
+                )
+            )
+
+    assert len(summaries[0]) == 135
+    assert summaries[0] == summaries[1]
@@ -0,0 +1,123 @@
+"""Unit test cases for the local Enhetsregisteret store."""
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.service.adapter import fetch_brreg_data
+from fdk_organization_bff.service.brreg_store import (
+    BrregStore,
+    file_lock,
+    LOCK_POLL_SECONDS,
+)
+
+ENHETER = [
+    {
+        "organisasjonsnummer": "910244132",
+        "navn": "RAMSUND OG ROGNAN REVISJON",
+        "organisasjonsform": {"kode": "ORGL", "beskrivelse": "Organisasjonsledd"},
+        "naeringskode1": {"beskrivelse": "Offentlig administrasjon", "kode": "84.110"},
+        "antallAnsatte": 12,
+        "forretningsadresse": {"kommune": "SKÅNLAND"},
+    },
+    {
+        "organisasjonsnummer": "910258028",
+        "navn": "LILAND OG ERDAL REVISJON",
+        "hjemmeside": "www.liland.no",
+    },
+]
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def store_from_dump(tmp_path: Path, compress: bool = True) -> BrregStore:
+    """Return store loaded from a bulk dump file with ENHETER."""
+    dump = json.dumps(ENHETER, ensure_ascii=False).encode("utf-8")
+    dump_path = tmp_path / "enheter.json.gz"
+    dump_path.write_bytes(gzip.compress(dump) if compress else dump)
+    store = BrregStore(str(dump_path), str(tmp_path / "brreg.sqlite3"))
+    run(store.load(session=None))  # type: ignore
+    return store
+
+
+@pytest.mark.unit
+def test_store_keeps_fields_used_for_details(tmp_path: Path) -> None:
+    """Only the fields used for organization details are stored."""
+    store = store_from_dump(tmp_path)
+
+    assert store.get("910244132") == {
+        "organisasjonsform": {"kode": "ORGL", "beskrivelse": "Organisasjonsledd"},
+        "naeringskode1": {"beskrivelse": "Offentlig administrasjon", "kode": "84.110"},
+        "antallAnsatte": 12,
+    }
+    assert store.get("910258028") == {"hjemmeside": "www.liland.no"}
+    assert run(store.lookup("123456789")) is None
+    assert (store.hits, store.misses) == (2, 1)
+    store.close()
+
+
+@pytest.mark.unit
+def test_store_loads_uncompressed_dump(tmp_path: Path) -> None:
+    """A dump that was decompressed in transfer is loaded as well."""
+    store = store_from_dump(tmp_path, compress=False)
+
+    assert store.get("910258028") == {"hjemmeside": "www.liland.no"}
+    assert store.age() is not None
+    store.close()
+
+
+@pytest.mark.unit
+def test_fetch_brreg_data_falls_back_to_live(
+    tmp_path: Path, mocker: MockFixture
+) -> None:
+    """Stored organizations are not fetched, others are fetched live."""
+    store = store_from_dump(tmp_path)
+    mocker.patch("fdk_organization_bff.service.adapter.brreg_store", store)
+    live = mocker.patch(
+        "fdk_organization_bff.service.adapter.fetch_json_data",
+        return_value={"hjemmeside": "www.live.no"},
+    )
+
+    stored = run(fetch_brreg_data("910258028", mocker.Mock()))
+    fetched = run(fetch_brreg_data("974760673", mocker.Mock()))
+    store.close()
+
+    assert stored == {"hjemmeside": "www.liland.no"}
+    assert fetched == {"hjemmeside": "www.live.no"}
+    live.assert_called_once()
+
+
+@pytest.mark.unit
+def test_only_one_worker_loads_shared_index(
+    tmp_path: Path, mocker: MockFixture
+) -> None:
+    """A worker does not load the index while another does, and opens the result."""
+    loaded = store_from_dump(tmp_path)
+    loaded.close()
+    worker = BrregStore(loaded.source, loaded.db_path)
+    load = mocker.patch.object(worker, "load")
+
+    with file_lock(worker.lock_path) as locked:
+        # any index is outdated with interval 0, but the lock is held elsewhere
+        polled = run(worker.refresh(mocker.Mock(), interval=0))
+    delay = run(worker.refresh(mocker.Mock(), interval=60))
+    fetched = run(worker.lookup("910258028"))
+    worker.close()
+
+    assert locked
+    assert polled == LOCK_POLL_SECONDS
+    assert 0 < delay <= 60
+    assert fetched == {"hjemmeside": "www.liland.no"}
+    load.assert_not_called()
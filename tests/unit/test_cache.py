@@ -0,0 +1,134 @@
+"""Unit test cases for the upstream response cache."""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import UpstreamResponse
+from fdk_organization_bff.service.cache import ResponseCache
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def counting_fetch(size: int = 10) -> Any:
+    """Return fetch function answering with the number of calls made."""
+    calls: List[int] = []
+
+    async def fetch() -> UpstreamResponse:
+        calls.append(1)
+        return UpstreamResponse(200, {"call": len(calls)}, size)
+
+    fetch.calls = calls  # type: ignore
+    return fetch
+
+
+@pytest.mark.unit
+def test_fresh_entry_is_served_from_cache() -> None:
+    """A second call within ttl does not call upstream."""
+    cache = ResponseCache("test", max_bytes=1000, ttl=60, stale_ttl=60)
+    fetch = counting_fetch()
+
+    async def main() -> Any:
+        return [await cache.get_or_fetch("a", fetch) for _ in range(2)]
+
+    assert run(main()) == [{"call": 1}, {"call": 1}]
+    assert len(fetch.calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.unit
+def test_stale_entry_is_served_while_refreshed(mocker: MockFixture) -> None:
+    """An expired entry is returned at once and refreshed once in the background."""
+    now = mocker.patch("fdk_organization_bff.service.cache.time.monotonic")
+    now.return_value = 0
+    cache = ResponseCache("test", max_bytes=1000, ttl=60, stale_ttl=60)
+    fetch = counting_fetch()
+
+    async def main() -> Any:
+        first = await cache.get_or_fetch("a", fetch)
+        now.return_value = 90
+        stale = await asyncio.gather(
+            cache.get_or_fetch("a", fetch), cache.get_or_fetch("a", fetch)
+        )
+        await asyncio.sleep(0)
+        refreshed = await cache.get_or_fetch("a", fetch)
+        return first, stale, refreshed
+
+    first, stale, refreshed = run(main())
+
+    assert first == {"call": 1}
+    assert stale == [{"call": 1}, {"call": 1}]
+    assert refreshed == {"call": 2}
+    assert len(fetch.calls) == 2
+    assert cache.stale_hits == 2
+
+
+@pytest.mark.unit
+def test_entry_past_stale_ttl_is_fetched(mocker: MockFixture) -> None:
+    """An entry expired longer than stale_ttl is a miss."""
+    now = mocker.patch("fdk_organization_bff.service.cache.time.monotonic")
+    now.return_value = 0
+    cache = ResponseCache("test", max_bytes=1000, ttl=60, stale_ttl=10)
+    fetch = counting_fetch()
+
+    async def main() -> Any:
+        await cache.get_or_fetch("a", fetch)
+        now.return_value = 80
+        return await cache.get_or_fetch("a", fetch)
+
+    assert run(main()) == {"call": 2}
+    assert cache.misses == 2
+
+
+@pytest.mark.unit
+def test_least_recently_used_is_evicted_by_size() -> None:
+    """Entries are evicted least recently used first to stay within max_bytes."""
+    cache = ResponseCache("test", max_bytes=25, ttl=60, stale_ttl=60)
+
+    cache.put("a", UpstreamResponse(200, "a", 9))
+    cache.put("b", UpstreamResponse(200, "b", 9))
+    run(cache.get_or_fetch("a", counting_fetch()))
+    cache.put("c", UpstreamResponse(200, "c", 9))
+
+    assert len(cache) == 2
+    assert cache.size_bytes == 20
+    assert cache.evictions == 1
+    assert run(cache.get_or_fetch("a", counting_fetch())) == "a"
+    assert run(cache.get_or_fetch("b", counting_fetch())) == {"call": 1}
+
+
+@pytest.mark.unit
+def test_failed_responses_are_not_cached() -> None:
+    """Error statuses, empty payloads and oversized bodies are not cached."""
+    cache = ResponseCache("test", max_bytes=100, ttl=60, stale_ttl=60)
+
+    cache.put("a", UpstreamResponse(404, None, 0))
+    cache.put("b", UpstreamResponse(200, None, 0))
+    cache.put("c", UpstreamResponse(200, {}, 200))
+
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+@pytest.mark.unit
+def test_age_of_shared_response_shortens_freshness(mocker: MockFixture) -> None:
+    """A response aged in the shared cache is fresh for the rest of its ttl."""
+    now = mocker.patch("fdk_organization_bff.service.cache.time.monotonic")
+    now.return_value = 0
+    cache = ResponseCache("test", max_bytes=1000, ttl=60, stale_ttl=60)
+    fetch = counting_fetch()
+
+    cache.put("a", UpstreamResponse(200, "aged", 10, age=50))
+    now.return_value = 20
+
+    assert run(cache.get_or_fetch("a", fetch)) == "aged"
+    assert cache.stale_hits == 1
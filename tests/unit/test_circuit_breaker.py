@@ -0,0 +1,75 @@
+"""Unit test cases for circuit breakers."""
+
+import pytest
+
+from fdk_organization_bff.service.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def breaker(open_seconds: float) -> CircuitBreaker:
+    """Return breaker opening at 50% failures of at least 4 calls."""
+    return CircuitBreaker(
+        name="test",
+        failure_rate=0.5,
+        window=10,
+        min_calls=4,
+        open_seconds=open_seconds,
+        half_open_probes=2,
+    )
+
+
+@pytest.mark.unit
+def test_breaker_opens_at_failure_rate_and_fails_fast() -> None:
+    """Breaker opens when failure rate is reached and rejects calls."""
+    cb = breaker(open_seconds=60)
+    for outcome in (True, False, True):
+        cb.before_call()
+        if outcome:
+            cb.on_success()
+        else:
+            cb.on_failure()
+    assert cb.state is BreakerState.CLOSED
+
+    cb.before_call()
+    cb.on_failure()
+    assert cb.state is BreakerState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        cb.before_call()
+    assert cb.rejected_count == 1
+
+
+@pytest.mark.unit
+def test_breaker_half_open_probes_close_breaker() -> None:
+    """Successful probes close a half-open breaker, extra calls are rejected."""
+    cb = breaker(open_seconds=0)
+    for _ in range(4):
+        cb.on_failure()
+    assert cb.state is BreakerState.OPEN
+
+    cb.before_call()
+    cb.before_call()
+    assert cb.state is BreakerState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        cb.before_call()
+
+    cb.on_success()
+    cb.on_success()
+    assert cb.state is BreakerState.CLOSED
+
+
+@pytest.mark.unit
+def test_breaker_failed_probe_reopens_breaker() -> None:
+    """A failed probe opens the breaker again."""
+    cb = breaker(open_seconds=0)
+    for _ in range(4):
+        cb.on_failure()
+
+    cb.before_call()
+    cb.on_failure()
+
+    assert cb.state is BreakerState.OPEN
+    assert cb.opened_count == 2
@@ -0,0 +1,50 @@
+"""Unit test cases for request deadlines."""
+
+import asyncio
+import contextvars
+from typing import Any
+
+import pytest
+
+from fdk_organization_bff.classes import UpstreamEnum
+from fdk_organization_bff.config import Config
+from fdk_organization_bff.service.deadline import set_deadline, upstream_timeout
+
+
+def in_new_context(func: Any) -> Any:
+    """Run test in a copy of the current context."""
+
+    def wrapper(*args: str, **kwargs: int) -> Any:
+        return contextvars.copy_context().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+@pytest.mark.unit
+@in_new_context
+def test_upstream_timeout_without_deadline() -> None:
+    """Timeout is the configured upstream timeout when no deadline is set."""
+    timeout = upstream_timeout(UpstreamEnum.DATA_BRREG)
+
+    assert timeout.total == Config.upstream_timeout(UpstreamEnum.DATA_BRREG)
+
+
+@pytest.mark.unit
+@in_new_context
+def test_upstream_timeout_bounded_by_deadline() -> None:
+    """Timeout never exceeds time left before the request deadline."""
+    set_deadline(0.5)
+    timeout = upstream_timeout(UpstreamEnum.FDK_SPARQL)
+
+    assert timeout.total is not None
+    assert 0 < timeout.total <= 0.5
+
+
+@pytest.mark.unit
+@in_new_context
+def test_upstream_timeout_after_deadline() -> None:
+    """Upstream call is refused when the request deadline has passed."""
+    set_deadline(-1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        upstream_timeout(UpstreamEnum.FDK_SPARQL)
@@ -0,0 +1,83 @@
+"""Unit test cases for request hedging."""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from fdk_organization_bff.service.hedging import HedgeBudget, Hedger, LatencyTracker
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def warmed_up_hedger(latency: float) -> Hedger:
+    """Return hedger with budget and observed latencies."""
+    hedger = Hedger(percentile=95, budget_ratio=1)
+    for _ in range(20):
+        hedger.latencies.record(latency)
+    return hedger
+
+
+@pytest.mark.unit
+def test_latency_tracker_percentile() -> None:
+    """Percentile is unknown until enough samples are recorded."""
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for latency in range(9):
+        tracker.record(latency)
+    assert tracker.percentile(90) is None
+
+    tracker.record(9)
+    assert tracker.percentile(90) == 9
+    assert tracker.percentile(50) == 5
+
+
+@pytest.mark.unit
+def test_hedge_budget_limits_extra_requests() -> None:
+    """Budget allows one hedge per 1/ratio requests."""
+    budget = HedgeBudget(ratio=0.5, max_tokens=10)
+    budget.on_request()
+    assert budget.try_spend() is False
+
+    budget.on_request()
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+
+@pytest.mark.unit
+def test_hedged_request_takes_fastest_and_cancels_slowest() -> None:
+    """A slow first attempt is hedged, the fast hedge wins and the first is cancelled."""
+    hedger = warmed_up_hedger(0.01)
+    delays = [10.0, 0.0]
+    cancelled: List[int] = []
+
+    async def request() -> int:
+        attempt = len(delays)
+        try:
+            await asyncio.sleep(delays.pop(0))
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    assert run(hedger.run(request)) == 1
+    assert hedger.hedges == 1
+    assert cancelled == [2]
+
+
+@pytest.mark.unit
+def test_fast_request_is_not_hedged() -> None:
+    """No hedge is sent when the first attempt answers in time."""
+    hedger = warmed_up_hedger(1.0)
+
+    async def request() -> str:
+        return "result"
+
+    assert run(hedger.run(request)) == "result"
+    assert hedger.hedges == 0
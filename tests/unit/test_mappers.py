@@ -6,6 +6,11 @@ from fdk_organization_bff.classes import CatalogQualityScore
 from fdk_organization_bff.utils.mappers import (
     map_catalog_quality_score,
     map_org_details,
+    merge_grouped_org_counts,
+    merge_org_counts,
+    org_and_count_value_from_separated_values,
+    sparql_separated_values_columns,
+    split_org_resources,
 )
 
 
@@ -58,3 +63,96 @@ def test_map_org_details_handles_missing_data() -> None:
     details = map_org_details({}, {})
 
     assert details is None
+
+
+@pytest.mark.unit
+def test_org_and_count_value_from_csv() -> None:
+    """Rows from SPARQL CSV results are mapped to org and count."""
+    columns = sparql_separated_values_columns("organizationNumber,count", ",")
+
+    assert org_and_count_value_from_separated_values(
+        "974 760 673,12", ",", columns
+    ) == {"org": "974760673", "count": "12"}
+    assert org_and_count_value_from_separated_values('"910244132",3', ",", columns) == {
+        "org": "910244132",
+        "count": "3",
+    }
+    assert org_and_count_value_from_separated_values(",3", ",", columns) is None
+
+
+@pytest.mark.unit
+def test_org_and_count_value_from_tsv() -> None:
+    """Rows from SPARQL TSV results are mapped to org and count."""
+    columns = sparql_separated_values_columns("?count\t?organizationNumber", "\t")
+    row = '"12"^^<http://www.w3.org/2001/XMLSchema#integer>\t"974760673"'
+
+    assert org_and_count_value_from_separated_values(row, "\t", columns) == {
+        "org": "974760673",
+        "count": "12",
+    }
+    assert org_and_count_value_from_separated_values(
+        '3\t"910244132"@nb', "\t", columns
+    ) == {"org": "910244132", "count": "3"}
+
+
+@pytest.mark.unit
+def test_split_org_resources() -> None:
+    """Bindings of the combined resources query are split by type."""
+    issued = {"type": "literal", "value": "2021-04-09"}
+    bindings = [
+        {
+            "type": {"type": "literal", "value": "dataset"},
+            "resource": {"type": "uri", "value": "https://d1"},
+            "issued": issued,
+            "isOpenData": {"type": "literal", "value": "true"},
+        },
+        {
+            "type": {"type": "literal", "value": "dataservice"},
+            "resource": {"type": "uri", "value": "https://s1"},
+            "issued": issued,
+        },
+        {
+            "type": {"type": "literal", "value": "informationmodel"},
+            "resource": {"type": "uri", "value": "https://i1"},
+            "issued": issued,
+        },
+    ]
+
+    datasets, dataservices, concepts, informationmodels = split_org_resources(bindings)
+
+    assert datasets == [
+        {
+            "dataset": {"type": "uri", "value": "https://d1"},
+            "issued": issued,
+            "isOpenData": {"type": "literal", "value": "true"},
+        }
+    ]
+    assert dataservices == [
+        {"service": {"type": "uri", "value": "https://s1"}, "issued": issued}
+    ]
+    assert concepts == []
+    assert informationmodels == [
+        {"informationmodel": {"type": "uri", "value": "https://i1"}, "issued": issued}
+    ]
+
+
+@pytest.mark.unit
+def test_merge_grouped_org_counts() -> None:
+    """Counts grouped by organization and type are merged like separate counts."""
+    columns = sparql_separated_values_columns("organizationNumber,type,count", ",")
+    rows = ["974760673,dataset,12", "974760673,concept,2", "910244132,dataset,3"]
+    count_list = [
+        org_and_count_value_from_separated_values(row, ",", columns) for row in rows
+    ]
+    count_list.append({"org": "910244132", "type": "unknown", "count": "1"})
+
+    assert count_list[0] == {"org": "974760673", "type": "dataset", "count": "12"}
+    assert merge_grouped_org_counts(count_list) == merge_org_counts(
+        datasets=[
+            {"org": "974760673", "count": "12"},
+            {"org": "910244132", "count": "3"},
+        ],
+        dataservices=[],
+        concepts=[{"org": "974760673", "count": "2"}],
+        informationmodels=[],
+    )
@@ -0,0 +1,78 @@
+"""Unit test cases for the organization registry."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.service.org_catalog_service import get_state_categories
+from fdk_organization_bff.service.org_registry import OrganizationRegistry
+from fdk_organization_bff.service.reference_store import ReferenceStore
+
+ORGANIZATIONS = {
+    "972417858": {
+        "name": "DEP",
+        "prefLabel": {"nb": "Dep"},
+        "orgPath": "/STAT/972417858",
+    },
+    "991825827": {
+        "name": "DIREKTORAT",
+        "prefLabel": {"nb": "Direktorat"},
+        "orgPath": "/STAT/972417858/991825827",
+    },
+    "921693230": {"name": "VIKEN", "prefLabel": {}, "orgPath": "/FYLKE/921693230"},
+    "910244132": {"name": "AS", "prefLabel": {}, "orgPath": "/PRIVAT/910244132"},
+    "123": {"name": "UTEN", "prefLabel": {}},
+}
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.mark.unit
+def test_organizations_are_filtered_by_org_path_prefix() -> None:
+    """Organizations at or below each orgPath are found."""
+    registry = OrganizationRegistry(ORGANIZATIONS)
+
+    assert set(registry.for_org_paths(["/STAT/"])) == {"972417858", "991825827"}
+    assert set(registry.for_org_paths(["/STAT/972417858/991825827"])) == {"991825827"}
+    assert set(registry.for_org_paths(["/FYLKE/", "/KOMMUNE/"])) == {"921693230"}
+    assert registry.for_org_paths(None) == ORGANIZATIONS
+    assert registry.public_sector_ids == {"972417858", "991825827", "921693230"}
+    assert registry.get("123") == {"name": "UTEN", "prefLabel": {}}
+
+
+@pytest.mark.unit
+def test_state_categories_use_registry(mocker: MockFixture) -> None:
+    """Organizations and parents are looked up in the registry, not upstream."""
+    store: ReferenceStore = ReferenceStore("organization registry")
+    store.swap(OrganizationRegistry(ORGANIZATIONS))
+    mocker.patch("fdk_organization_bff.service.org_catalog_service.org_registry", store)
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.publisher_snapshot.current",
+        None,
+    )
+    live = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.fetch_organizations_from_organization_catalog"
+    )
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.query_all_resources_grouped_by_publisher",
+        return_value=[{"org": "991825827", "type": "dataset", "count": "2"}],
+    )
+
+    categories = run(get_state_categories(FilterEnum.NONE, "false", mocker.Mock()))
+
+    assert [
+        (c.category.id, c.category.name, c.category.datasetCount)
+        for c in categories.categories
+    ] == [("972417858", "DEP", 2)]
+    assert [o.id for o in categories.categories[0].organizations] == ["991825827"]
+    live.assert_not_called()
@@ -0,0 +1,122 @@
+"""Unit test cases for reference data loaded in the background."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import FilterEnum, OrganizationCatalogSummary
+from fdk_organization_bff.service.org_catalog_service import (
+    get_municipality_categories,
+)
+from fdk_organization_bff.service.reference_store import ReferenceStore
+from fdk_organization_bff.utils.mappers import (
+    categorise_summaries_by_municipality,
+    index_municipalities,
+)
+
+MUNICIPALITIES = {
+    "fylke": [
+        {
+            "organisasjonsnummer": "921693230",
+            "fylkesnavn": "Viken",
+            "fylkesnummer": "30",
+        }
+    ],
+    "kommune": [
+        {
+            "organisasjonsnummer": "964950113",
+            "kommunenavn": "Asker",
+            "kommunenummer": "3025",
+        }
+    ],
+}
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def summary(id: str, org_path: str, datasets: int) -> OrganizationCatalogSummary:
+    """Return summary of organization id with datasets."""
+    return OrganizationCatalogSummary(
+        id=id,
+        name=id,
+        prefLabel={},
+        orgPath=org_path,
+        datasetCount=datasets,
+        conceptCount=0,
+        dataserviceCount=0,
+        informationmodelCount=0,
+    )
+
+
+@pytest.mark.unit
+def test_categorise_does_not_change_index() -> None:
+    """Categories are built from copies of the indexed category skeleton."""
+    index = index_municipalities(MUNICIPALITIES)
+    summaries = [
+        summary("921693230", "/FYLKE/921693230", 2),
+        summary("964950113", "/KOMMUNE/964950113", 3),
+        summary("974760673", "/STAT/974760673", 5),
+    ]
+
+    first = categorise_summaries_by_municipality(summaries, index, False)
+    second = categorise_summaries_by_municipality(summaries, index, False)
+
+    assert index.fylke_by_org == {"921693230": "30", "964950113": "30"}
+    assert index.fylke_categories["30"].datasetCount == 0
+    assert [c.category.datasetCount for c in first + second] == [5, 5]
+    assert [len(c.organizations) for c in first] == [2]
+
+
+@pytest.mark.unit
+def test_failed_load_keeps_previous_index(mocker: MockFixture) -> None:
+    """A failing load is counted, retried sooner and the current index is kept."""
+    store = ReferenceStore("municipality reference data")
+    current = index_municipalities(MUNICIPALITIES)
+    store.swap(current)
+    sleep = mocker.patch(
+        "fdk_organization_bff.service.reference_store.asyncio.sleep",
+        side_effect=asyncio.CancelledError,
+    )
+
+    async def load() -> Any:
+        raise ValueError("no fylke data")
+
+    with pytest.raises(asyncio.CancelledError):
+        run(store.refresh_periodically(load, 86400))
+
+    assert store.current is current
+    assert store.failures == 1
+    sleep.assert_called_once_with(600)
+
+
+@pytest.mark.unit
+def test_categories_use_loaded_index(mocker: MockFixture) -> None:
+    """Reference data is not fetched when the index is loaded."""
+    store = ReferenceStore("municipality reference data")
+    store.swap(index_municipalities(MUNICIPALITIES))
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.municipality_store", store
+    )
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.summarize_catalog_data_for_organizations",
+        return_value=[summary("964950113", "/KOMMUNE/964950113", 3)],
+    )
+    live = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.fetch_reference_data"
+    )
+
+    categories = run(
+        get_municipality_categories(FilterEnum.NONE, "false", mocker.Mock())
+    )
+
+    assert [c.category.name for c in categories.categories] == ["Viken"]
+    live.assert_not_called()
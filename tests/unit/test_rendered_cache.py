@@ -0,0 +1,243 @@
+"""Unit test cases for the rendered response cache."""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import (
+    FilterEnum,
+    OrganizationCatalogList,
+    UpstreamEnum,
+    UpstreamResponse,
+)
+from fdk_organization_bff.service.cache import ResponseCache
+from fdk_organization_bff.service.org_catalog_service import get_organization_catalog
+from fdk_organization_bff.service.rendered_cache import (
+    mark_degraded,
+    NegativeCache,
+    render_body,
+    rendered_json,
+    RenderedCache,
+    track_degraded,
+)
+
+ORG_CAT_DATA = {
+    "organizationId": "991825827",
+    "name": "DIGITALISERINGSDIREKTORATET",
+    "prefLabel": {},
+    "orgPath": "/STAT/972417858/991825827",
+}
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def answer_with(statuses: Dict[UpstreamEnum, int]) -> Callable:
+    """Return request_upstream answering each upstream with its status."""
+
+    async def request_upstream(
+        method: str,
+        url: str,
+        session: Any,
+        upstream: UpstreamEnum,
+        *args: Any,
+        **kwargs: Any,
+    ) -> UpstreamResponse:
+        status = statuses[upstream]
+        payload = ORG_CAT_DATA if status == 200 else None
+        return UpstreamResponse(status, payload)
+
+    return request_upstream
+
+
+def patch_upstreams(mocker: MockFixture, statuses: Dict[UpstreamEnum, int]) -> None:
+    """Answer upstream calls with statuses, without retry delays or caching."""
+    mocker.patch(
+        "fdk_organization_bff.service.adapter.request_upstream",
+        side_effect=answer_with(statuses),
+    )
+    mocker.patch(
+        "fdk_organization_bff.service.adapter.response_caches",
+        {upstream: ResponseCache(upstream.value, 0, 0, 0) for upstream in UpstreamEnum},
+    )
+    mocker.patch("fdk_organization_bff.service.retry.backoff_delay", return_value=0)
+
+
+@pytest.mark.unit
+def test_entry_is_dropped_when_version_changes() -> None:
+    """A body rendered from an older data version is not served."""
+    version: List[Optional[int]] = [1]
+    cache = RenderedCache(max_bytes=100, ttl=60, version=lambda: version[0])
+
+    cache.put("a", render_body(b"body"), 1)
+    hit = cache.get("a")
+    version[0] = 2
+
+    assert hit == render_body(b"body")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_least_recently_used_is_evicted_by_size() -> None:
+    """Bodies are evicted least recently used first to stay within max_bytes."""
+    cache = RenderedCache(max_bytes=10, ttl=60, version=lambda: None)
+
+    cache.put("a", render_body(b"aaaa"), None)
+    cache.put("b", render_body(b"bbbb"), None)
+    cache.get("a")
+    cache.put("c", render_body(b"cccc"), None)
+
+    assert cache.get("a") == render_body(b"aaaa")
+    assert cache.get("b") is None
+    assert cache.size_bytes == 8
+
+
+@pytest.mark.unit
+def test_degraded_is_tracked_in_started_tasks() -> None:
+    """Fallback data used by a task started inside the tracked block is seen."""
+
+    async def fallback() -> None:
+        mark_degraded()
+
+    async def main() -> List[bool]:
+        with track_degraded() as degraded:
+            before = degraded()
+            await asyncio.ensure_future(fallback())
+            return [before, degraded()]
+
+    assert run(main()) == [False, True]
+
+
+@pytest.mark.unit
+def test_degraded_response_is_not_cached(mocker: MockFixture) -> None:
+    """A body rendered from fallback data is rendered again on the next request."""
+    cache = RenderedCache(max_bytes=1000, ttl=60, version=lambda: None)
+    mocker.patch("fdk_organization_bff.service.rendered_cache.rendered_cache", cache)
+    calls: List[int] = []
+
+    async def get_data() -> OrganizationCatalogList:
+        calls.append(1)
+        if len(calls) == 1:
+            mark_degraded()
+        return OrganizationCatalogList(organizations=[])
+
+    bodies = [run(rendered_json("key", get_data)).body for _ in range(3)]
+
+    assert bodies == [b'{"organizations": []}'] * 3
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_missing_data_is_remembered(mocker: MockFixture) -> None:
+    """A key without data is not looked up again until its version changes."""
+    version: List[Optional[int]] = [1]
+    negative = NegativeCache(max_entries=10, ttl=60, version=lambda: version[0])
+    cache = RenderedCache(max_bytes=1000, ttl=60, version=lambda: version[0])
+    mocker.patch("fdk_organization_bff.service.rendered_cache.negative_cache", negative)
+    mocker.patch("fdk_organization_bff.service.rendered_cache.rendered_cache", cache)
+    calls: List[int] = []
+
+    async def get_data() -> None:
+        calls.append(1)
+
+    results = [run(rendered_json("missing", get_data)) for _ in range(2)]
+    version[0] = 2
+    run(rendered_json("missing", get_data))
+
+    assert results == [None, None]
+    assert len(calls) == 2
+    assert negative.hits == 1
+
+
+@pytest.mark.unit
+def test_negative_cache_evicts_oldest_key() -> None:
+    """The oldest key is forgotten when max_entries is exceeded."""
+    negative = NegativeCache(max_entries=2, ttl=60, version=lambda: None)
+
+    for key in ("a", "b", "c"):
+        negative.add(key, None)
+
+    assert "a" not in negative
+    assert "b" in negative and "c" in negative
+
+
+@pytest.mark.unit
+def test_response_is_not_cached_when_sparql_fails(mocker: MockFixture) -> None:
+    """A catalog without counts, because SPARQL answered 5xx, is not cached."""
+    cache = RenderedCache(max_bytes=10000, ttl=60, version=lambda: None)
+    mocker.patch("fdk_organization_bff.service.rendered_cache.rendered_cache", cache)
+    patch_upstreams(
+        mocker,
+        {
+            UpstreamEnum.ORGANIZATION_CATALOG: 200,
+            UpstreamEnum.DATA_BRREG: 404,
+            UpstreamEnum.FDK_SPARQL: 503,
+        },
+    )
+
+    rendered = run(
+        rendered_json(
+            ("ORG_CATALOG", FilterEnum.NONE, "991825827"),
+            lambda: get_organization_catalog(
+                "991825827", FilterEnum.NONE, mocker.Mock()
+            ),
+        )
+    )
+
+    assert rendered is not None
+    assert b'"totalCount": 0' in rendered.body
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_missing_data_is_not_remembered_when_upstreams_fail(
+    mocker: MockFixture,
+) -> None:
+    """An organization is not remembered as missing when upstreams answered 5xx."""
+    negative = NegativeCache(max_entries=10, ttl=60, version=lambda: None)
+    mocker.patch("fdk_organization_bff.service.rendered_cache.negative_cache", negative)
+    patch_upstreams(
+        mocker,
+        {
+            UpstreamEnum.ORGANIZATION_CATALOG: 503,
+            UpstreamEnum.DATA_BRREG: 503,
+            UpstreamEnum.FDK_SPARQL: 503,
+        },
+    )
+    key = ("ORG_CATALOG", FilterEnum.NONE, "991825827")
+
+    rendered = run(
+        rendered_json(
+            key,
+            lambda: get_organization_catalog(
+                "991825827", FilterEnum.NONE, mocker.Mock()
+            ),
+        )
+    )
+
+    assert rendered is None
+    assert key not in negative
+    assert len(negative) == 0
+
+
+@pytest.mark.unit
+def test_unversioned_entry_outlives_version_change() -> None:
+    """A body not rendered from versioned data is kept when the version changes."""
+    version: List[Optional[int]] = [1]
+    cache = RenderedCache(max_bytes=100, ttl=60, version=lambda: version[0])
+
+    cache.put("org", render_body(b"org"), None)
+    cache.put("list", render_body(b"list"), 1)
+    version[0] = 2
+
+    assert cache.get("org") == render_body(b"org")
+    assert cache.get("list") is None
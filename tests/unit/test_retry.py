@@ -0,0 +1,92 @@
+"""Unit test cases for retry of upstream calls."""
+
+import asyncio
+from typing import Any, List
+
+from aiohttp import ClientConnectionError
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import UpstreamEnum, UpstreamResponse
+from fdk_organization_bff.service.retry import with_retry
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def responses(*items: Any) -> Any:
+    """Return request function answering with items in order."""
+    calls: List[Any] = list(items)
+
+    async def request() -> UpstreamResponse:
+        item = calls.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    request.calls = calls  # type: ignore
+    return request
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(mocker: MockFixture) -> None:
+    """Skip backoff sleeps."""
+    mocker.patch("fdk_organization_bff.service.retry.asyncio.sleep")
+
+
+@pytest.mark.unit
+def test_retry_on_retryable_status() -> None:
+    """A 502 followed by a 200 returns the 200 response."""
+    request = responses(
+        UpstreamResponse(502, None), UpstreamResponse(200, {"ok": True})
+    )
+
+    assert run(with_retry(request, UpstreamEnum.FDK_SPARQL)) == UpstreamResponse(
+        200, {"ok": True}
+    )
+
+
+@pytest.mark.unit
+def test_no_retry_on_client_error_status() -> None:
+    """A 404 is returned without retrying."""
+    request = responses(
+        UpstreamResponse(404, None), UpstreamResponse(200, {"ok": True})
+    )
+
+    assert run(with_retry(request, UpstreamEnum.FDK_SPARQL)) == UpstreamResponse(
+        404, None
+    )
+    assert len(request.calls) == 1
+
+
+@pytest.mark.unit
+def test_retry_gives_up_after_max_attempts() -> None:
+    """Last response is returned when attempts are used up."""
+    request = responses(
+        UpstreamResponse(503, None),
+        UpstreamResponse(503, None),
+        UpstreamResponse(503, None),
+        UpstreamResponse(200, {}),
+    )
+
+    assert run(with_retry(request, UpstreamEnum.FDK_SPARQL)) == UpstreamResponse(
+        503, None
+    )
+    assert len(request.calls) == 1
+
+
+@pytest.mark.unit
+def test_retry_reraises_connection_error() -> None:
+    """Connection errors are retried and re-raised when attempts are used up."""
+    request = responses(
+        ClientConnectionError(), ClientConnectionError(), ClientConnectionError()
+    )
+
+    with pytest.raises(ClientConnectionError):
+        run(with_retry(request, UpstreamEnum.FDK_SPARQL))
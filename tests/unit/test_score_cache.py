@@ -0,0 +1,107 @@
+"""Unit test cases for the dataset quality score cache."""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.service.org_catalog_service import fetch_dataset_scores
+from fdk_organization_bff.service.score_cache import ScoreCache
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def score(findability: int, accessibility: int) -> Dict:
+    """Return score of one dataset from fdk-mqa-score-api."""
+    return {
+        "dataset": {
+            "dimensions": [
+                {"id": "findability", "score": findability, "max_score": 100},
+                {"id": "accessibility", "score": accessibility, "max_score": 50},
+            ]
+        }
+    }
+
+
+def score_response(uris: List[str], session: Any) -> Dict:
+    """Return response of fdk-mqa-score-api with scores of uris, except unscored ones."""
+    return {
+        "scores": {uri: score(10, 20) for uri in uris if uri != "unscored"},
+        "aggregations": [
+            {"id": "findability", "score": 10 * len(uris), "max_score": 100},
+        ],
+    }
+
+
+@pytest.mark.unit
+def test_cached_scores_are_not_fetched(mocker: MockFixture) -> None:
+    """Only uncached scores are fetched, and all are aggregated the same way."""
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.score_cache",
+        ScoreCache(max_entries=10, ttl=60),
+    )
+    fetch = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.fetch_org_dataset_catalog_scores",
+        side_effect=score_response,
+    )
+
+    first = run(fetch_dataset_scores(["a", "b", "unscored"], mocker.Mock()))
+    second = run(fetch_dataset_scores(["a", "b", "c", "unscored"], mocker.Mock()))
+    third = run(fetch_dataset_scores(["c", "b", "a", "unscored"], mocker.Mock()))
+
+    assert [call.args[0] for call in fetch.call_args_list] == [
+        ["a", "b", "unscored"],
+        ["c"],
+    ]
+    assert first == {
+        "aggregations": [
+            {"id": "findability", "score": 20, "max_score": 200},
+            {"id": "accessibility", "score": 40, "max_score": 100},
+        ]
+    }
+    assert second == third
+    assert third == {
+        "aggregations": [
+            {"id": "findability", "score": 30, "max_score": 300},
+            {"id": "accessibility", "score": 60, "max_score": 150},
+        ]
+    }
+
+
+@pytest.mark.unit
+def test_unreadable_scores_are_an_error(mocker: MockFixture) -> None:
+    """No score is aggregated from cached datasets when fetched scores are unreadable."""
+    cache = ScoreCache(max_entries=10, ttl=60)
+    cache.put("a", [{"id": "findability", "score": 10, "max_score": 100}])
+    mocker.patch("fdk_organization_bff.service.org_catalog_service.score_cache", cache)
+    fetch = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.fetch_org_dataset_catalog_scores",
+    )
+
+    for upstream in ({"scores": {"b": {"dataset": {}}}, "aggregations": []}, {}):
+        fetch.return_value = upstream
+        with pytest.raises(ValueError):
+            run(fetch_dataset_scores(["a", "b"], mocker.Mock()))
+
+    assert cache.get("b") is None
+
+
+@pytest.mark.unit
+def test_least_recently_used_score_is_evicted() -> None:
+    """The cache keeps at most max_entries datasets."""
+    cache = ScoreCache(max_entries=2, ttl=60)
+    cache.put("a", [])
+    cache.put("b", [])
+    cache.get("a")
+    cache.put("c", [])
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ([], None, [])
+    assert len(cache) == 2
@@ -3,6 +3,7 @@
 import asyncio
 from typing import Any
 
+from aiohttp import ClientSession
 from asynctest import CoroutineMock, MagicMock, patch
 import pytest
 
@@ -29,9 +30,10 @@ def async_test(coro: Any) -> Any:
 async def test_get_organization_catalog_with_closed_session(mock: MagicMock) -> None:
     """Mock closed session and get organization catalog."""
     mock.return_value.__aenter__.return_value = CoroutineMock(side_effect=True)
-    org = await org_catalog_service.get_organization_catalog(
-        "12345678", FilterEnum.NONE
-    )
+    async with ClientSession() as session:
+        org = await org_catalog_service.get_organization_catalog(
+            "12345678", FilterEnum.NONE, session
+        )
     assert org is None
 
 
@@ -41,5 +43,8 @@ async def test_get_organization_catalog_with_closed_session(mock: MagicMock) ->
 async def test_get_organization_catalogs_with_closed_session(mock: MagicMock) -> None:
     """Mock closed session and get organization catalogs."""
     mock.return_value.__aenter__.return_value = CoroutineMock(side_effect=True)
-    org = await org_catalog_service.get_organization_catalogs(FilterEnum.NONE, None)
+    async with ClientSession() as session:
+        org = await org_catalog_service.get_organization_catalogs(
+            FilterEnum.NONE, None, session
+        )
     assert len(org.organizations) == 0
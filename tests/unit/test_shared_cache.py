@@ -0,0 +1,82 @@
+"""Unit test cases for the cache shared between workers."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import UpstreamResponse
+from fdk_organization_bff.service.shared_cache import SqliteSharedCache
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def counting_fetch() -> Any:
+    """Return fetch function answering with the number of calls made."""
+    calls: List[int] = []
+
+    async def fetch() -> UpstreamResponse:
+        calls.append(1)
+        return UpstreamResponse(200, {"call": len(calls)}, 10)
+
+    fetch.calls = calls  # type: ignore
+    return fetch
+
+
+@pytest.mark.unit
+def test_sqlite_cache_is_shared_between_instances(tmp_path: Path) -> None:
+    """A payload stored by one worker is served to another."""
+    path = str(tmp_path / "cache.sqlite3")
+    worker_1 = SqliteSharedCache(path)
+    worker_2 = SqliteSharedCache(path)
+    fetch = counting_fetch()
+
+    first = run(worker_1.get_or_fetch("a", fetch, 60))
+    second = run(worker_2.get_or_fetch("a", fetch, 60))
+    run(worker_1.close())
+    run(worker_2.close())
+
+    assert first.payload == second.payload == {"call": 1}
+    assert second.size > 0
+    assert len(fetch.calls) == 1
+    assert (worker_2.hits, worker_2.misses) == (1, 0)
+
+
+@pytest.mark.unit
+def test_sqlite_cache_entry_expires(tmp_path: Path, mocker: MockFixture) -> None:
+    """An entry older than its ttl is fetched again, with its age reported."""
+    now = mocker.patch("fdk_organization_bff.service.shared_cache.time.time")
+    now.return_value = 1000.0
+    cache = SqliteSharedCache(str(tmp_path / "cache.sqlite3"))
+    fetch = counting_fetch()
+
+    run(cache.get_or_fetch("a", fetch, 60))
+    now.return_value = 1030.0
+    cached = run(cache.get_or_fetch("a", fetch, 60))
+    now.return_value = 1070.0
+    fetched = run(cache.get_or_fetch("a", fetch, 60))
+    run(cache.close())
+
+    assert (cached.payload, cached.age) == ({"call": 1}, 30.0)
+    assert (fetched.payload, fetched.age) == ({"call": 2}, 0)
+
+
+@pytest.mark.unit
+def test_failing_store_falls_through_to_fetch(tmp_path: Path) -> None:
+    """Errors from the store are counted and the payload is fetched."""
+    cache = SqliteSharedCache(str(tmp_path / "missing" / "cache.sqlite3"))
+    fetch = counting_fetch()
+
+    response = run(cache.get_or_fetch("a", fetch, 60))
+
+    assert response.payload == {"call": 1}
+    assert cache.errors == 2
@@ -0,0 +1,87 @@
+"""Unit test cases for coalescing of identical upstream calls."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from fdk_organization_bff.service.deadline import remaining_time, set_deadline
+from fdk_organization_bff.service.single_flight import SingleFlight
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.mark.unit
+def test_concurrent_identical_calls_are_coalesced() -> None:
+    """Concurrent calls with the same key share one call."""
+    single_flight = SingleFlight()
+    calls = []
+
+    async def call() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"result": len(calls)}
+
+    async def main() -> Any:
+        return await asyncio.gather(
+            single_flight.do("a", call),
+            single_flight.do("a", call),
+            single_flight.do("b", call),
+        )
+
+    a1, a2, b = run(main())
+
+    assert a1 is a2
+    assert len(calls) == 2
+    assert single_flight.coalesced_count == 1
+
+
+@pytest.mark.unit
+def test_cancelled_caller_does_not_cancel_shared_call() -> None:
+    """Remaining callers get the result when another caller is cancelled."""
+    single_flight = SingleFlight()
+
+    async def call() -> str:
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main() -> Any:
+        first = asyncio.ensure_future(single_flight.do("a", call))
+        second = asyncio.ensure_future(single_flight.do("a", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run(main()) == "result"
+
+
+@pytest.mark.unit
+def test_short_deadline_does_not_bound_shared_call() -> None:
+    """A first caller with a short deadline does not fail later callers."""
+    single_flight = SingleFlight()
+    deadlines = []
+
+    async def call() -> str:
+        deadlines.append(remaining_time())
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def caller(deadline: float) -> Any:
+        set_deadline(deadline)
+        try:
+            return await single_flight.do("a", call)
+        except asyncio.TimeoutError:
+            return "timeout"
+
+    async def main() -> Any:
+        return await asyncio.gather(caller(0.01), caller(1))
+
+    assert run(main()) == ["timeout", "result"]
+    assert deadlines == [None]
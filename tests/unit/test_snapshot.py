@@ -0,0 +1,177 @@
+"""Unit test cases for the publisher snapshot."""
+
+import asyncio
+import time
+from typing import Any, Callable
+from urllib.parse import unquote_plus
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import FilterEnum, UpstreamEnum, UpstreamResponse
+from fdk_organization_bff.service.adapter import UpstreamStatusError
+from fdk_organization_bff.service.cache import ResponseCache
+from fdk_organization_bff.service.org_catalog_service import (
+    build_publisher_snapshot,
+    organization_may_exist,
+    summarize_catalog_data_for_organizations,
+)
+from fdk_organization_bff.service.snapshot import PublisherSnapshot, SnapshotStore
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def answer_failing(failing: str) -> Callable:
+    """Return request_upstream answering 503 to requests with failing in the url."""
+
+    async def request_upstream(
+        method: str,
+        url: str,
+        session: Any,
+        upstream: UpstreamEnum,
+        *args: Any,
+        **kwargs: Any,
+    ) -> UpstreamResponse:
+        if failing in unquote_plus(url):
+            return UpstreamResponse(503, None)
+        if upstream is UpstreamEnum.ORGANIZATION_CATALOG:
+            return UpstreamResponse(200, [{"organizationId": "123", "name": "ORG"}])
+        binding = {
+            "organizationNumber": {"type": "literal", "value": "123"},
+            "type": {"type": "literal", "value": "dataset"},
+            "count": {"type": "literal", "value": "3"},
+        }
+        return UpstreamResponse(200, {"results": {"bindings": [binding]}})
+
+    return request_upstream
+
+
+def patch_upstreams(mocker: MockFixture, failing: str) -> None:
+    """Answer upstream calls, failing some, without retry delays or caching."""
+    mocker.patch(
+        "fdk_organization_bff.service.adapter.request_upstream",
+        side_effect=answer_failing(failing),
+    )
+    mocker.patch(
+        "fdk_organization_bff.service.adapter.response_caches",
+        {upstream: ResponseCache(upstream.value, 0, 0, 0) for upstream in UpstreamEnum},
+    )
+    mocker.patch("fdk_organization_bff.service.retry.backoff_delay", return_value=0)
+
+
+def snapshot(org_counts: dict) -> PublisherSnapshot:
+    """Return snapshot with org_counts for the NONE filter."""
+    return PublisherSnapshot(
+        org_counts={FilterEnum.NONE: org_counts},
+        organizations={
+            None: {"123": {"name": "ORG", "prefLabel": {}, "orgPath": "/STAT/123"}}
+        },
+        org_ids=frozenset(["123", "910244132"]),
+        built_at=time.time(),
+        build_duration=0.5,
+    )
+
+
+@pytest.mark.unit
+def test_swap_increments_version_when_content_changes() -> None:
+    """A swapped in snapshot gets the next version only if its content changed."""
+    store = SnapshotStore()
+    first, same = snapshot({"123": {"datasets": "3"}}), snapshot(
+        {"123": {"datasets": "3"}}
+    )
+    changed = snapshot({"123": {"datasets": "4"}})
+
+    store.swap(first)
+    store.swap(same)
+    store.swap(changed)
+
+    assert store.current is changed
+    assert (first.version, same.version, changed.version) == (1, 1, 2)
+    assert store.builds == 3
+
+
+@pytest.mark.unit
+def test_failed_build_keeps_previous_snapshot(mocker: MockFixture) -> None:
+    """A failing build is counted and the current snapshot is kept."""
+    store = SnapshotStore()
+    current = snapshot({})
+    store.swap(current)
+    sleep = mocker.patch(
+        "fdk_organization_bff.service.snapshot.asyncio.sleep",
+        side_effect=asyncio.CancelledError,
+    )
+
+    async def build() -> PublisherSnapshot:
+        raise ValueError("no counts")
+
+    with pytest.raises(asyncio.CancelledError):
+        run(store.refresh_periodically(build, 60))
+
+    assert store.current is current
+    assert store.failures == 1
+    sleep.assert_called_once_with(60)
+
+
+@pytest.mark.unit
+def test_summaries_are_served_from_snapshot(mocker: MockFixture) -> None:
+    """Summaries use counts and organizations in the snapshot, without upstream calls."""
+    store = SnapshotStore()
+    store.swap(snapshot({"123": {"datasets": "3", "concepts": "1"}}))
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.publisher_snapshot", store
+    )
+    live = mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.query_all_resources_grouped_by_publisher"
+    )
+
+    summaries = run(
+        summarize_catalog_data_for_organizations(
+            FilterEnum.NONE, None, None, mocker.Mock()
+        )
+    )
+
+    assert [(s.id, s.datasetCount, s.conceptCount) for s in summaries] == [
+        ("123", 3, 1)
+    ]
+    live.assert_not_called()
+
+
+@pytest.mark.unit
+def test_unknown_organizations_are_rejected(mocker: MockFixture) -> None:
+    """Only organization numbers in the snapshot may exist once it is built."""
+    store = SnapshotStore()
+    mocker.patch(
+        "fdk_organization_bff.service.org_catalog_service.publisher_snapshot", store
+    )
+
+    before_build = [organization_may_exist(id) for id in ("910244132", "123")]
+    store.swap(snapshot({}))
+    after_build = [organization_may_exist(id) for id in ("910244132", "974760673")]
+
+    assert before_build == [True, False]
+    assert after_build == [True, False]
+
+
+@pytest.mark.unit
+def test_build_fails_when_nap_counts_fail(mocker: MockFixture) -> None:
+    """A NAP count query answered with 5xx fails the build, not empty NAP counts."""
+    patch_upstreams(mocker, "isRelatedToTransportportal")
+
+    with pytest.raises(UpstreamStatusError):
+        run(build_publisher_snapshot(mocker.Mock()))
+
+
+@pytest.mark.unit
+def test_build_fails_when_organizations_are_partial(mocker: MockFixture) -> None:
+    """Organizations of one org path answered with 5xx fail the build."""
+    patch_upstreams(mocker, "orgPath=/KOMMUNE/")
+
+    with pytest.raises(UpstreamStatusError):
+        run(build_publisher_snapshot(mocker.Mock()))
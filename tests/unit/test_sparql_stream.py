@@ -0,0 +1,84 @@
+"""Unit test cases for incremental parsing of SPARQL json results."""
+
+import json
+from typing import Any, Dict
+
+import pytest
+
+from fdk_organization_bff.utils.sparql_stream import SparqlBindingsParser
+
+RESULTS: Dict[str, Any] = {
+    "head": {"vars": ["dataset", "issued"]},
+    "results": {
+        "bindings": [
+            {
+                "dataset": {"type": "uri", "value": "http://example.com/1"},
+                "issued": {"type": "literal", "value": "2021-04-01"},
+            },
+            {
+                "dataset": {"type": "uri", "value": "http://example.com/ø"},
+                "issued": {"type": "literal", "value": '2021-04-08 "æ"'},
+            },
+        ]
+    },
+}
+
+
+@pytest.mark.unit
+def test_bindings_parsed_from_small_chunks() -> None:
+    """Bindings split across chunks, also within multibyte chars, are parsed."""
+    body = json.dumps(RESULTS, ensure_ascii=False, indent=2).encode("utf-8")
+    parser = SparqlBindingsParser()
+    bindings = []
+    chunks = [body[i : i + 5] for i in range(0, len(body), 5)]  # noqa: E203
+    for chunk in chunks:
+        bindings.extend(parser.feed(chunk))
+    parser.close()
+
+    assert bindings == [
+        {name: {"value": term["value"]} for name, term in binding.items()}
+        for binding in RESULTS["results"]["bindings"]
+    ]
+
+
+@pytest.mark.unit
+def test_empty_bindings() -> None:
+    """Empty bindings array is parsed."""
+    parser = SparqlBindingsParser()
+
+    assert parser.feed(b'{"head": {}, "results": {"bindings": [ ]}}') == []
+    parser.close()
+
+
+@pytest.mark.unit
+def test_incomplete_bindings_rejected() -> None:
+    """Truncated response is rejected on close."""
+    body = json.dumps(RESULTS).encode("utf-8")
+    parser = SparqlBindingsParser()
+    bindings = parser.feed(body[: len(body) // 2])
+
+    with pytest.raises(ValueError):
+        parser.close()
+    assert len(bindings) < 2
+
+
+@pytest.mark.unit
+def test_repeated_values_are_shared() -> None:
+    """Values repeated between bindings are the same string."""
+    publisher = {"type": "uri", "value": "http://example.com/publisher"}
+    results = {
+        "results": {
+            "bindings": [
+                {
+                    "dataset": {"type": "uri", "value": f"http://example.com/{i}"},
+                    "publisher": publisher,
+                }
+                for i in range(2)
+            ]
+        }
+    }
+    parser = SparqlBindingsParser()
+    first, second = parser.feed(json.dumps(results).encode("utf-8"))
+
+    assert first["publisher"]["value"] is second["publisher"]["value"]
+    assert first["dataset"]["value"] != second["dataset"]["value"]
@@ -0,0 +1,161 @@
+"""Unit test cases for the state file."""
+
+import json
+from pathlib import Path
+import time
+from typing import Dict
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.service.org_registry import OrganizationRegistry
+from fdk_organization_bff.service.reference_store import ReferenceStore
+from fdk_organization_bff.service.rendered_cache import (
+    render_body,
+    RenderedCache,
+    snapshot_version,
+)
+from fdk_organization_bff.service.snapshot import PublisherSnapshot, SnapshotStore
+from fdk_organization_bff.service.state_file import dump_state, load_state, write_state
+from fdk_organization_bff.utils.mappers import index_municipalities
+
+ORGANIZATIONS = {
+    "910244132": {"name": "ORG", "prefLabel": {}, "orgPath": "/STAT/910244132"}
+}
+MUNICIPALITIES = {
+    "fylke": [
+        {
+            "organisasjonsnummer": "921693230",
+            "fylkesnavn": "Viken",
+            "fylkesnummer": "30",
+        }
+    ],
+    "kommune": [{"organisasjonsnummer": "964950113", "kommunenummer": "3025"}],
+}
+
+
+def patch_stores(mocker: MockFixture) -> Dict:
+    """Patch the stores of the state file module with empty ones, and return them."""
+    stores = {
+        "publisher_snapshot": SnapshotStore(),
+        "org_registry": ReferenceStore("organization registry"),
+        "municipality_store": ReferenceStore("municipality reference data"),
+    }
+    for name, store in stores.items():
+        mocker.patch(f"fdk_organization_bff.service.state_file.{name}", store)
+    mocker.patch(
+        "fdk_organization_bff.service.rendered_cache.publisher_snapshot",
+        stores["publisher_snapshot"],
+    )
+    stores["rendered_cache"] = RenderedCache(1024, 60, snapshot_version)
+    mocker.patch(
+        "fdk_organization_bff.service.state_file.rendered_cache",
+        stores["rendered_cache"],
+    )
+    return stores
+
+
+def enable_features(mocker: MockFixture, enabled: bool) -> None:
+    """Enable or disable the snapshot, registry and municipality index features."""
+    for feature in ("snapshot", "org_registry", "municipality_index"):
+        mocker.patch(
+            f"fdk_organization_bff.service.state_file.Config.{feature}_enabled",
+            return_value=enabled,
+        )
+
+
+@pytest.mark.unit
+def test_state_is_restored(tmp_path: Path, mocker: MockFixture) -> None:
+    """Snapshot, registry, reference data and rendered responses are restored."""
+    path = str(tmp_path / "state.json")
+    enable_features(mocker, True)
+    stores = patch_stores(mocker)
+    stores["publisher_snapshot"].swap(
+        PublisherSnapshot(
+            org_counts={FilterEnum.NONE: {"910244132": {"datasets": "3"}}},
+            organizations={None: ORGANIZATIONS, ("/STAT/",): ORGANIZATIONS},
+            org_ids=frozenset(ORGANIZATIONS),
+            built_at=time.time() - 100,
+            build_duration=0.5,
+        )
+    )
+    stores["org_registry"].swap(OrganizationRegistry(ORGANIZATIONS))
+    stores["municipality_store"].swap(index_municipalities(MUNICIPALITIES))
+    key = ("ORG_CATALOG", FilterEnum.NONE, "910244132")
+    body = render_body(b'{"organization": {}}')
+    stores["rendered_cache"].put(key, body, snapshot_version())
+    write_state(path, dump_state())
+
+    restored = patch_stores(mocker)
+    assert load_state(path, max_age=60)
+
+    snapshot = restored["publisher_snapshot"].current
+    assert snapshot.org_counts == {FilterEnum.NONE: {"910244132": {"datasets": "3"}}}
+    assert snapshot.organizations[("/STAT/",)] == ORGANIZATIONS
+    assert 99 < restored["publisher_snapshot"].age() < 110
+    assert restored["org_registry"].current.public_sector_ids == {"910244132"}
+    assert restored["municipality_store"].current == index_municipalities(
+        MUNICIPALITIES
+    )
+    assert restored["rendered_cache"].get(key) == body
+
+
+@pytest.mark.unit
+def test_outdated_state_is_ignored(tmp_path: Path, mocker: MockFixture) -> None:
+    """State that is too old, or of another format, is not restored."""
+    path = tmp_path / "state.json"
+    enable_features(mocker, True)
+    stores = patch_stores(mocker)
+    stores["org_registry"].swap(OrganizationRegistry(ORGANIZATIONS))
+    state = dump_state()
+
+    path.write_text(json.dumps({**state, "saved_at": time.time() - 120}))
+    too_old = load_state(str(path), max_age=60)
+    path.write_text(json.dumps({**state, "format": 0}))
+    other_format = load_state(str(path), max_age=60)
+    missing = load_state(str(tmp_path / "missing.json"), max_age=60)
+
+    restored = patch_stores(mocker)
+    assert (too_old, other_format, missing) == (False, False, False)
+    assert restored["org_registry"].current is None
+
+
+@pytest.mark.unit
+def test_state_of_disabled_features_is_left_out(
+    tmp_path: Path, mocker: MockFixture
+) -> None:
+    """Data of disabled features is neither saved nor restored."""
+    path = tmp_path / "state.json"
+    enable_features(mocker, True)
+    stores = patch_stores(mocker)
+    stores["org_registry"].swap(OrganizationRegistry(ORGANIZATIONS))
+    path.write_text(json.dumps(dump_state()))
+
+    enable_features(mocker, False)
+    saved = dump_state()
+    restored = patch_stores(mocker)
+    assert load_state(str(path), max_age=60)
+
+    assert saved["org_registry"] is None
+    assert restored["org_registry"].current is None
+
+
+@pytest.mark.unit
+def test_rendered_response_keeps_remaining_ttl(
+    tmp_path: Path, mocker: MockFixture
+) -> None:
+    """A restored response is cached for the rest of the ttl it had when saved."""
+    path = str(tmp_path / "state.json")
+    enable_features(mocker, False)
+    stores = patch_stores(mocker)
+    key = ("ORG_CATALOG", FilterEnum.NONE, "910244132")
+    stores["rendered_cache"].put(key, render_body(b"{}"), None, ttl=5)
+    write_state(path, dump_state())
+
+    restored = patch_stores(mocker)
+    assert load_state(path, max_age=60)
+
+    ((restored_key, entry),) = restored["rendered_cache"].items()
+    assert restored_key == key
+    assert 0 < entry.expires_at - time.monotonic() <= 5
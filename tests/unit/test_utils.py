@@ -2,7 +2,13 @@
 
 import pytest
 
-from fdk_organization_bff.utils.utils import resource_is_new, url_with_params
+from fdk_organization_bff.classes import OrganizationDataservices
+from fdk_organization_bff.utils import json_codec
+from fdk_organization_bff.utils.utils import (
+    is_org_number,
+    resource_is_new,
+    url_with_params,
+)
 
 
 @pytest.mark.unit
@@ -31,3 +37,24 @@ def test_resource_is_new_handles_bad_date_format() -> None:
     assert res_0 is False
     assert res_1 is False
     assert res_2 is False
+
+
+@pytest.mark.unit
+def test_json_codec_round_trip() -> None:
+    """Dataclasses are encoded to json that decodes to their fields."""
+    encoded = json_codec.dumps_dataclass(
+        OrganizationDataservices(totalCount=3, newCount=1)
+    )
+
+    assert isinstance(encoded, bytes)
+    assert json_codec.loads(encoded) == {"totalCount": 3, "newCount": 1}
+
+
+@pytest.mark.unit
+def test_is_org_number() -> None:
+    """Only ids of 9 digits are organization numbers."""
+    assert is_org_number("910244132")
+    assert not is_org_number("123")
+    assert not is_org_number("9102441320")
+    assert not is_org_number("91024413x")
+    assert not is_org_number("910244132\n")
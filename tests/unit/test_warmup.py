@@ -0,0 +1,139 @@
+"""Unit test cases for cache warming."""
+
+import asyncio
+from contextlib import suppress
+import time
+from typing import Any, Awaitable, Callable, List, Tuple
+
+import pytest
+from pytest_mock import MockFixture
+
+from fdk_organization_bff.classes import FilterEnum
+from fdk_organization_bff.service.snapshot import PublisherSnapshot, SnapshotStore
+from fdk_organization_bff.service.warmup import (
+    HitTally,
+    warm_up,
+    warm_up_periodically,
+)
+
+
+def run(coro: Any) -> Any:
+    """Run coroutine in a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def snapshot(datasets: str) -> PublisherSnapshot:
+    """Return snapshot counting datasets for one organization."""
+    return PublisherSnapshot(
+        org_counts={FilterEnum.NONE: {"123": {"datasets": datasets}}},
+        organizations={None: {}},
+        org_ids=frozenset(["123"]),
+        built_at=time.time(),
+        build_duration=0.5,
+    )
+
+
+@pytest.mark.unit
+def test_tally_favours_recent_hits() -> None:
+    """Decay lets recent hits outweigh older ones, and drops single old hits."""
+    tally = HitTally(max_ids=10)
+    for id in ["a", "a", "a", "a", "b"]:
+        tally.add(id)
+    tally.decay()
+    for id in ["c", "c", "c"]:
+        tally.add(id)
+
+    assert tally.top(2) == ["c", "a"]
+    assert len(tally) == 2
+
+
+@pytest.mark.unit
+def test_tally_is_bounded() -> None:
+    """The least requested ids are dropped when the tally grows too large."""
+    tally = HitTally(max_ids=2)
+    for id in ["a", "a", "b", "c", "d", "e"]:
+        tally.add(id)
+
+    assert len(tally) <= 4
+    assert tally.top(1) == ["a"]
+
+
+@pytest.mark.unit
+def test_warm_up_is_bounded(mocker: MockFixture) -> None:
+    """List endpoints, configured and most requested organizations are warmed."""
+    tally = HitTally(max_ids=10)
+    for id in ["910244132", "910244132", "974760673", "910258028"]:
+        tally.add(id)
+    mocker.patch("fdk_organization_bff.service.warmup.org_hits", tally)
+    mocker.patch(
+        "fdk_organization_bff.service.warmup.Config.warmup_organizations",
+        return_value=["974760673"],
+    )
+    mocker.patch(
+        "fdk_organization_bff.service.warmup.Config.warmup_top_organizations",
+        return_value=1,
+    )
+    keys: List[Tuple] = []
+    running: List[int] = [0, 0]
+
+    async def rendered_json(
+        key: Tuple, get_data: Callable[[], Awaitable], versioned: bool
+    ) -> None:
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.01)
+        keys.append(key + (versioned,))
+        running[0] -= 1
+        if key[0] == "STATE_CATEGORIES":
+            raise ValueError("upstream failed")
+
+    mocker.patch("fdk_organization_bff.service.warmup.rendered_json", rendered_json)
+
+    warmed = run(warm_up(mocker.Mock(), concurrency=2))
+
+    assert warmed == 4
+    assert running[1] == 2
+    assert sorted(f"{key[0]}/{key[2]}/{key[3]}" for key in keys) == [
+        "MUNICIPALITY_CATEGORIES/None/True",
+        "ORG_CATALOG/910244132/False",
+        "ORG_CATALOG/974760673/False",
+        "ORG_CATALOGS/None/True",
+        "STATE_CATEGORIES/None/True",
+    ]
+
+
+@pytest.mark.unit
+def test_warm_up_follows_snapshot_swaps(mocker: MockFixture) -> None:
+    """Warm-up waits for the first snapshot, and runs again when its content changes."""
+    store = SnapshotStore()
+    mocker.patch("fdk_organization_bff.service.warmup.publisher_snapshot", store)
+    mocker.patch(
+        "fdk_organization_bff.service.warmup.Config.snapshot_enabled",
+        return_value=True,
+    )
+    warmed: List[int] = []
+
+    async def warm_up(session: Any, concurrency: int) -> int:
+        warmed.append(store.version())
+        return 0
+
+    mocker.patch("fdk_organization_bff.service.warmup.warm_up", warm_up)
+
+    async def swaps() -> None:
+        task = asyncio.create_task(warm_up_periodically(mocker.Mock(), interval=60))
+        await asyncio.sleep(0.01)
+        assert warmed == []
+        for datasets in ["3", "3", "4"]:
+            store.swap(snapshot(datasets))
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    run(swaps())
+
+    assert warmed == [1, 2]